@@ -1,6 +1,9 @@
+from uuid import uuid4
+
 import streamlit as st
 from src import create_workflow
 from src.utils.chat_stream import ChatStreamer
+from src.utils.event_loops import BackgroundLoop
 from langchain_core.messages import HumanMessage
 
 st.set_page_config(page_title="Chatbot")
@@ -9,13 +12,23 @@ st.title("EuroDetective")
 if "messages" not in st.session_state:
     st.session_state.messages = []
 
-if "graph" not in st.session_state:
-    st.session_state.graph = create_workflow()
+@st.cache_resource
+def load_workflow():
+    """Compile the graph and its pooled clients once per process, shared by every session."""
+    return create_workflow()
+
+@st.cache_resource
+def load_event_loop():
+    """One event loop per process: every session's graph runs on it, so the async clients keep their pools."""
+    return BackgroundLoop(name="graph-loop")
+
+if "thread_id" not in st.session_state:
+    st.session_state.thread_id = str(uuid4())
 
 if "streamer" not in st.session_state:
     st.session_state.streamer = ChatStreamer(
-        app = st.session_state.graph,
-        config = {"configurable": {"thread_id": "single_session_memory"}}
+        app = load_workflow(),
+        config = {"configurable": {"thread_id": st.session_state.thread_id}}
     )
 
 for message in st.session_state.messages:
@@ -31,10 +44,10 @@ if question := st.chat_input("Ask me about anything..."):
     # Send only the current question to LangGraph - MemorySaver handles the rest
     with st.chat_message("assistant"):
         current_message = [HumanMessage(content=question)]
-        generator = (
+        generator = load_event_loop().iterate(
             st.session_state
             .streamer
-            .stream_response(current_message)
+            .astream_response(current_message)
         )
         st.write_stream(generator)
         response_content = st.session_state.streamer.get_last_response()
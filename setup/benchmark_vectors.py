@@ -0,0 +1,141 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from embedding_store import EmbeddingStore
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.clients.local_index import LocalIndexClient
+from src.config.settings import settings
+
+DIMENSIONS = [1024, 512, 256]
+DTYPES = ["float32", "float16", "int8"]
+
+
+def load_store_vectors(store_path, max_chunks):
+    """Reads up to max_chunks float32 vectors from an embedding store, without network calls."""
+    store = EmbeddingStore.open(store_path)
+    blocks, count = [], 0
+    for _, vectors, _ in store.export():
+        blocks.append(vectors[: max_chunks - count])
+        count += len(blocks[-1])
+        if count >= max_chunks:
+            break
+    return np.concatenate(blocks)
+
+
+def synthetic_vectors(n, dimension=1024, clusters=256, seed=0):
+    """
+    Clustered random vectors whose variance decays along the dimensions, like Matryoshka embeddings.
+    Only meant to exercise the benchmark when no embedding store is available.
+    """
+    rng = np.random.default_rng(seed)
+    decay = 1 / np.sqrt(1 + np.arange(dimension) / 64)
+    centers = rng.normal(size=(clusters, dimension)) * decay
+    vectors = centers[rng.integers(clusters, size=n)] + 0.5 * rng.normal(size=(n, dimension)) * decay
+    return vectors.astype(np.float32)
+
+
+def truncate(vectors, dimension):
+    """
+    Keeps the leading dimensions and re-normalizes, which is how Voyage's reduced output
+    dimensions relate to the full embedding.
+    """
+    reduced = vectors[:, :dimension]
+    norms = np.linalg.norm(reduced, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return reduced / norms
+
+
+def memory_per_million(dimension, dtype):
+    """
+    Returns:
+        tuple: MiB scanned in memory per million chunks, and MiB on disk including int8 rescoring vectors.
+    """
+    scanned = dimension * np.dtype(dtype).itemsize + (4 if dtype == "int8" else 0)
+    on_disk = scanned + (dimension * 2 if dtype == "int8" else 0)
+    return scanned * 1e6 / 2**20, on_disk * 1e6 / 2**20
+
+
+def benchmark(corpus, queries, top_k, rescore_factor=4):
+    """
+    Compares every dimension and dtype against the exact 1024-dim float32 search.
+    Args:
+        corpus (np.ndarray): Indexed vectors of shape (n, 1024).
+        queries (np.ndarray): Held-out query vectors of shape (q, 1024).
+        top_k (int): Matches per query, recall is measured at this depth.
+        rescore_factor (int): int8 candidates rescored per match.
+    Returns:
+        list: One result dict per configuration.
+    """
+    ids = [str(i) for i in range(len(corpus))]
+    metadata = [{} for _ in ids]
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        baseline = LocalIndexClient.build(Path(workdir) / "baseline", ids, corpus, metadata, dtype="float32")
+        truth = [{match.id for match in baseline.query(query, {}, top_k)} for query in queries]
+
+        for dimension in DIMENSIONS:
+            reduced_corpus, reduced_queries = truncate(corpus, dimension), truncate(queries, dimension)
+            for dtype in DTYPES:
+                index = LocalIndexClient.build(Path(workdir) / f"{dimension}-{dtype}", ids, reduced_corpus, metadata, dtype=dtype)
+                index.rescore_factor = rescore_factor
+                index.query(reduced_queries[0], {}, top_k)  # Warm up the memory maps
+
+                latencies, recalls = [], []
+                for query, expected in zip(reduced_queries, truth):
+                    start = time.perf_counter()
+                    matches = index.query(query, {}, top_k)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    recalls.append(len(expected & {match.id for match in matches}) / len(expected))
+
+                scanned, on_disk = memory_per_million(dimension, dtype)
+                results.append({
+                    "dimension": dimension,
+                    "dtype": dtype,
+                    "scanned_mib": scanned,
+                    "disk_mib": on_disk,
+                    "p50_ms": float(np.percentile(latencies, 50)),
+                    "p95_ms": float(np.percentile(latencies, 95)),
+                    "recall": float(np.mean(recalls)),
+                })
+    return results
+
+
+def main():
+    """Benchmark reduced dimensions and int8 quantization of the local index against the 1024-dim float baseline."""
+
+    n_queries = int(os.getenv("BENCHMARK_QUERIES", 200))
+    max_chunks = int(os.getenv("BENCHMARK_MAX_CHUNKS", 200_000))
+    top_k = int(os.getenv("BENCHMARK_TOP_K", settings.TOP_K))
+
+    # Only the store of the default dimension holds full 1024-dim vectors
+    store_path = Path(settings.EMBEDDING_STORE_PATH)
+    if settings.EMBEDDING_DIMENSION == 1024 and (store_path / "store.json").exists():
+        print(f"Loading up to {max_chunks} vectors from the embedding store at {store_path}...")
+        vectors = load_store_vectors(store_path, max_chunks + n_queries)
+    else:
+        print(f"No 1024-dim embedding store at {store_path}, using {max_chunks} synthetic vectors ⚠️")
+        vectors = synthetic_vectors(max_chunks + n_queries)
+
+    # Queries are held out of the index so no query finds itself
+    vectors = vectors[np.random.default_rng(0).permutation(len(vectors))]
+    queries, corpus = vectors[:n_queries], vectors[n_queries:]
+    print(f"{len(corpus)} indexed chunks, {len(queries)} queries, recall@{top_k} against exact 1024-dim float32 search")
+
+    results = benchmark(corpus, queries, top_k, rescore_factor=settings.LOCAL_INDEX_RESCORE_FACTOR)
+
+    print(f"{'dim':>5} {'dtype':<8} {'MiB/1M scanned':>15} {'MiB/1M disk':>12} {'p50 ms':>8} {'p95 ms':>8} {'recall@' + str(top_k):>11}")
+    for row in results:
+        print(
+            f"{row['dimension']:>5} {row['dtype']:<8} {row['scanned_mib']:>15.0f} {row['disk_mib']:>12.0f} "
+            f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['recall']:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+from pinecone import Pinecone
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.clients.bm25_index import BM25Index
+from src.clients.dynamodb import DynamoDBClient
+from src.config.settings import settings
+
+
+def load_chunk_metadata(index_name, namespace, local_index_path=None, fetch_size=100):
+    """
+    Lists every chunk id with its metadata.
+    The local vector index is reused when it exists, otherwise metadata is fetched from Pinecone.
+    Args:
+        index_name (str): Name of the Pinecone index.
+        namespace (str): Namespace to read.
+        local_index_path (str): Directory of an exported local index, if any.
+        fetch_size (int): Number of ids fetched per request.
+    Returns:
+        tuple: Chunk ids and their metadata, aligned.
+    """
+    local = Path(local_index_path) if local_index_path else None
+    if local is not None and (local / "ids.json").exists():
+        ids = json.loads((local / "ids.json").read_text())
+        with open(local / "metadata.jsonl") as f:
+            metadata = [json.loads(line) for line in f]
+        return ids, metadata
+
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"), pool_threads=30)
+    index = pc.Index(index_name)
+
+    ids, metadata = [], []
+    for id_page in index.list(namespace=namespace):
+        for i in range(0, len(id_page), fetch_size):
+            fetched = index.fetch(ids=id_page[i : i + fetch_size], namespace=namespace).vectors
+            for vector_id, vector in fetched.items():
+                ids.append(vector_id)
+                metadata.append(vector.metadata or {})
+        print(f"{len(ids)} chunk ids listed so far...")
+    return ids, metadata
+
+
+def build_lexical_index(ids, metadata, path, table_name, region_name):
+    """
+    Hydrates the chunk texts from DynamoDB and writes the BM25 index.
+    Args:
+        ids (list): Chunk ids.
+        metadata (list): Chunk metadata aligned with ids.
+        path (str): Directory where the BM25 index is written.
+        table_name (str): DynamoDB table holding the chunk texts.
+        region_name (str): AWS region of the table.
+    Returns:
+        BM25Index: The written index.
+    """
+    ddbc = DynamoDBClient(table_name=table_name, region_name=region_name)
+    texts = ddbc.get_chunks(ids)
+
+    missing = sum(text is None for text in texts)
+    if missing:
+        print(f"{missing} chunks have no text in DynamoDB, they are indexed without terms")
+
+    return BM25Index.build(path, ids, [text or "" for text in texts], metadata)
+
+
+def main():
+    """Build the BM25 index used by HYBRID_SEARCH from the ingested chunks."""
+
+    load_dotenv()
+    start_timer = time.time()
+
+    ids, metadata = load_chunk_metadata(
+        index_name = settings.PINECONE_INDEX,
+        namespace = settings.PINECONE_NAMESPACE,
+        local_index_path = settings.LOCAL_INDEX_PATH
+    )
+    lexical_index = build_lexical_index(
+        ids,
+        metadata,
+        path = settings.LEXICAL_INDEX_PATH,
+        table_name = settings.DYNAMODB_TABLE,
+        region_name = settings.DYNAMODB_REGION
+    )
+
+    print(f"BM25 index with {lexical_index.n_rows} chunks and {len(lexical_index.vocab)} terms written to {settings.LEXICAL_INDEX_PATH} ✅")
+    print(f"Total duration: {(time.time() - start_timer) / 60:.1f} minutes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+import re
+from bisect import bisect_left
+
+import tiktoken
+
+
+class ChunkingEngine:
+    """
+    Token-offset text splitter that tokenizes each document exactly once.
+
+    Follows the rules of the recursive splitter used so far: documents of up to `split_threshold`
+    tokens are kept whole; longer ones are split recursively on the first separator they contain,
+    with the separator kept at the start of the next piece, and the pieces are merged back into
+    chunks of up to `chunk_size` tokens that overlap by up to `chunk_overlap` tokens. Pieces are
+    measured and cut as slices of the document's token list, so the document is encoded once for
+    splitting and each chunk once more for its exact token count.
+    """
+
+    def __init__(
+        self,
+        model_name="gpt-4o-mini",
+        chunk_size=1000,
+        chunk_overlap=100,
+        separators=("\n\n", "\n", ". "),
+        split_threshold=1150
+    ):
+        self.encoding = tiktoken.encoding_for_model(model_name)
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = list(separators)
+        self.split_threshold = split_threshold
+        self._patterns = {separator: re.compile(re.escape(separator)) for separator in self.separators}
+
+    def split(self, text):
+        """
+        Split a text into chunks.
+        Args:
+            text (str): The document text.
+        Returns:
+            list: (chunk text, token count) tuples. Chunks are stripped of surrounding periods and
+            spaces, and the count is the token count of the stripped text.
+        """
+        tokens = self.encoding.encode_ordinary(text)
+        if len(tokens) <= self.split_threshold:
+            return [self._finish(tokens, 0, len(tokens), merged=False)]
+
+        # Character offset of every token, plus the end of the text, to map separators to token boundaries
+        decoded, offsets = self.encoding.decode_with_offsets(tokens)
+        offsets.append(len(decoded))
+        spans = self._split_span(decoded, offsets, 0, len(tokens), self.separators)
+        chunks = [self._finish(tokens, start, stop, merged=True) for start, stop in spans]
+        return [(chunk, count) for chunk, count in chunks if chunk]
+
+    def _finish(self, tokens, start, stop, merged):
+        """Decode a token span into the chunk text and the token count of that text."""
+        raw = self.encoding.decode(tokens[start:stop])
+        # Merged chunks are whitespace-stripped before the period strip, as the splitter did
+        text = (raw.strip() if merged else raw).strip(". ")
+        if text == raw and not merged:
+            # The whole document, whose tokens are exactly these
+            return text, stop - start
+        # Stripping and cutting at token boundaries can change how the edges tokenize, so the
+        # chunk is re-encoded to count exactly what the 75-token filter has always counted
+        return text, len(self.encoding.encode_ordinary(text))
+
+    def _split_span(self, text, offsets, start, stop, separators):
+        """Recursively split the token span [start, stop) into chunk spans."""
+        low, high = offsets[start], offsets[stop]
+        separator, remaining = None, []
+        for i, candidate in enumerate(separators):
+            if self._patterns[candidate].search(text, low, high):
+                separator, remaining = candidate, separators[i + 1:]
+                break
+        if separator is None:
+            return [(start, stop)]
+
+        # Each separator starts a new piece at the first token boundary at or after it
+        boundaries = [start]
+        for match in self._patterns[separator].finditer(text, low, high):
+            boundary = bisect_left(offsets, match.start(), start, stop)
+            if boundaries[-1] < boundary < stop:
+                boundaries.append(boundary)
+        boundaries.append(stop)
+
+        chunks, pending = [], []
+        for piece in zip(boundaries, boundaries[1:]):
+            if piece[1] - piece[0] < self.chunk_size:
+                pending.append(piece)
+                continue
+            if pending:
+                chunks.extend(self._merge(pending))
+                pending = []
+            if remaining:
+                chunks.extend(self._split_span(text, offsets, piece[0], piece[1], remaining))
+            else:
+                chunks.append(piece)
+        if pending:
+            chunks.extend(self._merge(pending))
+        return chunks
+
+    def _merge(self, pieces):
+        """Merge consecutive pieces into spans of up to chunk_size tokens, overlapping by up to chunk_overlap."""
+        chunks, current, total = [], [], 0
+        for start, stop in pieces:
+            length = stop - start
+            if current and total + length > self.chunk_size:
+                chunks.append((current[0][0], current[-1][1]))
+                while current and (total > self.chunk_overlap or total + length > self.chunk_size):
+                    total -= current[0][1] - current[0][0]
+                    current.pop(0)
+            current.append((start, stop))
+            total += length
+        if current:
+            chunks.append((current[0][0], current[-1][1]))
+        return chunks
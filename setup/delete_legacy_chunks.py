@@ -0,0 +1,76 @@
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import boto3
+from dotenv import load_dotenv
+from pinecone import Pinecone
+
+from dynamoDB import DynamoDB
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.config.settings import settings
+
+# Positional ids written before chunk ids were derived from the article id, e.g. ITA_B12C3
+LEGACY_ID = re.compile(r"^[A-Z]{3}_B\d+C\d+$")
+
+
+def legacy_dynamodb_ids(table):
+    """
+    Scans a DynamoDB table for chunks stored under positional ids.
+    Args:
+        table: A boto3 DynamoDB Table.
+    Returns:
+        list: Legacy chunk ids.
+    """
+    ids, kwargs = [], {"ProjectionExpression": "chunk_id"}
+    while True:
+        response = table.scan(**kwargs)
+        ids += [item["chunk_id"] for item in response["Items"] if LEGACY_ID.match(item["chunk_id"])]
+        if "LastEvaluatedKey" not in response:
+            return ids
+        kwargs["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+
+def legacy_pinecone_ids(index, namespace):
+    """
+    Lists the vectors of a Pinecone namespace stored under positional ids.
+    Args:
+        index: A Pinecone Index.
+        namespace (str): Namespace to read.
+    Returns:
+        list: Legacy vector ids.
+    """
+    return [vector_id for id_page in index.list(namespace=namespace) for vector_id in id_page if LEGACY_ID.match(vector_id)]
+
+
+def main():
+    """
+    One-time cleanup of chunks written under positional ids, which the ingest manifest does not
+    track and therefore never deletes. Run it once before the first manifest-backed ingestion;
+    the version token of that run then invalidates the query-side caches.
+    """
+
+    load_dotenv()
+    start_timer = time.time()
+
+    dyn_resource = boto3.resource("dynamodb", region_name=settings.DYNAMODB_REGION)
+    ddb = DynamoDB(dyn_resource, settings.DYNAMODB_TABLE)
+    index = Pinecone(api_key=os.getenv("PINECONE_API_KEY")).Index(settings.PINECONE_INDEX)
+
+    dynamodb_ids = legacy_dynamodb_ids(ddb.table)
+    pinecone_ids = legacy_pinecone_ids(index, settings.PINECONE_NAMESPACE)
+    print(f"{len(dynamodb_ids)} legacy chunks in DynamoDB, {len(pinecone_ids)} legacy vectors in Pinecone")
+
+    for start in range(0, len(pinecone_ids), 1000):
+        index.delete(ids=pinecone_ids[start : start + 1000], namespace=settings.PINECONE_NAMESPACE)
+    ddb.delete_chunks(dynamodb_ids)
+
+    print("Legacy chunks deleted ✅")
+    print(f"Total duration: {(time.time() - start_timer) / 60:.1f} minutes")
+
+
+if __name__ == "__main__":
+    main()
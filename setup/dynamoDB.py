@@ -39,6 +39,27 @@ class DynamoDB:
                 err.response["Error"]["Message"],
             )
             raise
+
+
+    def delete_chunks(self, chunk_ids):
+        """
+        Deletes chunks from the table.
+
+        :param chunk_ids: Ids of the chunks to delete.
+        """
+
+        try:
+            with self.table.batch_writer() as writer:
+                for chunk_id in chunk_ids:
+                    writer.delete_item(Key={"chunk_id": chunk_id})
+        except ClientError as err:
+            logger.error(
+                "Couldn't delete chunks from table %s. Here's why: %s: %s",
+                self.table.name,
+                err.response["Error"]["Code"],
+                err.response["Error"]["Message"],
+            )
+            raise
         
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import random
+import re
+import threading
+import time
+
+from voyageai.error import InvalidRequestError, RateLimitError
+
+# Per-request limits of the Voyage embedding endpoint: (total tokens, texts)
+MODEL_LIMITS = {
+    "voyage-3.5": (320_000, 1000),
+    "voyage-3.5-lite": (1_000_000, 1000),
+    "voyage-3-large": (120_000, 1000),
+    "voyage-3": (120_000, 1000),
+    "voyage-3-lite": (120_000, 1000),
+}
+
+# Voyage rejects over-limit batches with InvalidRequestError, as it does bad models or parameters.
+# Only these messages mean a smaller batch may go through.
+SIZE_LIMIT_ERROR = re.compile(r"tokens|context length|batch size|too (long|large|many)", re.IGNORECASE)
+
+
+def pack_batches(items, max_tokens, max_items, tokens):
+    """
+    Greedily packs consecutive items into batches under a token and an item budget.
+    An item larger than the token budget gets a batch of its own.
+    Args:
+        items (iterable): Items to pack, consumed lazily.
+        max_tokens (int): Token budget of a batch.
+        max_items (int): Maximum number of items in a batch.
+        tokens (callable): Returns the token count of an item.
+    Yields:
+        list: Consecutive items.
+    """
+    batch, total = [], 0
+    for item in items:
+        count = tokens(item)
+        if batch and (total + count > max_tokens or len(batch) >= max_items):
+            yield batch
+            batch, total = [], 0
+        batch.append(item)
+        total += count
+    if batch:
+        yield batch
+
+
+class AdaptiveConcurrency:
+    """
+    Limits concurrent embedding requests with additive-increase/multiplicative-decrease.
+
+    Every successful request raises the limit by 1/limit, so the limit grows by about one per
+    round of requests, and a rate-limited request halves it. A burst of 429s is one congestion
+    signal, so 429s of requests started before the last decrease are ignored and the limit halves
+    at most once per round. The limit therefore settles just below the highest concurrency the
+    API sustains. Shared by all countries of a run, since the rate limit applies to the whole account.
+    """
+
+    def __init__(self, initial=4, minimum=1, maximum=16):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(min(max(initial, minimum), maximum))
+        self.in_flight = 0
+        self.rate_limited = 0
+        self._decreased_at = float("-inf")
+        self._condition = threading.Condition()
+
+    def __enter__(self):
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def succeeded(self):
+        with self._condition:
+            self.limit = min(self.limit + 1 / self.limit, self.maximum)
+            self._condition.notify_all()
+
+    def throttled(self, started_at=None):
+        """
+        Records a rate-limited request.
+        Args:
+            started_at (float): time.monotonic() when the request was sent, None to always decrease.
+        """
+        with self._condition:
+            self.rate_limited += 1
+            if started_at is not None and started_at < self._decreased_at:
+                return
+            self.limit = max(self.limit / 2, self.minimum)
+            self._decreased_at = time.monotonic()
+
+
+class EmbeddingBatcher:
+    """
+    Sends token-packed batches to Voyage, splitting rejected batches and backing off on 429s.
+
+    Token counts come from the chunking stage (tiktoken), which does not match Voyage's tokenizer
+    exactly, so batches are packed to `token_margin` of the request limit and a batch Voyage still
+    rejects for its size is split in half and retried. Other invalid requests are raised. A single
+    text Voyage rejects on its own gets no embedding.
+    """
+
+    def __init__(self, embed_fn, model, limiter=None, token_margin=0.9, max_retries=6, base_delay=1.0):
+        """
+        Args:
+            embed_fn (callable): Embeds a list of texts with one API request.
+            model (str): Embedding model, used to look up its request limits.
+            limiter (AdaptiveConcurrency): Shared concurrency limit, a private one when None.
+            token_margin (float): Fraction of the token limit used when packing.
+            max_retries (int): Rate-limited attempts before giving up on a request.
+            base_delay (float): First backoff delay in seconds, doubled on every retry.
+        """
+        max_tokens, max_items = MODEL_LIMITS.get(model, MODEL_LIMITS["voyage-3.5"])
+        self.embed_fn = embed_fn
+        self.max_tokens = int(max_tokens * token_margin)
+        self.max_items = max_items
+        self.limiter = limiter or AdaptiveConcurrency()
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+    def pack(self, items, tokens):
+        """Packs items into batches that fit one request, see `pack_batches`."""
+        return pack_batches(items, self.max_tokens, self.max_items, tokens)
+
+    def _request(self, texts):
+        for attempt in range(self.max_retries + 1):
+            try:
+                with self.limiter:
+                    started_at = time.monotonic()
+                    embeddings = self.embed_fn(texts)
+                self.limiter.succeeded()
+                return embeddings
+            except RateLimitError:
+                self.limiter.throttled(started_at)
+                if attempt == self.max_retries:
+                    raise
+                # Full jitter keeps throttled workers from retrying in lockstep
+                time.sleep(random.uniform(0, self.base_delay * 2 ** attempt))
+
+    def embed(self, texts):
+        """
+        Embeds a batch of texts.
+        Args:
+            texts (list): Texts of one packed batch.
+        Returns:
+            list: One embedding per text, None for texts Voyage rejected.
+        """
+        try:
+            return self._request(texts)
+        except InvalidRequestError as e:
+            if not SIZE_LIMIT_ERROR.search(str(e)):
+                raise
+            if len(texts) == 1:
+                print(f"Voyage rejected a chunk of {len(texts[0])} characters: {e}")
+                return [None]
+            middle = len(texts) // 2
+            return self.embed(texts[:middle]) + self.embed(texts[middle:])
@@ -0,0 +1,260 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class EmbeddingStore:
+    """
+    Local store of document embeddings, keyed by chunk id and a hash of the embedded text.
+
+    Vectors are appended as float16 or int8 rows to a memory-mapped file (`vectors*.bin`); int8 rows
+    are scaled per row by max(|v|) / 127. A small SQLite index (`index.sqlite`) maps each chunk id
+    to its row, text hash, int8 scale and metadata, and `store.json` records the model, dimension
+    and dtype. Rows replaced or removed stay in the file as garbage until `compact` rewrites it.
+    """
+
+    DTYPES = {"float16": np.float16, "int8": np.int8}
+
+    def __init__(self, path: str, model: str, dimension: int, dtype: str = "float16"):
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported embedding store dtype {dtype!r}, expected one of {list(self.DTYPES)}")
+
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        settings = {"model": model, "dimension": dimension, "dtype": dtype}
+        settings_path = self.path / "store.json"
+        if settings_path.exists():
+            stored = json.loads(settings_path.read_text())
+            if stored != settings:
+                raise ValueError(f"Embedding store at {self.path} holds {stored}, not {settings}")
+        else:
+            settings_path.write_text(json.dumps(settings))
+
+        self.model = model
+        self.dimension = dimension
+        self.dtype = np.dtype(self.DTYPES[dtype])
+
+        self.conn = sqlite3.connect(self.path / "index.sqlite", check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors "
+            "(chunk_id TEXT PRIMARY KEY, text_hash TEXT NOT NULL, row INTEGER NOT NULL, scale REAL NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS files (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+        # The vector file the rows point to is recorded in SQLite, so `compact` can switch files and
+        # renumber rows in one transaction. Files left over by an interrupted compaction are removed.
+        stored = self.conn.execute("SELECT value FROM files WHERE name = 'vectors'").fetchone()
+        self.vectors_path = self.path / (stored[0] if stored else "vectors.bin")
+        self.vectors_path.touch()
+        for leftover in self.path.glob("vectors*.bin"):
+            if leftover != self.vectors_path:
+                leftover.unlink()
+
+        # A row cut short by a crash during `put` is dropped, so later appends stay aligned
+        row_bytes = self.dimension * self.dtype.itemsize
+        self._rows = self.vectors_path.stat().st_size // row_bytes
+        if self.vectors_path.stat().st_size != self._rows * row_bytes:
+            os.truncate(self.vectors_path, self._rows * row_bytes)
+        self._mmap = None
+
+    @classmethod
+    def open(cls, path: str) -> "EmbeddingStore":
+        """Opens an existing store with the settings it was created with."""
+        settings = json.loads((Path(path) / "store.json").read_text())
+        return cls(path, **settings)
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash of the embedded text, a vector is reused only while the text is unchanged."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM vectors").fetchone()[0]
+
+    @property
+    def garbage(self) -> int:
+        """Rows of the vector file that no chunk points to anymore."""
+        return self._rows - len(self)
+
+    def _matrix(self) -> np.ndarray:
+        """Memory map over every row written so far, reopened when the file has grown."""
+        if self._mmap is None or self._mmap.shape[0] != self._rows:
+            self._mmap = (
+                np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(self._rows, self.dimension))
+                if self._rows else np.empty((0, self.dimension), dtype=self.dtype)
+            )
+        return self._mmap
+
+    def _quantize(self, vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.dtype == np.int8:
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales
+        return vectors.astype(self.dtype), np.ones(len(vectors), dtype=np.float32)
+
+    def _dequantize(self, rows: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        return self._matrix()[rows].astype(np.float32) * scales[:, None].astype(np.float32)
+
+    def put(
+        self,
+        chunk_ids: Sequence[str],
+        text_hashes: Sequence[str],
+        vectors: Sequence[Optional[Sequence[float]]],
+        metadata: Sequence[Dict[str, Any]]
+    ) -> int:
+        """
+        Stores embeddings, appending a row only when a chunk's text hash changed.
+
+        Args:
+            chunk_ids (Sequence[str]): Chunk identifiers.
+            text_hashes (Sequence[str]): Hashes of the embedded texts, see `text_hash`.
+            vectors (Sequence[Optional[Sequence[float]]]): Embeddings aligned with chunk_ids. None
+                keeps the stored vector and only updates the metadata.
+            metadata (Sequence[Dict[str, Any]]): Chunk metadata aligned with chunk_ids.
+
+        Returns:
+            int: Number of rows appended.
+        """
+        with self._lock:
+            existing = dict(self._lookup(chunk_ids))
+            records, new = [], []
+            for i, chunk_id in enumerate(chunk_ids):
+                stored = existing.get(chunk_id)
+                if vectors[i] is not None and (stored is None or stored[0] != text_hashes[i]):
+                    new.append(i)
+                elif stored is not None:
+                    text_hash, row, scale = stored
+                    records.append((chunk_id, text_hash, row, scale, json.dumps(metadata[i], default=str)))
+
+            if new:
+                quantized, scales = self._quantize(np.asarray([vectors[i] for i in new], dtype=np.float32))
+                with open(self.vectors_path, "ab") as f:
+                    f.write(quantized.tobytes())
+                records += [
+                    (chunk_ids[i], text_hashes[i], self._rows + offset, float(scales[offset]), json.dumps(metadata[i], default=str))
+                    for offset, i in enumerate(new)
+                ]
+                self._rows += len(new)
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO vectors (chunk_id, text_hash, row, scale, metadata) VALUES (?, ?, ?, ?, ?)",
+                records
+            )
+            self.conn.commit()
+        return len(new)
+
+    def _lookup(self, chunk_ids: Sequence[str], page_size: int = 900) -> Iterator[Tuple[str, Tuple[str, int, float]]]:
+        for start in range(0, len(chunk_ids), page_size):
+            page = list(chunk_ids[start : start + page_size])
+            rows = self.conn.execute(
+                f"SELECT chunk_id, text_hash, row, scale FROM vectors WHERE chunk_id IN ({','.join('?' * len(page))})",
+                page
+            )
+            for chunk_id, text_hash, row, scale in rows:
+                yield chunk_id, (text_hash, row, scale)
+
+    def get_many(self, chunk_ids: Sequence[str], text_hashes: Sequence[str]) -> List[Optional[List[float]]]:
+        """
+        Reads stored embeddings whose text is unchanged.
+
+        Args:
+            chunk_ids (Sequence[str]): Chunk identifiers.
+            text_hashes (Sequence[str]): Hashes of the current chunk texts.
+
+        Returns:
+            List[Optional[List[float]]]: One vector per chunk id, None when it is missing or stale.
+        """
+        with self._lock:
+            found = dict(self._lookup(chunk_ids))
+            hits = [
+                (i, found[chunk_id][1], found[chunk_id][2])
+                for i, (chunk_id, text_hash) in enumerate(zip(chunk_ids, text_hashes))
+                if chunk_id in found and found[chunk_id][0] == text_hash
+            ]
+            result: List[Optional[List[float]]] = [None] * len(chunk_ids)
+            if hits:
+                positions, rows, scales = (np.asarray(column) for column in zip(*hits))
+                for position, vector in zip(positions, self._dequantize(rows, scales).tolist()):
+                    result[position] = vector
+        return result
+
+    def remove(self, chunk_ids: Sequence[str]) -> None:
+        """Forgets chunks, their rows are reclaimed by the next `compact`."""
+        with self._lock:
+            self.conn.executemany("DELETE FROM vectors WHERE chunk_id = ?", [(chunk_id,) for chunk_id in chunk_ids])
+            self.conn.commit()
+
+    def export(self, block_rows: int = 65536) -> Iterator[Tuple[List[str], np.ndarray, List[Dict[str, Any]]]]:
+        """
+        Reads every stored chunk in blocks, without network calls.
+
+        Args:
+            block_rows (int): Chunks per block.
+
+        Yields:
+            Tuple[List[str], np.ndarray, List[Dict[str, Any]]]: Chunk ids, float32 vectors and metadata.
+        """
+        with self._lock:
+            records = self.conn.execute("SELECT chunk_id, row, scale, metadata FROM vectors ORDER BY row").fetchall()
+        for start in range(0, len(records), block_rows):
+            block = records[start : start + block_rows]
+            rows = np.asarray([row for _, row, _, _ in block], dtype=np.int64)
+            scales = np.asarray([scale for _, _, scale, _ in block], dtype=np.float32)
+            yield (
+                [chunk_id for chunk_id, _, _, _ in block],
+                self._dequantize(rows, scales),
+                [json.loads(meta) for _, _, _, meta in block]
+            )
+
+    def compact(self) -> int:
+        """
+        Rewrites the vector file with live rows only.
+
+        The live rows are copied to a new file, then the switch to that file and the renumbering
+        of every row commit in one SQLite transaction, so an interruption at any point leaves the
+        index consistent with one of the two files. The old file is deleted afterwards.
+
+        Returns:
+            int: Number of garbage rows reclaimed.
+        """
+        with self._lock:
+            records = self.conn.execute("SELECT chunk_id, row FROM vectors ORDER BY row").fetchall()
+            garbage = self._rows - len(records)
+            if garbage == 0:
+                return 0
+            generation = int(self.vectors_path.stem.partition("-")[2] or 0) + 1
+            compacted = self.path / f"vectors-{generation}.bin"
+            matrix = self._matrix()
+            with open(compacted, "wb") as f:
+                for start in range(0, len(records), 65536):
+                    rows = [row for _, row in records[start : start + 65536]]
+                    f.write(np.ascontiguousarray(matrix[rows]).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self.conn:
+                self.conn.executemany(
+                    "UPDATE vectors SET row = ? WHERE chunk_id = ?",
+                    [(new_row, chunk_id) for new_row, (chunk_id, _) in enumerate(records)]
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (name, value) VALUES ('vectors', ?)", (compacted.name,)
+                )
+
+            self._mmap = None
+            previous, self.vectors_path = self.vectors_path, compacted
+            previous.unlink()
+            self._rows = len(records)
+        return garbage
+
+    def close(self) -> None:
+        self.conn.close()
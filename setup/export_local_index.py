@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+from pinecone import Pinecone
+
+from embedding_store import EmbeddingStore
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.clients.local_index import LocalIndexClient
+from src.config.settings import settings
+
+
+def export_local_index(index_name, namespace, path, dtype="float16", fetch_size=100):
+    """
+    Copies every vector and its metadata from a Pinecone namespace into a local index directory.
+    Args:
+        index_name (str): Name of the Pinecone index.
+        namespace (str): Namespace to export.
+        path (str): Directory where the local index is written.
+        dtype (str): Storage dtype of the local vectors, "float32", "float16" or "int8".
+        fetch_size (int): Number of ids fetched per request.
+    Returns:
+        LocalIndexClient: The written local index.
+    """
+    pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"), pool_threads=30)
+    index = pc.Index(index_name)
+
+    ids, vectors, metadata = [], [], []
+    for id_page in index.list(namespace=namespace):
+        for i in range(0, len(id_page), fetch_size):
+            fetched = index.fetch(ids=id_page[i : i + fetch_size], namespace=namespace).vectors
+            for vector_id, vector in fetched.items():
+                ids.append(vector_id)
+                vectors.append(vector.values)
+                metadata.append(vector.metadata or {})
+        print(f"{len(ids)} vectors exported so far...")
+
+    return LocalIndexClient.build(path, ids, vectors, metadata, dtype=dtype)
+
+
+def export_from_store(store_path, path, dtype="float16"):
+    """
+    Builds the local index from the embedding store written by ingestion, without network calls.
+    Args:
+        store_path (str): Directory of the embedding store.
+        path (str): Directory where the local index is written.
+        dtype (str): Storage dtype of the local vectors, "float32", "float16" or "int8".
+    Returns:
+        LocalIndexClient: The written local index.
+    """
+    store = EmbeddingStore.open(store_path)
+    ids, blocks, metadata = [], [], []
+    for block_ids, block_vectors, block_metadata in store.export():
+        ids += block_ids
+        # int8 is quantized by LocalIndexClient.build, which needs the float vectors
+        blocks.append(block_vectors.astype(np.float32 if dtype == "float32" else np.float16))
+        metadata += block_metadata
+        print(f"{len(ids)} vectors read from the embedding store so far...")
+
+    vectors = np.concatenate(blocks) if blocks else np.empty((0, store.dimension), dtype=np.float32)
+    return LocalIndexClient.build(path, ids, vectors, metadata, dtype=dtype)
+
+
+def main():
+    """
+    Export the production vectors into the local index used by VECTOR_BACKEND=local.
+    Reads the local embedding store when ingestion wrote one, otherwise the Pinecone namespace.
+    """
+
+    load_dotenv()
+    start_timer = time.time()
+
+    if (Path(settings.EMBEDDING_STORE_PATH) / "store.json").exists():
+        print(f"Exporting from the embedding store at {settings.EMBEDDING_STORE_PATH}...")
+        local_index = export_from_store(
+            store_path = settings.EMBEDDING_STORE_PATH,
+            path = settings.LOCAL_INDEX_PATH,
+            dtype = settings.LOCAL_INDEX_DTYPE
+        )
+    else:
+        print(f"Exporting from the Pinecone index {settings.PINECONE_INDEX}...")
+        local_index = export_local_index(
+            index_name = settings.PINECONE_INDEX,
+            namespace = settings.PINECONE_NAMESPACE,
+            path = settings.LOCAL_INDEX_PATH,
+            dtype = settings.LOCAL_INDEX_DTYPE
+        )
+
+    print(f"Local index with {len(local_index.ids)} vectors written to {settings.LOCAL_INDEX_PATH} ✅")
+    print(f"Total duration: {(time.time() - start_timer) / 60:.1f} minutes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+def chunk_key(article_id, chunk_index):
+    """Stable chunk id derived from the article id and the chunk position within the article."""
+    return f"{article_id}_C{chunk_index}"
+
+
+def content_hash(chunk):
+    """Hash of a chunk's text and metadata, any change in either requires a re-upsert."""
+    payload = json.dumps(
+        {"text": chunk["text"], "metadata": chunk["metadata"]},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class IngestManifest:
+    """
+    SQLite record of every chunk committed to DynamoDB and Pinecone, with its content hash.
+
+    A batch is committed only after both its DynamoDB write and its Pinecone upsert succeeded, so
+    after a crash the next run skips everything already committed and resumes with the rest.
+    Chunks whose hash is unchanged are skipped; chunks the source no longer produces are stale.
+    """
+
+    def __init__(self, path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS chunks "
+            "(chunk_id TEXT PRIMARY KEY, country TEXT NOT NULL, content_hash TEXT NOT NULL, committed_at REAL NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS chunks_country ON chunks (country)")
+        self.conn.commit()
+        self._lock = threading.Lock()
+
+    def hashes(self, country):
+        """
+        Returns the committed chunks of a country.
+        Returns:
+            dict: Content hash keyed by chunk id.
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT chunk_id, content_hash FROM chunks WHERE country = ?", (country,)
+            ).fetchall()
+        return dict(rows)
+
+    def commit(self, country, entries):
+        """
+        Records a batch as ingested.
+        Args:
+            country (str): Country of the batch.
+            entries (list): (chunk id, content hash) pairs.
+        """
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT INTO chunks (chunk_id, country, content_hash, committed_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(chunk_id) DO UPDATE SET content_hash = excluded.content_hash, "
+                "committed_at = excluded.committed_at",
+                [(chunk_id, country, digest, now) for chunk_id, digest in entries]
+            )
+            self.conn.commit()
+
+    def stale(self, country, seen):
+        """
+        Returns the committed chunks of a country that a complete read of its source did not produce.
+        Args:
+            country (str): Country whose source was read.
+            seen (set): Ids of every chunk the source produced.
+        Returns:
+            list: Chunk ids to delete.
+        """
+        return [chunk_id for chunk_id in self.hashes(country) if chunk_id not in seen]
+
+    def remove(self, chunk_ids):
+        """Forgets chunks that were deleted from DynamoDB and Pinecone."""
+        with self._lock:
+            self.conn.executemany("DELETE FROM chunks WHERE chunk_id = ?", [(chunk_id,) for chunk_id in chunk_ids])
+            self.conn.commit()
+
+    def close(self):
+        self.conn.close()
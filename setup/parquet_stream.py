@@ -0,0 +1,124 @@
+import hashlib
+import io
+
+import pyarrow.parquet as pq
+
+
+class S3RangeReader(io.RawIOBase):
+    """
+    Seekable, read-only file over an S3 object that fetches byte ranges on demand.
+
+    Reads of up to `block_size` bytes are served from a single cached block; larger reads go
+    straight to a ranged GET. Memory use is bounded by the largest read pyarrow asks for. By
+    default pyarrow reads whole column chunks, so `stream_records` opens files with a read buffer
+    to keep every read at most `buffer_size` bytes, and memory flat even for archives written as
+    a single row group.
+    """
+
+    def __init__(self, s3, bucket, key, block_size=8 * 1024 * 1024):
+        self.s3 = s3
+        self.bucket = bucket
+        self.key = key
+        self.block_size = block_size
+        self.size = s3.head_object(Bucket=bucket, Key=key)["ContentLength"]
+        self.position = 0
+        self.requests = 0
+        self._block_start = 0
+        self._block = b""
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        self.position = max(self.position, 0)
+        return self.position
+
+    def _fetch(self, start, stop):
+        self.requests += 1
+        response = self.s3.get_object(Bucket=self.bucket, Key=self.key, Range=f"bytes={start}-{stop - 1}")
+        return response["Body"].read()
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.size - self.position
+        size = min(size, self.size - self.position)
+        if size <= 0:
+            return b""
+
+        start, stop = self.position, self.position + size
+        if size > self.block_size:
+            data = self._fetch(start, stop)
+        else:
+            block_stop = self._block_start + len(self._block)
+            if not (self._block_start <= start and stop <= block_stop):
+                self._block_start = start
+                self._block = self._fetch(start, min(start + self.block_size, self.size))
+            offset = start - self._block_start
+            data = self._block[offset : offset + size]
+
+        self.position = stop
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+
+class SeenIds:
+    """
+    Compact set of already seen record ids.
+    Ids are stored as 64-bit BLAKE2b digests instead of full strings; a false duplicate needs a
+    64-bit collision, which is negligible at the scale of a country archive.
+    """
+
+    def __init__(self):
+        self._digests = set()
+
+    def add(self, record_id):
+        """Adds an id and returns True if it was not seen before."""
+        digest = int.from_bytes(hashlib.blake2b(str(record_id).encode("utf-8"), digest_size=8).digest(), "little")
+        if digest in self._digests:
+            return False
+        self._digests.add(digest)
+        return True
+
+    def __len__(self):
+        return len(self._digests)
+
+
+def stream_records(source, columns=None, batch_size=1024, id_column="id", buffer_size=1024 * 1024):
+    """
+    Yields the records of a Parquet file one by one, row group by row group, dropping duplicate ids.
+    Only one record batch of the requested columns is materialized at a time, and column chunks
+    are read through a buffer of `buffer_size` bytes instead of whole.
+    Args:
+        source: Path or seekable file-like object, e.g. an S3RangeReader.
+        columns (list): Columns to read, all when None.
+        batch_size (int): Rows per record batch.
+        id_column (str): Column used to drop duplicates, keeping the first occurrence.
+        buffer_size (int): Read buffer of each column, in bytes.
+    Yields:
+        dict: One record per unique id, with None for nulls.
+    """
+    parquet_file = pq.ParquetFile(source, buffer_size=buffer_size, pre_buffer=False)
+    seen = SeenIds()
+    for row_group in range(parquet_file.num_row_groups):
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size, row_groups=[row_group], columns=columns):
+            for record in record_batch.to_pylist():
+                if seen.add(record[id_column]):
+                    yield record
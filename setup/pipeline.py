@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+
+class StageStats:
+    """
+    Thread-safe throughput counters for one ingestion stage.
+    Busy time is summed over all workers of the stage, so it can exceed the wall-clock time.
+    """
+
+    def __init__(self, name, unit="items"):
+        self.name = name
+        self.unit = unit
+        self.items = 0
+        self.calls = 0
+        self.busy_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, items, seconds):
+        with self._lock:
+            self.items += items
+            self.calls += 1
+            self.busy_seconds += seconds
+
+    def report(self, elapsed):
+        rate = self.items / elapsed if elapsed > 0 else 0.0
+        return (
+            f"{self.name:<10} {self.items:>9} {self.unit:<7} {rate:>9.1f} {self.unit}/s "
+            f"({self.calls} calls, {self.busy_seconds:.1f}s busy)"
+        )
+
+
+class PipelineStats:
+    """Throughput of every stage of an ingestion run, shared by all countries."""
+
+    def __init__(self, stages):
+        self.started = time.time()
+        self.stages = {name: StageStats(name, unit) for name, unit in stages}
+
+    def __getitem__(self, name):
+        return self.stages[name]
+
+    def timed(self, name, items, fn, *args, **kwargs):
+        """Runs fn, records its duration under the stage and returns its result."""
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.stages[name].record(items(result) if callable(items) else items, time.perf_counter() - start)
+        return result
+
+    def timed_iter(self, name, items, iterable):
+        """Yields from iterable, recording the time spent producing each item under the stage."""
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.stages[name].record(items(item) if callable(items) else items, time.perf_counter() - start)
+            yield item
+
+    def report(self):
+        elapsed = time.time() - self.started
+        lines = [f"Pipeline throughput after {elapsed / 60:.1f} minutes:"]
+        lines += [f"  {stage.report(elapsed)}" for stage in self.stages.values()]
+        return "\n".join(lines)
+
+
+def batched(iterable, size):
+    """Yields lists of up to `size` consecutive items."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def bounded_map(executor, fn, iterable, max_in_flight):
+    """
+    Lazily maps fn over iterable on an executor, yielding results in input order.
+    At most `max_in_flight` calls are queued or running at any time, which bounds the memory
+    held between stages and applies backpressure to the upstream generator.
+    """
+    pending = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
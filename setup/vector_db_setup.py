@@ -1,33 +1,136 @@
 
 import os
+import sys
+import threading
 import time
-from datetime import datetime
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
 
 import boto3
 import voyageai
-from voyageai.error import InvalidRequestError
-import tiktoken
-import pandas as pd
+from voyageai.error import RateLimitError
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
-from langchain.text_splitter import RecursiveCharacterTextSplitter
 
+from chunking import ChunkingEngine
 from dynamoDB import DynamoDB
+from embedding_batcher import AdaptiveConcurrency, EmbeddingBatcher
+from embedding_store import EmbeddingStore
+from manifest import IngestManifest, chunk_key, content_hash
+from parquet_stream import S3RangeReader, stream_records
+from pipeline import PipelineStats, batched, bounded_map
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from src.config.settings import settings
+
+# Only the columns chunking needs are read from the country archives
+SOURCE_COLUMNS = [
+    "id", "content_trans", "title_trans", "impact_score", "published_date",
+    *[f"pillar_{i}" for i in range(1, 9)]
+]
+
+# Chunking runs in worker processes, each builds its engine once
+_worker_engine = None
+
+
+def _chunking_engine():
+    global _worker_engine
+    if _worker_engine is None:
+        _worker_engine = ChunkingEngine(
+            model_name = "gpt-4o-mini",
+            chunk_size = 1000,
+            chunk_overlap = 100,
+            separators = ["\n\n", "\n", ". "],
+            split_threshold = 1150
+        )
+    return _worker_engine
+
+
+def _clean_metadata(metadata):
+    """
+    Make record values valid Pinecone metadata. Dates become ISO strings, which is how Pinecone's
+    client serialized the pandas Timestamps read before, and nulls are dropped since Pinecone
+    rejects null values (pandas produced NaN for them, which is not valid JSON either).
+    """
+    return {
+        key: value.isoformat() if isinstance(value, (date, datetime)) else value
+        for key, value in metadata.items()
+        if value is not None and value == value
+    }
+
+
+def prepare_document(doc, country):
+    """
+    Split a document into chunks and attach the metadata stored with each chunk.
+    Args:
+        doc (dict): A dictionary containing the document data.
+        country (str): Country the document belongs to.
+    Returns:
+        list: A list of dictionaries, each containing a chunk of text, its token count and its associated metadata.
+    """
+    id = doc["id"]
+    chunks = _chunking_engine().split(doc["content_trans"])
+
+    chunk_data_list = [
+        {
+            "text": chunk,
+            "tokens": tokens,
+            "metadata": _clean_metadata({
+                "article_id": id,
+                "chunk_id" : i,
+                "title" : doc["title_trans"],
+                "country" : country,
+                "pillar_1" : doc["pillar_1"],
+                "pillar_2" : doc["pillar_2"],
+                "pillar_3" : doc["pillar_3"],
+                "pillar_4" : doc["pillar_4"],
+                "pillar_5" : doc["pillar_5"],
+                "pillar_6" : doc["pillar_6"],
+                "pillar_7" : doc["pillar_7"],
+                "pillar_8" : doc["pillar_8"],
+                "impact_score" : doc["impact_score"],
+                "published_date" : doc["published_date"]
+            })
+        }
+        for i, (chunk, tokens) in enumerate(chunks)
+    ]
+
+    return chunk_data_list
+
+
+def prepare_documents(docs, country):
+    """
+    Chunk a group of documents in a worker process, dropping chunks with 75 tokens or less.
+    Returns:
+        tuple: The kept chunks and the seconds spent chunking.
+    """
+    start = time.perf_counter()
+    chunks = [
+        item
+        for doc in docs
+        for item in prepare_document(doc, country)
+        if item["tokens"] > 75 # Filter out chunks with <= 75 tokens
+    ]
+    return chunks, time.perf_counter() - start
 
 
 class VectorDBSetup:
     """Class to set up a vector database using data stored in S3, Voyage Embedding, and Pinecone."""
-    def __init__(self, country, s3_bucket, batch_size, index_name, embbeding_model, ddb_table):
+    def __init__(self, country, s3_bucket, batch_size, index_name, embbeding_model, ddb_table, dimension=1024, manifest=None, limiter=None, store=None):
         self.country = country
         self.s3_bucket = s3_bucket
         self.batch_size = batch_size
         self.index_name = index_name
         self.embbeding_model = embbeding_model
+        self.dimension = dimension    # Voyage output dimension, shared by the Pinecone index and the embedding store
 
         self.s3 = boto3.client("s3")
-        self.encoding = tiktoken.encoding_for_model("gpt-4o-mini")
         self.vc = voyageai.Client(os.getenv("VOYAGEAI_API_KEY"))
+        self.batcher = EmbeddingBatcher(self._embed_request, embbeding_model, limiter)   # limiter is shared by all countries of a run
         self.pc = Pinecone(
             api_key = os.getenv("PINECONE_API_KEY"), 
             pool_threads = 30
@@ -38,13 +141,17 @@ class VectorDBSetup:
         )
         self.ddb_table = ddb_table
         self.ddb = DynamoDB(self.ddb_resource, self.ddb_table)
+        self.manifest = manifest    # IngestManifest, enables incremental and resumable runs
+        self.store = store          # EmbeddingStore, vectors of unchanged texts are reused instead of re-embedded
+        self._local = threading.local()   # boto3 resources are not thread-safe, writer threads get their own
+        self._index = None
 
 
     def create_pinecone_index(self):
         if not self.pc.has_index(self.index_name):
             self.pc.create_index(
                 self.index_name,
-                dimension = 1024,
+                dimension = self.dimension,
                 spec = ServerlessSpec(
                     cloud = "aws",
                     region = "us-east-1"
@@ -53,161 +160,253 @@ class VectorDBSetup:
             )
             print(f"Index {self.index_name} created successfully ✅")
         else:
+            existing_dimension = self.pc.describe_index(self.index_name).dimension
+            if existing_dimension != self.dimension:
+                raise ValueError(
+                    f"Index {self.index_name} holds {existing_dimension}-dim vectors, "
+                    f"cannot ingest {self.dimension}-dim embeddings into it"
+                )
             print(f"Index {self.index_name} already exists ✅")
 
 
     def _retrieve_data(self):
         """
-        Retrieve data for the specified country from S3.
-        This method reads a Parquet file from S3, drops duplicate entries based on the 'id' column,
-        and converts the DataFrame to a list of dictionaries.
-        Returns:
-            list: A list of dictionaries containing the data for the specified country.
+        Stream the data for the specified country from S3.
+        The Parquet file is read through ranged GETs one record batch at a time and duplicate
+        entries based on the 'id' column are dropped on the fly, so memory stays flat no matter
+        how large the country's archive is.
+        Yields:
+            dict: One record per unique article of the specified country.
         """
-        country_data_s3 = self.s3.get_object(
-            Bucket = self.s3_bucket,
-            Key = f"{self.country}_master.parquet.gzip"
+        source = S3RangeReader(
+            self.s3,
+            bucket = self.s3_bucket,
+            key = f"{self.country}_master.parquet.gzip"
         )
-        country_data_df = pd.read_parquet(
-            BytesIO(country_data_s3["Body"].read()),
-            engine = "pyarrow"
-        ).drop_duplicates(subset = "id")
-        country_data = country_data_df.to_dict(orient="records")
-
-        print(f"{len(country_data)} records found for {self.country}")
+        count = 0
+        for record in stream_records(source, columns=SOURCE_COLUMNS):
+            count += 1
+            yield record
 
-        return country_data
+        print(f"{count} records found for {self.country} ({source.requests} S3 range requests)")
     
 
-    def _prepare_document_for_embedding(self, doc):
-        """
-        Prepare the document for embedding by splitting it into chunks and creating a list of dictionaries
-        containing the chunked text and metadata.
-        Args:
-            doc (dict): A dictionary containing the document data.
-        Returns:
-            list: A list of dictionaries, each containing a chunk of text and its associated metadata.
-        """
-        id = doc["id"]
-        text = doc["content_trans"]
-        text_length = len(self.encoding.encode(text))
+    def _thread_ddb(self):
+        """DynamoDB table wrapper owned by the calling thread."""
+        if not hasattr(self._local, "ddb"):
+            resource = boto3.session.Session().resource("dynamodb", region_name="us-east-1")
+            self._local.ddb = DynamoDB(resource, self.ddb_table)
+        return self._local.ddb
 
-        splitter = RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-            encoding_name = "cl100k_base",
-            model_name = "gpt-4o-mini",
-            chunk_size = 1000,
-            chunk_overlap = 100,
-            separators=["\n\n", "\n", ". "]
-        )
-        
-        if text_length <= 1150:
-            chunks = [text]
-        else:
-            chunks = splitter.split_text(text)
-
-        chunk_data_list = [
-            {
-                "text": chunk.strip(". "),
-                "metadata": {
-                    "article_id": id,
-                    "chunk_id" : i,
-                    "title" : doc["title_trans"],
-                    "country" : self.country,
-                    "pillar_1" : doc["pillar_1"],
-                    "pillar_2" : doc["pillar_2"],
-                    "pillar_3" : doc["pillar_3"],
-                    "pillar_4" : doc["pillar_4"],
-                    "pillar_5" : doc["pillar_5"],
-                    "pillar_6" : doc["pillar_6"],
-                    "pillar_7" : doc["pillar_7"],
-                    "pillar_8" : doc["pillar_8"],
-                    "impact_score" : doc["impact_score"],
-                    "published_date" : doc["published_date"]
-                }
-            }
-            for i, chunk in enumerate(chunks)
-        ]
-        
-        return chunk_data_list
-    
 
-    def retrieve_and_prepare_data(self):
-        """Retrieve and prepare data for embedding."""
+    def _embed_request(self, texts):
+        return self.vc.embed(
+            texts,
+            model = self.embbeding_model,
+            input_type = "document",
+            output_dimension = self.dimension
+        ).embeddings
 
-        print("Retrieving data from S3...")
-        country_data = self._retrieve_data()
-        print("Data retrieval complete! ✅")
 
-        print("Flattening record data for embedding...")
-        processed_chunks = [
-            self._prepare_document_for_embedding(doc) 
-            for doc in country_data
-        ]
-        flattened_processed_chunks_all = [
-            item 
-            for sublist in processed_chunks 
-            for item in sublist
-        ]
-        flattened_processed_chunks = [
-            item 
-            for item in flattened_processed_chunks_all
-            if len(self.encoding.encode(item["text"])) > 75 # Filter out chunks with <= 75 tokens
-        ]
-        print("Data flattening complete! ✅")
-        print("Total amount of chunks to process:", len(flattened_processed_chunks))
+    def _embed(self, texts):
+        """Embed a packed batch, None for the chunks Voyage rejected."""
+        return self.batcher.embed(texts)
 
-        return flattened_processed_chunks
-    
 
-    def embbed_and_ingest(self, batch, batch_num):
+    def _embed_or_reuse(self, ids, texts, metadata):
         """
-        Embed and ingest a batch of documents into the Pinecone index.
-        Args:
-            batch (list): A list of dictionaries, each containing a document's id, text, and metadata.
+        Embed a batch, reading vectors of unchanged texts from the local store and storing the new ones.
         Returns:
-            async_result: The result of the asynchronous upsert operation to Pinecone.
+            tuple: One embedding per chunk (None for chunks Voyage rejected) and the number reused.
         """
-        ids = [
-            f"{self.country.upper()[0:3]}_B{batch_num}C{n}" 
-            for n,_ in enumerate(batch)
-        ]
-        texts = [item["text"] for item in batch]
-        metadata = [item["metadata"] for item in batch]
-
-        docs = [
-            {"chunk_id": a, "text": b} 
-            for a,b in zip(ids, texts)
-        ]
-        self.ddb.add_chunks(  ## Uploading full text chunk to DynamoDB
-            docs
+        if self.store is None:
+            return self._embed(texts), 0
+
+        hashes = [self.store.text_hash(text) for text in texts]
+        embeddings = self.store.get_many(ids, hashes)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        fresh = [None] * len(texts)
+        if missing:
+            for i, embedding in zip(missing, self._embed([texts[i] for i in missing])):
+                embeddings[i] = fresh[i] = embedding
+        # Reused vectors are passed as None, which only refreshes their metadata
+        self.store.put(ids, hashes, fresh, metadata)
+        return embeddings, len(texts) - len(missing)
+
+
+    def _write_chunks(self, ids, texts):
+        """Upload full text chunks to DynamoDB."""
+        self._thread_ddb().add_chunks(
+            [{"chunk_id": a, "text": b} for a,b in zip(ids, texts)]
         )
 
-        try:
-            embeddings = self.vc.embed(
-                texts,
-                model = self.embbeding_model,
-                input_type = "document"
-            ).embeddings
-        except voyageai.error.InvalidRequestError as e:
-            print(f"Error embedding batch {batch_num}: {e}")
 
+    def _get_index(self):
+        if self._index is None:
+            self._index = self.pc.Index(self.index_name, pool_threads=30)
+        return self._index
+
+
+    def _upsert(self, ids, embeddings, metadata):
+        """Upsert vectors through the index handle shared by the whole run, in requests of batch_size vectors."""
         vectors = [
             {"id": a, "values": b, "metadata": c} 
             for a,b,c in zip(ids, embeddings, metadata)
         ]
+        return self._get_index().upsert(
+            vectors = vectors, 
+            namespace = settings.PINECONE_NAMESPACE, 
+            batch_size = self.batch_size, 
+            show_progress = False
+        )
 
-        with self.pc.Index(self.index_name, pool_threads=30) as index:
-            async_result = index.upsert(
-                vectors=vectors, 
-                namespace="ns-1",
-                async_req=True
-            ) 
 
-        return async_result.get()
+    def _publish_version(self):
+        """Write a new version token for the namespace, so query-side caches drop results from before this run."""
+        self._get_index().upsert(
+            vectors = [{
+                "id": settings.PINECONE_NAMESPACE,
+                "values": [1.0] + [0.0] * (self.dimension - 1),
+                "metadata": {"version": str(time.time_ns())}
+            }],
+            namespace = settings.PINECONE_VERSION_NAMESPACE
+        )
+
+
+    def _delete(self, ids, page_size=1000):
+        """Delete stale chunks from Pinecone and DynamoDB, then forget them in the manifest."""
+        for page in batched(ids, page_size):
+            self._get_index().delete(ids=page, namespace=settings.PINECONE_NAMESPACE)
+            self._thread_ddb().delete_chunks(page)
+            if self.store is not None:
+                self.store.remove(page)
+            if self.manifest is not None:
+                self.manifest.remove(page)
+
+
+    def ingest(self, chunk_pool, embed_pool, write_pool, stats, chunk_backlog=8, embed_concurrency=8, write_backlog=16, docs_per_task=32):
+        """
+        Run the staged ingestion pipeline for this country.
+
+        Documents are streamed from S3 and chunked in a process pool, chunks are packed into
+        batches by token count and embedded concurrently on the shared embedding pool, and
+        DynamoDB writes and Pinecone upserts run on the shared write pool, so they overlap with
+        embedding. Each hand-off is bounded, so a slow stage throttles the stages upstream of it
+        instead of buffering the whole country in memory.
+
+        With a manifest, chunks whose content hash is already committed are skipped, a batch is
+        committed once both its writes succeeded, and chunks the source no longer produces are
+        deleted at the end of a complete run. With an embedding store, chunks whose text was
+        already embedded are upserted from the stored vectors without calling Voyage.
+        Args:
+            chunk_pool (ProcessPoolExecutor): Pool running the chunking stage.
+            embed_pool (ThreadPoolExecutor): Pool running Voyage embedding calls.
+            write_pool (ThreadPoolExecutor): Pool running DynamoDB writes and Pinecone upserts.
+            stats (PipelineStats): Throughput counters shared by all countries.
+            chunk_backlog (int): Chunking tasks in flight for this country.
+            embed_concurrency (int): Embedding calls in flight for this country.
+            write_backlog (int): Writes and upserts in flight for this country.
+            docs_per_task (int): Documents chunked per worker task.
+        Returns:
+            dict: Counts of upserted, unchanged, deleted and reused (not re-embedded) chunks.
+        """
+        self._get_index()
+        committed = self.manifest.hashes(self.country) if self.manifest is not None else {}
+        seen = set()
+        counts = {"upserted": 0, "unchanged": 0, "deleted": 0, "reused": 0}
+        writes, commits = deque(), deque()
+
+        def submit_write(stage, items, fn, *args):
+            future = write_pool.submit(stats.timed, stage, items, fn, *args)
+            writes.append(future)
+            while len(writes) > write_backlog:
+                writes.popleft().result()
+            return future
+
+        def commit_ready(wait=False):
+            # A batch is committed once both its DynamoDB write and its upsert have succeeded
+            while commits and (wait or all(future.done() for future in commits[0][:2])):
+                ddb_write, upsert, entries = commits.popleft()
+                ddb_write.result()
+                upsert.result()
+                if self.manifest is not None:
+                    self.manifest.commit(self.country, entries)
+                counts["upserted"] += len(entries)
+
+        def chunk_stage():
+            groups = stats.timed_iter("read", len, batched(self._retrieve_data(), docs_per_task))
+            task = partial(prepare_documents, country=self.country)
+            for chunks, seconds in bounded_map(chunk_pool, task, groups, max_in_flight=chunk_backlog):
+                stats["chunk"].record(len(chunks), seconds)
+                yield from chunks
+
+        def change_stage():
+            # Only new or changed chunks continue past this point
+            for chunk in chunk_stage():
+                chunk_id = chunk_key(chunk["metadata"]["article_id"], chunk["metadata"]["chunk_id"])
+                seen.add(chunk_id)
+                digest = content_hash(chunk)
+                if committed.get(chunk_id) == digest:
+                    counts["unchanged"] += 1
+                    continue
+                yield chunk_id, digest, chunk
+
+        def batch_stage():
+            # Chunk texts do not depend on embeddings, so they go to DynamoDB right away
+            packed = self.batcher.pack(change_stage(), tokens=lambda item: item[2]["tokens"])
+            for batch_num, batch in enumerate(packed, start=1):
+                ids = [chunk_id for chunk_id, _, _ in batch]
+                texts = [chunk["text"] for _, _, chunk in batch]
+                ddb_write = submit_write("dynamodb", len(ids), self._write_chunks, ids, texts)
+                yield batch_num, batch, ddb_write
+
+        def embed(item):
+            batch_num, batch, ddb_write = item
+            ids = [chunk_id for chunk_id, _, _ in batch]
+            texts = [chunk["text"] for _, _, chunk in batch]
+            try:
+                embeddings, reused = stats.timed(
+                    "embed", len(batch), self._embed_or_reuse, ids, texts, [chunk["metadata"] for _, _, chunk in batch]
+                )
+            except RateLimitError as e:
+                # Left uncommitted, so the next run retries the batch
+                print(f"Error embedding {self.country} batch {batch_num}: {e}")
+                embeddings, reused = None, 0
+            return batch_num, batch, ddb_write, embeddings, reused
+
+        for batch_num, batch, ddb_write, embeddings, reused in bounded_map(embed_pool, embed, batch_stage(), embed_concurrency):
+            counts["reused"] += reused
+            if embeddings is None:
+                continue
+            # Chunks Voyage rejected are neither upserted nor committed
+            kept = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+            if not kept:
+                continue
+            batch, embeddings = [batch[i] for i in kept], [embeddings[i] for i in kept]
+            ids = [chunk_id for chunk_id, _, _ in batch]
+            upsert = submit_write("upsert", len(ids), self._upsert, ids, embeddings, [chunk["metadata"] for _, _, chunk in batch])
+            commits.append((ddb_write, upsert, [(chunk_id, digest) for chunk_id, digest, _ in batch]))
+            commit_ready()
+            if batch_num % 50 == 0:
+                print(f"{self.country}: {batch_num} batches embedded")
+
+        while writes:
+            writes.popleft().result()
+        commit_ready(wait=True)
+
+        # The whole source was read, so committed chunks that were not produced again are stale
+        stale = self.manifest.stale(self.country, seen) if self.manifest is not None else []
+        if stale:
+            stats.timed("delete", len(stale), self._delete, stale)
+        counts["deleted"] = len(stale)
+
+        if counts["upserted"] or counts["deleted"]:
+            self._publish_version()
+        return counts
         
 
 def main():
-    """Main function to set up the vector database for each EU member state."""
+    """Main function to set up the vector database for the EU member states, running countries concurrently."""
 
     start_time = datetime.now()
     print(f"Started at: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -244,39 +443,83 @@ def main():
         ## "Sweden"
     ] # Adjusted for testing purposes
 
-    for country in eu_member_states:
-        print("============================================")
+    country_concurrency = int(os.getenv("INGEST_COUNTRY_CONCURRENCY", 4))
+    chunk_workers = int(os.getenv("INGEST_CHUNK_WORKERS", os.cpu_count() or 1))
+    embed_concurrency = int(os.getenv("INGEST_EMBED_CONCURRENCY", 16))    # Upper bound, the limiter adapts below it
+    write_concurrency = int(os.getenv("INGEST_WRITE_CONCURRENCY", 16))
+    report_interval = int(os.getenv("INGEST_REPORT_INTERVAL", 60))
+    compact_ratio = float(os.getenv("INGEST_STORE_COMPACT_RATIO", 0.25))   # Garbage share of the store that triggers compaction
+
+    config = {
+        "s3_bucket": "eurovoices-news-articles-data",
+        "batch_size": 100,    # Vectors per Pinecone upsert request, embedding batches are packed by tokens
+        "index_name": settings.PINECONE_INDEX,
+        "embbeding_model": settings.VOYAGE_MODEL,
+        "dimension": settings.EMBEDDING_DIMENSION,
+        "ddb_table": "eurovoices-chunked-news",
+        "manifest": IngestManifest(settings.INGEST_MANIFEST_PATH),
+        "limiter": AdaptiveConcurrency(initial=4, maximum=embed_concurrency),
+    }
+    config["store"] = EmbeddingStore(
+        settings.EMBEDDING_STORE_PATH, 
+        model = config["embbeding_model"], 
+        dimension = config["dimension"], 
+        dtype = settings.EMBEDDING_STORE_DTYPE
+    )
+
+    print("Checking if pinecone index exists...")
+    VectorDBSetup(country=eu_member_states[0], **config).create_pinecone_index()
+    print("----------------")
+
+    stats = PipelineStats([
+        ("read", "docs"),
+        ("chunk", "chunks"),
+        ("dynamodb", "chunks"),
+        ("embed", "chunks"),
+        ("upsert", "vectors"),
+        ("delete", "chunks"),
+    ])
+    stop_reporting = threading.Event()
+
+    def report_progress():
+        while not stop_reporting.wait(report_interval):
+            print(stats.report())
+
+    def run_country(country):
         print(f"PROCESSING DATA FOR {country.upper()} 🌎")
-        print("============================================")
-
-        print("Preparing setup instance...")
-        setup_instance = VectorDBSetup(
-            country=country,
-            s3_bucket = "eurovoices-news-articles-data",
-            batch_size = 100,
-            index_name = "eurovoices-news-articles-vdb",
-            embbeding_model = "voyage-3.5",
-            ddb_table = "eurovoices-chunked-news"
+        setup_instance = VectorDBSetup(country=country, **config)
+        return setup_instance.ingest(
+            chunk_pool, embed_pool, write_pool, stats,
+            chunk_backlog = 2 * chunk_workers,
+            embed_concurrency = embed_concurrency,
+            write_backlog = write_concurrency
         )
-        print("Instance prepared successfully! ✅")
-        print("----------------")
-
-        print("Checking if pinecone index exists...")
-        setup_instance.create_pinecone_index()
-        print("----------------")
-
-        print("Retrieving and preparing data for embedding...")
-        flattened_processed_chunks = setup_instance.retrieve_and_prepare_data()
-        print("----------------")
-
-        print(f"Preparing to process data in batches. Batch size: {setup_instance.batch_size} chunks of text")
-        n_batches = (len(flattened_processed_chunks) + setup_instance.batch_size - 1) // setup_instance.batch_size
-        for batch_num, i in enumerate(range(0, len(flattened_processed_chunks), setup_instance.batch_size), start=1):
-            print(f"Processing batch {batch_num} of {n_batches}")
-            setup_instance.embbed_and_ingest(
-                flattened_processed_chunks[i : i + setup_instance.batch_size],
-                batch_num
+
+    threading.Thread(target=report_progress, daemon=True).start()
+    with ProcessPoolExecutor(max_workers=chunk_workers, mp_context=get_context("spawn")) as chunk_pool, \
+            ThreadPoolExecutor(max_workers=embed_concurrency) as embed_pool, \
+            ThreadPoolExecutor(max_workers=write_concurrency) as write_pool, \
+            ThreadPoolExecutor(max_workers=country_concurrency) as country_pool:
+
+        futures = {country_pool.submit(run_country, country): country for country in eu_member_states}
+        for future in as_completed(futures):
+            counts = future.result()
+            print(
+                f"{futures[future]}: {counts['upserted']} chunks upserted, {counts['unchanged']} unchanged, "
+                f"{counts['deleted']} stale chunks deleted, {counts['reused']} embeddings reused ✅"
             )
+
+    stop_reporting.set()
+    print(stats.report())
+    limiter = config["limiter"]
+    print(f"Embedding concurrency settled at {limiter.limit:.1f} ({limiter.rate_limited} rate-limited requests)")
+
+    store = config["store"]
+    garbage = store.garbage
+    if garbage and garbage >= compact_ratio * (garbage + len(store)):
+        print(f"Compacting the embedding store, {garbage} replaced or removed vectors...")
+        print(f"{store.compact()} vectors reclaimed ✅")
+    store.close()
     
     print("=============================================================")
     print("Vector DB setup and data ingestion completed successfully! ✅")
@@ -290,4 +533,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
@@ -1,6 +1,13 @@
 """Agentic RAG system for news events search."""
 
-from .graph.workflow import create_workflow
-
 __version__ = "1.0.0"
-__all__ = ["create_workflow", "main"]
\ No newline at end of file
+__all__ = ["create_workflow", "main"]
+
+
+def __getattr__(name):
+    # The graph imports langchain, langgraph and every client SDK; importing it lazily keeps
+    # `src.config` and `src.clients` usable from the setup scripts and their worker processes
+    if name == "create_workflow":
+        from .graph.workflow import create_workflow
+        return create_workflow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+from .lru import LRUCache, CacheStats
+from .embeddings import EmbeddingCache
+from .retrieval import RetrievalCache
+from .version import IndexVersion
+
+__all__ = ["LRUCache", "CacheStats", "EmbeddingCache", "RetrievalCache", "IndexVersion"]
@@ -0,0 +1,104 @@
+import hashlib
+import sqlite3
+import threading
+from array import array
+from pathlib import Path
+from typing import List, Optional
+
+from .lru import LRUCache, CacheStats
+
+class EmbeddingCache:
+    """Two-tier cache for query embeddings: an in-memory LRU and an optional SQLite store on disk."""
+
+    def __init__(self, max_bytes: int, path: Optional[str] = None):
+        self.memory = LRUCache(max_bytes, sizeof=lambda vector: len(vector) * 4)
+        self.stats = CacheStats()
+        self.disk_hits = 0
+        self._conn = None
+        self._lock = threading.Lock()
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.stats.hit_ratio
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapses whitespace and case so trivially different queries share an entry."""
+        return " ".join(text.split()).casefold()
+
+    def make_key(self, model: str, text: str) -> str:
+        """
+        Builds the cache key for a model and query text.
+
+        Args:
+            model (str): Embedding model name.
+            text (str): Raw query text.
+
+        Returns:
+            str: A stable hexadecimal key.
+        """
+        payload = f"{model}\x1f{self.normalize(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """
+        Looks up a cached embedding, promoting disk hits into memory.
+
+        Args:
+            model (str): Embedding model name.
+            text (str): Raw query text.
+
+        Returns:
+            Optional[List[float]]: The cached embedding or None on a miss.
+        """
+        key = self.make_key(model, text)
+
+        vector = self.memory.get(key)
+        if vector is not None:
+            self.stats.hits += 1
+            return list(vector)
+
+        if self._conn is not None:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+            if row is not None:
+                vector = array("f")
+                vector.frombytes(row[0])
+                self.memory.put(key, vector)
+                self.stats.hits += 1
+                self.disk_hits += 1
+                return list(vector)
+
+        self.stats.misses += 1
+        return None
+
+    def put(self, model: str, text: str, embedding: List[float]) -> None:
+        """
+        Stores an embedding in memory and, if enabled, on disk.
+
+        Args:
+            model (str): Embedding model name.
+            text (str): Raw query text.
+            embedding (List[float]): The embedding to store.
+        """
+        key = self.make_key(model, text)
+        vector = array("f", embedding)
+        self.memory.put(key, vector)
+
+        if self._conn is not None:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, vector.tobytes())
+                )
+                self._conn.commit()
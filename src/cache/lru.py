@@ -0,0 +1,149 @@
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+@dataclass
+class CacheStats:
+    """Counters describing how a cache has been used."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LRUCache:
+    """
+    Thread-safe, byte-budgeted least-recently-used cache.
+
+    With a `version` callable (e.g. an `IndexVersion`), every entry is dropped when the version
+    it returns changes, for values derived from the ingested data.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        sizeof: Optional[Callable[[Any], int]] = None,
+        version: Optional[Callable[[], Any]] = None
+    ):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or sys.getsizeof
+        self.version = version
+        self.stats = CacheStats()
+        self.invalidations = 0
+        self._version = None
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: Dict[Hashable, int] = {}
+        self._current_bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    @property
+    def current_bytes(self) -> int:
+        return self._current_bytes
+
+    def _check_version(self, version: Any) -> None:
+        """Drops every entry when the version has changed. Called with the lock held."""
+        if self.version is None:
+            return
+        if self._version is not None and version != self._version:
+            self._entries.clear()
+            self._sizes.clear()
+            self._current_bytes = 0
+            self.invalidations += 1
+        self._version = version
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value for key, marking it as most recently used.
+
+        Args:
+            key (Hashable): Cache key.
+            default (Any): Value returned on a miss.
+
+        Returns:
+            Any: The cached value or default.
+        """
+        version = self.version() if self.version is not None else None
+        with self._lock:
+            self._check_version(version)
+            if key not in self._entries:
+                self.stats.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return self._entries[key]
+
+    def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        """
+        Looks up several keys at once.
+
+        Args:
+            keys (Iterable[Hashable]): Cache keys.
+
+        Returns:
+            Dict[Hashable, Any]: Cached values for the keys that were found.
+        """
+        found = {}
+        version = self.version() if self.version is not None else None
+        with self._lock:
+            self._check_version(version)
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.stats.hits += 1
+                    found[key] = self._entries[key]
+                else:
+                    self.stats.misses += 1
+        return found
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Stores a value, evicting least recently used entries until the byte budget is respected.
+        Values larger than the whole budget are not cached.
+
+        Args:
+            key (Hashable): Cache key.
+            value (Any): Value to store.
+        """
+        size = self.sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        version = self.version() if self.version is not None else None
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._current_bytes -= self._sizes.pop(key)
+                del self._entries[key]
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._current_bytes += size
+
+            while self._current_bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._current_bytes -= self._sizes.pop(old_key)
+                self.stats.evictions += 1
+
+    def put_many(self, items: Dict[Hashable, Any]) -> None:
+        """Stores several values at once."""
+        for key, value in items.items():
+            self.put(key, value)
+
+    def clear(self) -> None:
+        """Drops every entry without touching the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._current_bytes = 0
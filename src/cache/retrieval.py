@@ -0,0 +1,174 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .lru import CacheStats
+
+class RetrievalCache:
+    """
+    Semantic cache of ranked search matches.
+
+    Entries are grouped by their exact (normalized) metadata filters and, for searches whose
+    results also depend on the query wording (lexical or hybrid search), by a text key such as
+    the query's lexical terms. Within a group, a lookup is
+    served when the cosine similarity between the new query embedding and a cached one reaches
+    the configured threshold. Entries expire after a TTL and the whole cache is dropped when the
+    index version reported by `index_version` changes. When full, the least recently used entry
+    across all groups is evicted.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = 0.97,
+        ttl_seconds: float = 3600,
+        max_entries: int = 1024,
+        index_version: Optional[Callable[[], Any]] = None,
+        version_check_interval: float = 300
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.index_version = index_version
+        self.version_check_interval = version_check_interval
+
+        self.stats = CacheStats()
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.invalidations = 0
+
+        self._groups: Dict[str, "OrderedDict[int, Dict[str, Any]]"] = {}
+        self._size = 0
+        self._next_id = 0
+        self._version = None
+        self._version_checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def near_hit_ratio(self) -> float:
+        """Share of all lookups served by a near (non-identical) embedding."""
+        lookups = self.stats.hits + self.stats.misses
+        return self.near_hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def filter_key(filters: Dict[Any, Any]) -> str:
+        """Serializes a filter dict so that equivalent filters map to the same group."""
+        return json.dumps(filters or {}, sort_keys=True, default=str)
+
+    def group_key(self, filters: Dict[Any, Any], text_key: str = "") -> str:
+        """Key of the group an entry belongs to, its filters plus the optional text key."""
+        key = self.filter_key(filters)
+        return f"{key}|{text_key}" if text_key else key
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, embedding: List[float], filters: Dict[Any, Any], text_key: str = "") -> Optional[List[Any]]:
+        """
+        Returns the cached matches of the most similar query under identical filters.
+
+        Args:
+            embedding (List[float]): The embedded query.
+            filters (Dict[Any, Any]): The metadata filters of the query.
+            text_key (str): Exact-match key of the query text, for results that depend on it.
+
+        Returns:
+            Optional[List[Any]]: Cached matches in rank order, or None on a miss.
+        """
+        self._check_version()
+        query = self._unit(embedding)
+        now = time.monotonic()
+
+        with self._lock:
+            group = self._groups.get(self.group_key(filters, text_key))
+            best_id, best_score = None, -1.0
+
+            if group:
+                for entry_id in [k for k, v in group.items() if v["expires_at"] <= now]:
+                    del group[entry_id]
+                    self._size -= 1
+
+                if group:
+                    ids = list(group.keys())
+                    scores = np.stack([group[i]["vector"] for i in ids]) @ query
+                    best = int(np.argmax(scores))
+                    best_id, best_score = ids[best], float(scores[best])
+
+            if best_id is None or best_score < self.similarity_threshold:
+                self.stats.misses += 1
+                return None
+
+            group.move_to_end(best_id)
+            group[best_id]["last_used"] = now
+            self.stats.hits += 1
+            if best_score >= 1.0 - 1e-6:
+                self.exact_hits += 1
+            else:
+                self.near_hits += 1
+            return group[best_id]["matches"]
+
+    def put(self, embedding: List[float], filters: Dict[Any, Any], matches: List[Any], text_key: str = "") -> None:
+        """
+        Stores the ranked matches of a query.
+
+        Args:
+            embedding (List[float]): The embedded query.
+            filters (Dict[Any, Any]): The metadata filters of the query.
+            matches (List[Any]): The ranked matches returned by the vector index.
+            text_key (str): Exact-match key of the query text, see `get`.
+        """
+        now = time.monotonic()
+        entry = {
+            "vector": self._unit(embedding),
+            "matches": matches,
+            "expires_at": now + self.ttl_seconds,
+            "last_used": now,
+        }
+
+        with self._lock:
+            group = self._groups.setdefault(self.group_key(filters, text_key), OrderedDict())
+            group[self._next_id] = entry
+            self._next_id += 1
+            self._size += 1
+
+            # Groups are kept in recency order, so each group's head is its least recently used entry
+            while self._size > self.max_entries:
+                oldest_key = min(
+                    (k for k, g in self._groups.items() if g),
+                    key=lambda k: self._groups[k][next(iter(self._groups[k]))]["last_used"]
+                )
+                self._groups[oldest_key].popitem(last=False)
+                self._size -= 1
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drops every cached entry."""
+        with self._lock:
+            self._groups.clear()
+            self._size = 0
+
+    def _check_version(self) -> None:
+        """Invalidates the cache when the index version has changed since the last check."""
+        if self.index_version is None:
+            return
+        now = time.monotonic()
+        if now - self._version_checked_at < self.version_check_interval:
+            return
+        self._version_checked_at = now
+
+        try:
+            version = self.index_version()
+        except Exception as e:
+            print(f"Index version could not be checked ❌. Here's why: {e}")
+            return
+
+        if self._version is not None and version != self._version:
+            self.clear()
+            self.invalidations += 1
+        self._version = version
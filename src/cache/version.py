@@ -0,0 +1,32 @@
+import threading
+import time
+from typing import Any, Callable
+
+class IndexVersion:
+    """
+    Throttled view of the index version token, shared by every query-side cache.
+
+    Ingestion publishes a new token after each run that changed the index, and a cache that
+    sees the token change drops its entries. Fetching the token is a network call, so it is
+    refreshed at most once per `check_interval` seconds and all caches compare against the same
+    value. A failed fetch keeps the last known token.
+    """
+
+    def __init__(self, fetch: Callable[[], Any], check_interval: float = 30):
+        self.fetch = fetch
+        self.check_interval = check_interval
+        self._version = None
+        self._checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at < self.check_interval:
+                return self._version
+            self._checked_at = now
+            try:
+                self._version = self.fetch()
+            except Exception as e:
+                print(f"Index version could not be checked ❌. Here's why: {e}")
+            return self._version
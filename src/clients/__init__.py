@@ -1,5 +1,19 @@
-from .voyage import VoyageClient
-from .pinecone import PineconeClient
-from .dynamodb import DynamoDBClient
+from importlib import import_module
 
-__all__ = ["VoyageClient", "PineconeClient", "DynamoDBClient"]
\ No newline at end of file
+# Clients are imported on first use, so setup scripts that need one client (e.g. the local
+# index) do not import the SDKs of all the others
+_CLIENTS = {
+    "VoyageClient": ".voyage",
+    "PineconeClient": ".pinecone",
+    "DynamoDBClient": ".dynamodb",
+    "LocalIndexClient": ".local_index",
+    "BM25Index": ".bm25_index",
+}
+
+__all__ = list(_CLIENTS)
+
+
+def __getattr__(name):
+    if name not in _CLIENTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_CLIENTS[name], __name__), name)
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import math
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .local_index import LocalMatch
+from .metadata_index import MetadataIndex
+from ..retrieval.rerank import STOPWORDS, tokenize
+
+class BM25Index:
+    """
+    Local inverted index over chunk text, scored with Okapi BM25.
+
+    Postings are stored in CSR form as memory-mapped arrays: `offsets.npy` (int64, one slot per
+    term plus one) delimits each term's slice of `postings_rows.npy` (uint32 row numbers) and
+    `postings_tf.npy` (uint16 term frequencies). Row token counts live in `lengths.npy`, the
+    vocabulary in `vocab.json` and the row ids and metadata in the same `ids.json` and
+    `metadata.jsonl` layout as the local vector index, so filters go through MetadataIndex.
+    """
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+
+        self.offsets = np.load(self.path / "offsets.npy", mmap_mode="r")
+        self.postings_rows = np.load(self.path / "postings_rows.npy", mmap_mode="r")
+        self.postings_tf = np.load(self.path / "postings_tf.npy", mmap_mode="r")
+        self.lengths = np.load(self.path / "lengths.npy", mmap_mode="r")
+        self.vocab = {term: i for i, term in enumerate(json.loads((self.path / "vocab.json").read_text()))}
+        self.ids = json.loads((self.path / "ids.json").read_text())
+        with open(self.path / "metadata.jsonl") as f:
+            self.metadata = [json.loads(line) for line in f]
+
+        if not (len(self.ids) == len(self.metadata) == len(self.lengths)):
+            raise ValueError(f"BM25 index at {self.path} is inconsistent: ids, metadata and lengths differ in length")
+
+        self.n_rows = len(self.ids)
+        self.average_length = float(np.mean(self.lengths)) if self.n_rows else 0.0
+        self.metadata_index = MetadataIndex(self.metadata)
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        ids: List[str],
+        texts: List[str],
+        metadata: List[Dict[str, Any]]
+    ) -> "BM25Index":
+        """
+        Writes a BM25 index to disk and opens it.
+
+        Args:
+            path (str): Target directory.
+            ids (List[str]): Chunk identifiers.
+            texts (List[str]): Chunk texts aligned with ids.
+            metadata (List[Dict[str, Any]]): Chunk metadata aligned with ids.
+
+        Returns:
+            BM25Index: The opened index.
+        """
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+
+        vocab: Dict[str, int] = {}
+        term_ids, rows, frequencies = [], [], []
+        lengths = np.zeros(len(texts), dtype=np.uint32)
+        for row, text in enumerate(texts):
+            terms = Counter(tokenize(text or ""))
+            lengths[row] = sum(terms.values())
+            for term, frequency in terms.items():
+                term_ids.append(vocab.setdefault(term, len(vocab)))
+                rows.append(row)
+                frequencies.append(min(frequency, np.iinfo(np.uint16).max))
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        order = np.lexsort((np.asarray(rows, dtype=np.int64), term_ids))
+        offsets = np.zeros(len(vocab) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(term_ids, minlength=len(vocab)))
+
+        np.save(target / "offsets.npy", offsets)
+        np.save(target / "postings_rows.npy", np.asarray(rows, dtype=np.uint32)[order])
+        np.save(target / "postings_tf.npy", np.asarray(frequencies, dtype=np.uint16)[order])
+        np.save(target / "lengths.npy", lengths)
+        (target / "vocab.json").write_text(json.dumps(sorted(vocab, key=vocab.get)))
+        (target / "ids.json").write_text(json.dumps(list(ids)))
+        with open(target / "metadata.jsonl", "w") as f:
+            for record in metadata:
+                f.write(json.dumps(record, default=str) + "\n")
+
+        return cls(path)
+
+    def index_version(self) -> int:
+        """
+        Returns a version marker used to invalidate caches after the index is rebuilt.
+
+        Returns:
+            int: Modification time of the postings file, in nanoseconds.
+        """
+        return (self.path / "postings_rows.npy").stat().st_mtime_ns
+
+    @staticmethod
+    def query_terms(text: str) -> List[str]:
+        """The distinct terms a query is scored on, sorted, so equal lists mean equal BM25 results."""
+        return sorted({term for term in tokenize(text) if term not in STOPWORDS})
+
+    def _score(self, text: str) -> np.ndarray:
+        """Accumulates the BM25 score of every row for the query terms."""
+        scores = np.zeros(self.n_rows, dtype=np.float32)
+        for term in self.query_terms(text):
+            term_id = self.vocab.get(term)
+            if term_id is None:
+                continue
+            start, stop = int(self.offsets[term_id]), int(self.offsets[term_id + 1])
+            rows = self.postings_rows[start:stop]
+            frequency = self.postings_tf[start:stop].astype(np.float32)
+            document_frequency = stop - start
+            idf = math.log(1 + (self.n_rows - document_frequency + 0.5) / (document_frequency + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * self.lengths[rows] / self.average_length)
+            # Posting rows are unique per term, so fancy-indexed accumulation is safe
+            scores[rows] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+        return scores
+
+    def query(self, text: str, filters: Dict[Any, Any], top_k: int = 50) -> List[LocalMatch]:
+        """
+        Query the index with free text and Pinecone-style metadata filters.
+
+        Args:
+            text (str): The search query.
+            filters (Dict[Any, Any]): Pinecone-style metadata filters to apply to the query.
+            top_k (int): Number of results to return.
+
+        Returns:
+            List[LocalMatch]: The best matching chunks, ordered by descending BM25 score.
+        """
+        if not self.n_rows:
+            return []
+        scores = self._score(text)
+
+        rows = self.metadata_index.candidate_rows(filters)
+        if rows is not None:
+            allowed = np.zeros(self.n_rows, dtype=bool)
+            allowed[rows] = True
+            scores[~allowed] = 0.0
+
+        hits = np.flatnonzero(scores)
+        k = min(top_k, len(hits))
+        if k == 0:
+            return []
+        best = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        best = best[np.argsort(-scores[best])]
+
+        return [
+            LocalMatch(id=self.ids[row], score=float(scores[row]), metadata=self.metadata[row])
+            for row in best
+        ]
+
+    async def aquery(self, text: str, filters: Dict[Any, Any], top_k: int = 50) -> List[LocalMatch]:
+        """Runs `query` in a worker thread so CPU-bound scoring does not block the event loop."""
+        return await asyncio.to_thread(self.query, text, filters, top_k)
@@ -1,28 +1,291 @@
+import time
+import random
+import asyncio
+from contextlib import AsyncExitStack
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
 import boto3
+import aioboto3
+from aiobotocore.config import AioConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-from typing import Optional
+
+from ..cache import LRUCache, CacheStats
+from ..utils.event_loops import close_on_loop
 
 class DynamoDBClient:
     """Client for DynamoDB operations on chunked news articles."""
 
-    def __init__(self, table_name: str, region_name: str = "us-east-1"):
-        self.dyn_resource = boto3.resource("dynamodb", region_name=region_name)
+    BATCH_GET_LIMIT = 100  # Maximum number of keys accepted by a single BatchGetItem call
+
+    def __init__(
+        self,
+        table_name: str,
+        region_name: str = "us-east-1",
+        max_workers: int = 8,
+        max_retries: int = 5,
+        backoff_base: float = 0.05,
+        cache_max_bytes: int = 0,
+        max_pool_connections: int = 50,
+        cache_version: Optional[Callable[[], Any]] = None
+    ):
+        self.table_name = table_name
+        self.region_name = region_name
+        self.dyn_resource = boto3.resource(
+            "dynamodb",
+            region_name=region_name,
+            config=Config(max_pool_connections=max_pool_connections)
+        )
         self.table = self.dyn_resource.Table(table_name)
-    
+        # Resources are not thread-safe but their client is, so shared reads go through it
+        self.client = self.dyn_resource.meta.client
+        self.max_pool_connections = max_pool_connections
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+
+        # Async client with a pooled HTTP session, bound to the event loop that first used it
+        self._async_session = aioboto3.Session()
+        self._async_stack = None
+        self._async_client = None
+        self._async_loop = None
+        self._async_lock = None
+        self._async_lock_loop = None
+
+        # Re-ingestion rewrites changed articles under the same chunk ids, so cached texts are
+        # dropped whenever the ingestion version token changes
+        self.cache = (
+            LRUCache(cache_max_bytes, sizeof=lambda text: len(text.encode("utf-8")), version=cache_version)
+            if cache_max_bytes > 0 else None
+        )
+
+    @property
+    def cache_stats(self) -> Optional[CacheStats]:
+        """Hit, miss and eviction counters of the chunk cache, if enabled."""
+        return self.cache.stats if self.cache is not None else None
+
     def get_chunk(self, chunk_id: str) -> Optional[str]:
         """
         Gets a chunk from the table.
 
         Args:
             chunk_id (str): Chunk identifier.
-            
+
         Returns:
             Optional[str]: Chunk text content or None if not found.
         """
+        if self.cache is not None:
+            cached = self.cache.get(chunk_id)
+            if cached is not None:
+                return cached
+
         try:
-            response = self.table.get_item(Key={"chunk_id": chunk_id})
+            response = self.client.get_item(TableName=self.table_name, Key={"chunk_id": chunk_id})
             chunk = response["Item"]
+            if self.cache is not None:
+                self.cache.put(chunk_id, chunk["text"])
             return chunk["text"]
         except ClientError as e:
             print(f"Chunk {chunk_id} not found ❌. Here's why: {e.response['Error']['Message']}")
-            return None
\ No newline at end of file
+            return None
+
+    def _cached_and_missing(self, chunk_ids: List[str]):
+        """Splits chunk ids into cached texts and the unique ids that still need to be fetched."""
+        unique_ids = list(dict.fromkeys(chunk_ids))
+        texts: Dict[str, str] = {}
+        if self.cache is not None and unique_ids:
+            texts.update(self.cache.get_many(unique_ids))
+            unique_ids = [chunk_id for chunk_id in unique_ids if chunk_id not in texts]
+        return texts, unique_ids
+
+    def get_chunks(self, chunk_ids: List[str]) -> List[Optional[str]]:
+        """
+        Gets several chunks from the table using concurrent BatchGetItem requests.
+
+        Args:
+            chunk_ids (List[str]): Chunk identifiers, in the order the results should be returned.
+
+        Returns:
+            List[Optional[str]]: Chunk text contents aligned with chunk_ids. Missing chunks are None.
+        """
+        texts, unique_ids = self._cached_and_missing(chunk_ids)
+
+        if unique_ids:
+            fetched = self._fetch_chunks(unique_ids)
+            if self.cache is not None:
+                self.cache.put_many(fetched)
+            texts.update(fetched)
+
+        return [texts.get(chunk_id) for chunk_id in chunk_ids]
+
+    async def aget_chunks(self, chunk_ids: List[str]) -> List[Optional[str]]:
+        """
+        Asynchronously gets several chunks, gathering all BatchGetItem pages concurrently.
+
+        Args:
+            chunk_ids (List[str]): Chunk identifiers, in the order the results should be returned.
+
+        Returns:
+            List[Optional[str]]: Chunk text contents aligned with chunk_ids. Missing chunks are None.
+        """
+        texts, unique_ids = self._cached_and_missing(chunk_ids)
+
+        if unique_ids:
+            pages = self._paginate(unique_ids)
+            fetched = {}
+            for page_texts in await asyncio.gather(*(self._abatch_get_page(page) for page in pages)):
+                fetched.update(page_texts)
+            if self.cache is not None:
+                self.cache.put_many(fetched)
+            texts.update(fetched)
+
+        return [texts.get(chunk_id) for chunk_id in chunk_ids]
+
+    async def _get_async_client(self):
+        """
+        Returns the pooled async DynamoDB client for the running event loop, creating it on first use.
+        Creation is serialized so concurrent first requests share one client, and a client left on
+        a previous event loop is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_loop is loop:
+            return self._async_client
+
+        if self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        async with self._async_lock:
+            if self._async_client is None or self._async_loop is not loop:
+                if self._async_stack is not None:
+                    await close_on_loop(self._async_stack.aclose, self._async_loop)
+                    self._async_stack = None
+                    self._async_client = None
+                stack = AsyncExitStack()
+                self._async_client = await stack.enter_async_context(
+                    self._async_session.client(
+                        "dynamodb",
+                        region_name=self.region_name,
+                        config=AioConfig(max_pool_connections=self.max_pool_connections)
+                    )
+                )
+                self._async_stack = stack
+                self._async_loop = loop
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP session of the async client."""
+        if self._async_stack is not None:
+            await self._async_stack.aclose()
+            self._async_stack = None
+            self._async_client = None
+            self._async_loop = None
+
+    def _paginate(self, unique_ids: List[str]) -> List[List[str]]:
+        """Splits ids into pages accepted by BatchGetItem."""
+        return [
+            unique_ids[i : i + self.BATCH_GET_LIMIT]
+            for i in range(0, len(unique_ids), self.BATCH_GET_LIMIT)
+        ]
+
+    def _fetch_chunks(self, unique_ids: List[str]) -> Dict[str, str]:
+        """
+        Fetches chunks from the table, splitting them into concurrent BatchGetItem pages.
+
+        Args:
+            unique_ids (List[str]): Unique chunk identifiers.
+
+        Returns:
+            Dict[str, str]: Mapping from chunk identifier to chunk text for the chunks found.
+        """
+        pages = self._paginate(unique_ids)
+
+        if len(pages) == 1:
+            return self._batch_get_page(pages[0])
+
+        texts = {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(pages))) as executor:
+            for page_texts in executor.map(self._batch_get_page, pages):
+                texts.update(page_texts)
+        return texts
+
+    def _batch_get_page(self, page: List[str]) -> Dict[str, str]:
+        """
+        Fetches a single page of up to 100 chunks, retrying unprocessed keys with exponential backoff.
+
+        Args:
+            page (List[str]): Unique chunk identifiers for this page.
+
+        Returns:
+            Dict[str, str]: Mapping from chunk identifier to chunk text for the chunks found.
+        """
+        client = self.client
+        request = {
+            self.table_name: {
+                "Keys": [{"chunk_id": chunk_id} for chunk_id in page],
+                "ProjectionExpression": "chunk_id, #txt",
+                "ExpressionAttributeNames": {"#txt": "text"},
+            }
+        }
+        texts = {}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = client.batch_get_item(RequestItems=request)
+            except ClientError as e:
+                print(f"Batch of {len(page)} chunks could not be retrieved ❌. Here's why: {e.response['Error']['Message']}")
+                return texts
+
+            for item in response.get("Responses", {}).get(self.table_name, []):
+                texts[item["chunk_id"]] = item["text"]
+
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return texts
+            if attempt < self.max_retries:
+                time.sleep(self.backoff_base * (2 ** attempt) * (1 + random.random()))
+
+        missing = sum(len(v["Keys"]) for v in request.values())
+        print(f"{missing} chunks left unprocessed after {self.max_retries} retries ❌")
+        return texts
+
+    async def _abatch_get_page(self, page: List[str]) -> Dict[str, str]:
+        """
+        Asynchronously fetches a single page of up to 100 chunks, retrying unprocessed keys with exponential backoff.
+
+        Args:
+            page (List[str]): Unique chunk identifiers for this page.
+
+        Returns:
+            Dict[str, str]: Mapping from chunk identifier to chunk text for the chunks found.
+        """
+        client = await self._get_async_client()
+        request = {
+            self.table_name: {
+                "Keys": [{"chunk_id": {"S": chunk_id}} for chunk_id in page],
+                "ProjectionExpression": "chunk_id, #txt",
+                "ExpressionAttributeNames": {"#txt": "text"},
+            }
+        }
+        texts = {}
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await client.batch_get_item(RequestItems=request)
+            except ClientError as e:
+                print(f"Batch of {len(page)} chunks could not be retrieved ❌. Here's why: {e.response['Error']['Message']}")
+                return texts
+
+            # The low-level async client returns typed attribute values
+            for item in response.get("Responses", {}).get(self.table_name, []):
+                texts[item["chunk_id"]["S"]] = item["text"]["S"]
+
+            request = response.get("UnprocessedKeys") or {}
+            if not request:
+                return texts
+            if attempt < self.max_retries:
+                await asyncio.sleep(self.backoff_base * (2 ** attempt) * (1 + random.random()))
+
+        missing = sum(len(v["Keys"]) for v in request.values())
+        print(f"{missing} chunks left unprocessed after {self.max_retries} retries ❌")
+        return texts
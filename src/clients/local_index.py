@@ -0,0 +1,220 @@
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .metadata_index import MetadataIndex
+
+@dataclass
+class LocalMatch:
+    """Search match with the same attributes as a Pinecone ScoredVector."""
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    values: Optional[List[float]] = None
+
+
+class LocalIndexClient:
+    """
+    In-process vector index with the same query contract as PineconeClient.
+
+    The index lives in a directory holding a memory-mapped matrix of L2-normalized vectors
+    (`vectors.npy`, float32, float16 or int8), the row ids (`ids.json`) and the row metadata
+    (`metadata.jsonl`). Use `LocalIndexClient.build` to write one. Filters are compiled against a
+    MetadataIndex built at load time, so similarity is only computed for candidate rows.
+
+    int8 indexes are scalar-quantized per row (`scales.npy`). They are scanned in int8 to pick
+    `rescore_factor * top_k` candidates, which are then rescored against float16 copies of the
+    vectors (`rescore.npy`) that stay on disk, so only the candidate rows are ever read.
+    """
+
+    BLOCK_ROWS = 65536  # Rows scored per block, bounding the float32 working set for float16 and int8 indexes
+
+    def __init__(self, path: str, rescore_factor: int = 4):
+        self.path = Path(path)
+        self.rescore_factor = rescore_factor
+        self.vectors = np.load(self.path / "vectors.npy", mmap_mode="r")
+        self.quantized = self.vectors.dtype == np.int8
+        if self.quantized:
+            self.scales = np.load(self.path / "scales.npy", mmap_mode="r")
+            self.rescore = np.load(self.path / "rescore.npy", mmap_mode="r")
+        self.ids = json.loads((self.path / "ids.json").read_text())
+        with open(self.path / "metadata.jsonl") as f:
+            self.metadata = [json.loads(line) for line in f]
+
+        if not (len(self.ids) == len(self.metadata) == self.vectors.shape[0]):
+            raise ValueError(f"Local index at {self.path} is inconsistent: ids, metadata and vectors differ in length")
+
+        self.metadata_index = MetadataIndex(self.metadata)
+        self._rows = None   # Row of each id, built on the first fetch
+
+    @classmethod
+    def build(
+        cls,
+        path: str,
+        ids: List[str],
+        vectors: Any,
+        metadata: List[Dict[str, Any]],
+        dtype: str = "float32"
+    ) -> "LocalIndexClient":
+        """
+        Writes a local index to disk and opens it.
+
+        Args:
+            path (str): Target directory.
+            ids (List[str]): Vector identifiers.
+            vectors (Any): Matrix-like of shape (n, dimension).
+            metadata (List[Dict[str, Any]]): Metadata aligned with ids.
+            dtype (str): Storage dtype, "float32", "float16" or "int8".
+
+        Returns:
+            LocalIndexClient: The opened index.
+        """
+        target = Path(path)
+        target.mkdir(parents=True, exist_ok=True)
+
+        matrix = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        matrix /= norms
+        if dtype == "int8":
+            scales = np.abs(matrix).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            np.save(target / "vectors.npy", np.round(matrix / scales[:, None]).astype(np.int8))
+            np.save(target / "scales.npy", scales.astype(np.float32))
+            np.save(target / "rescore.npy", matrix.astype(np.float16))
+        else:
+            np.save(target / "vectors.npy", matrix.astype(dtype))
+
+        (target / "ids.json").write_text(json.dumps(list(ids)))
+        with open(target / "metadata.jsonl", "w") as f:
+            for record in metadata:
+                f.write(json.dumps(record, default=str) + "\n")
+
+        return cls(path)
+
+    def index_version(self) -> int:
+        """
+        Returns a version marker used to invalidate caches after the index is rebuilt.
+
+        Returns:
+            int: Modification time of the vector file, in nanoseconds.
+        """
+        return (self.path / "vectors.npy").stat().st_mtime_ns
+
+    def _candidate_rows(self, filters: Dict[Any, Any]) -> Optional[np.ndarray]:
+        """Returns the rows that satisfy the filters, or None when every row is a candidate."""
+        return self.metadata_index.candidate_rows(filters)
+
+    def _score(self, query: np.ndarray, rows: Optional[np.ndarray]) -> np.ndarray:
+        """Computes cosine scores block by block over all rows or over the given rows."""
+        n = self.vectors.shape[0] if rows is None else len(rows)
+        scores = np.empty(n, dtype=np.float32)
+        for start in range(0, n, self.BLOCK_ROWS):
+            stop = min(start + self.BLOCK_ROWS, n)
+            block = self.vectors[start:stop] if rows is None else self.vectors[rows[start:stop]]
+            scores[start:stop] = block.astype(np.float32, copy=False) @ query
+            if self.quantized:
+                scores[start:stop] *= self.scales[start:stop] if rows is None else self.scales[rows[start:stop]]
+        return scores
+
+    @staticmethod
+    def _top(scores: np.ndarray, k: int) -> np.ndarray:
+        """Positions of the k highest scores, best first."""
+        best = np.argpartition(-scores, k - 1)[:k]
+        return best[np.argsort(-scores[best])]
+
+    def query(
+        self,
+        embedded_query: List[float],
+        filters: Dict[Any, Any],
+        top_k: int = 250,
+        include_values: bool = False
+    ) -> List[LocalMatch]:
+        """
+        Query the local index with the given embedded query and filters.
+
+        Args:
+            embedded_query (List[float]): The embedded query to search for.
+            filters (Dict[Any, Any]): Pinecone-style metadata filters to apply to the query.
+            top_k (int): Number of results to return.
+            include_values (bool): Whether to return the stored vectors with the matches.
+
+        Returns:
+            List[LocalMatch]: The best matches, ordered by descending cosine similarity.
+        """
+        query = np.asarray(embedded_query, dtype=np.float32)
+        if query.shape != (self.vectors.shape[1],):
+            raise ValueError(
+                f"Query has dimension {query.shape[-1]} but the local index at {self.path} holds {self.vectors.shape[1]}"
+            )
+        norm = np.linalg.norm(query)
+        if norm:
+            query = query / norm
+
+        rows = self._candidate_rows(filters)
+        if rows is not None and len(rows) == 0:
+            return []
+
+        scores = self._score(query, rows)
+        k = min(top_k, len(scores))
+        if k == 0:
+            return []
+
+        if self.quantized:
+            # The int8 scan only shortlists candidates, their order comes from the float vectors
+            candidates = self._top(scores, min(k * self.rescore_factor, len(scores)))
+            # Sorted rows turn the reads from the on-disk float vectors into forward scans
+            best_rows = np.sort(candidates if rows is None else rows[candidates])
+            exact = self.rescore[best_rows].astype(np.float32) @ query
+            order = self._top(exact, k)
+            best_rows, best_scores = best_rows[order], exact[order]
+            values = self.rescore
+        else:
+            best = self._top(scores, k)
+            best_rows = best if rows is None else rows[best]
+            best_scores = scores[best]
+            values = self.vectors
+
+        return [
+            LocalMatch(
+                id=self.ids[row],
+                score=float(score),
+                metadata=self.metadata[row],
+                values=values[row].astype(np.float32).tolist() if include_values else None
+            )
+            for row, score in zip(best_rows.tolist(), best_scores)
+        ]
+
+    def fetch_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Reads the stored vectors of the given ids, the float16 rescoring copies for int8 indexes.
+
+        Args:
+            ids (List[str]): Vector identifiers.
+
+        Returns:
+            Dict[str, List[float]]: Mapping from identifier to vector, for the ids found.
+        """
+        if self._rows is None:
+            self._rows = {vector_id: row for row, vector_id in enumerate(self.ids)}
+        values = self.rescore if self.quantized else self.vectors
+        rows = sorted(self._rows[vector_id] for vector_id in set(ids) if vector_id in self._rows)
+        return {self.ids[row]: values[row].astype(np.float32).tolist() for row in rows}
+
+    async def afetch_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Runs `fetch_vectors` in a worker thread."""
+        return await asyncio.to_thread(self.fetch_vectors, ids)
+
+    async def aquery(
+        self,
+        embedded_query: List[float],
+        filters: Dict[Any, Any],
+        top_k: int = 250,
+        include_values: bool = False
+    ) -> List[LocalMatch]:
+        """Runs `query` in a worker thread so CPU-bound scoring does not block the event loop."""
+        return await asyncio.to_thread(self.query, embedded_query, filters, top_k, include_values)
@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..utils.metadata_filter import matches_filter
+
+CATEGORICAL_FIELDS = ["country"] + [f"pillar_{i}" for i in range(1, 9)]
+SORTED_FIELDS = ["impact_score", "published_date"]
+
+class MetadataIndex:
+    """
+    Columnar metadata index used to turn Pinecone-style filters into candidate rows.
+
+    Categorical fields (country, pillar_1..8) get one packed bitmap per distinct value. Range fields
+    (impact_score, published_date) are kept as sorted columns and answered with binary search.
+    Filters compile into bitmap intersections and unions; conditions on other fields fall back to
+    evaluating the filter row by row.
+    """
+
+    def __init__(self, metadata: List[Dict[str, Any]]):
+        self.metadata = metadata
+        self.n_rows = len(metadata)
+        self._all = self._from_mask(np.ones(self.n_rows, dtype=bool))
+        self._none = self._from_mask(np.zeros(self.n_rows, dtype=bool))
+
+        self.bitmaps: Dict[str, Dict[Any, np.ndarray]] = {}
+        for field in CATEGORICAL_FIELDS:
+            rows_by_value: Dict[Any, List[int]] = {}
+            for row, record in enumerate(metadata):
+                value = record.get(field)
+                if value is not None:
+                    rows_by_value.setdefault(value, []).append(row)
+            self.bitmaps[field] = {
+                value: self._from_rows(np.asarray(rows, dtype=np.int64))
+                for value, rows in rows_by_value.items()
+            }
+
+        self.sorted_columns: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in SORTED_FIELDS:
+            rows = [row for row, record in enumerate(metadata) if record.get(field) is not None]
+            values = np.asarray([metadata[row][field] for row in rows])
+            order = np.argsort(values, kind="stable")
+            self.sorted_columns[field] = {
+                "values": values[order],
+                "rows": np.asarray(rows, dtype=np.int64)[order],
+            }
+
+    def _from_mask(self, mask: np.ndarray) -> np.ndarray:
+        return np.packbits(mask)
+
+    def _from_rows(self, rows: np.ndarray) -> np.ndarray:
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[rows] = True
+        return np.packbits(mask)
+
+    def to_rows(self, bitmap: np.ndarray) -> np.ndarray:
+        """Converts a packed bitmap into sorted row numbers."""
+        return np.flatnonzero(np.unpackbits(bitmap, count=self.n_rows))
+
+    def _not(self, bitmap: np.ndarray) -> np.ndarray:
+        return np.bitwise_and(np.bitwise_not(bitmap), self._all)
+
+    def _union(self, bitmaps: List[np.ndarray]) -> np.ndarray:
+        result = self._none
+        for bitmap in bitmaps:
+            result = np.bitwise_or(result, bitmap)
+        return result
+
+    def _intersection(self, bitmaps: List[np.ndarray]) -> np.ndarray:
+        result = self._all
+        for bitmap in bitmaps:
+            result = np.bitwise_and(result, bitmap)
+        return result
+
+    def _categorical(self, field: str, operator: str, operand: Any) -> Optional[np.ndarray]:
+        values = self.bitmaps[field]
+        if operator == "$eq":
+            return values.get(operand, self._none)
+        if operator == "$ne":
+            return self._not(values.get(operand, self._none))
+        if operator == "$in":
+            return self._union([values.get(v, self._none) for v in operand])
+        if operator == "$nin":
+            return self._not(self._union([values.get(v, self._none) for v in operand]))
+        if operator == "$exists":
+            present = self._union(list(values.values()))
+            return present if operand else self._not(present)
+        return None
+
+    def _range(self, field: str, low: Any = None, high: Any = None, low_inclusive: bool = True, high_inclusive: bool = True) -> np.ndarray:
+        column = self.sorted_columns[field]
+        start, stop = 0, len(column["values"])
+        try:
+            if low is not None:
+                start = np.searchsorted(column["values"], low, side="left" if low_inclusive else "right")
+            if high is not None:
+                stop = np.searchsorted(column["values"], high, side="right" if high_inclusive else "left")
+        except TypeError:
+            return self._none
+        return self._from_rows(column["rows"][start:max(start, stop)])
+
+    def _sorted(self, field: str, operator: str, operand: Any) -> Optional[np.ndarray]:
+        if operator == "$eq":
+            return self._range(field, operand, operand)
+        if operator == "$ne":
+            return self._not(self._range(field, operand, operand))
+        if operator == "$in":
+            return self._union([self._range(field, v, v) for v in operand])
+        if operator == "$nin":
+            return self._not(self._union([self._range(field, v, v) for v in operand]))
+        if operator == "$gt":
+            return self._range(field, low=operand, low_inclusive=False)
+        if operator == "$gte":
+            return self._range(field, low=operand)
+        if operator == "$lt":
+            return self._range(field, high=operand, high_inclusive=False)
+        if operator == "$lte":
+            return self._range(field, high=operand)
+        if operator == "$exists":
+            present = self._from_rows(self.sorted_columns[field]["rows"])
+            return present if operand else self._not(present)
+        return None
+
+    def _condition(self, field: str, condition: Any) -> np.ndarray:
+        operators = condition if isinstance(condition, dict) else {"$eq": condition}
+        bitmaps = []
+        for operator, operand in operators.items():
+            bitmap = None
+            if field in self.bitmaps:
+                bitmap = self._categorical(field, operator, operand)
+            elif field in self.sorted_columns:
+                bitmap = self._sorted(field, operator, operand)
+            if bitmap is None:
+                # Slow path for fields or operators without a precomputed structure
+                single = {field: {operator: operand}}
+                bitmap = self._from_mask(
+                    np.fromiter((matches_filter(r, single) for r in self.metadata), dtype=bool, count=self.n_rows)
+                )
+            bitmaps.append(bitmap)
+        return self._intersection(bitmaps)
+
+    def compile(self, filters: Dict[str, Any]) -> np.ndarray:
+        """
+        Compiles a Pinecone-style filter into a packed bitmap of matching rows.
+
+        Args:
+            filters (Dict[str, Any]): The metadata filter.
+
+        Returns:
+            np.ndarray: Packed bitmap with one bit per row.
+        """
+        bitmaps = []
+        for field, condition in (filters or {}).items():
+            if field == "$and":
+                bitmaps.append(self._intersection([self.compile(sub) for sub in condition]))
+            elif field == "$or":
+                bitmaps.append(self._union([self.compile(sub) for sub in condition]))
+            else:
+                bitmaps.append(self._condition(field, condition))
+        return self._intersection(bitmaps)
+
+    def candidate_rows(self, filters: Dict[str, Any]) -> Optional[np.ndarray]:
+        """
+        Returns the rows matching the filters, or None when the filters are empty.
+
+        Args:
+            filters (Dict[str, Any]): The metadata filter.
+
+        Returns:
+            Optional[np.ndarray]: Sorted row numbers of the candidates.
+        """
+        if not filters:
+            return None
+        return self.to_rows(self.compile(filters))
@@ -1,18 +1,42 @@
+import asyncio
 from typing import List, Dict, Any
 from pinecone import Pinecone
 
+from ..utils.event_loops import close_on_loop
+
 class PineconeClient:
     """Client for Pinecone vector database operations."""
+
+    FETCH_PAGE_SIZE = 100  # Ids per fetch request, keeps the request URL short
     
-    def __init__(self, api_key: str, index_name: str, namespace: str, pool_threads: int = 30):
+    def __init__(
+        self,
+        api_key: str,
+        index_name: str,
+        namespace: str,
+        pool_threads: int = 30,
+        version_namespace: str = "ingest-version"
+    ):
         self.index_name = index_name
         self.namespace = namespace
-        self.index = (
-            Pinecone(api_key=api_key, pool_threads=pool_threads)
-            .Index(index_name)
-        )
+        self.version_namespace = version_namespace    # Holds one version token per namespace, written by ingestion
+        self.pinecone = Pinecone(api_key=api_key, pool_threads=pool_threads)
+        self.index = self.pinecone.Index(index_name)
+
+        # Async index handle, bound to the event loop that first used it
+        self._host = None
+        self._async_index = None
+        self._async_loop = None
+        self._async_lock = None
+        self._async_lock_loop = None
         
-    def query(self, embedded_query: List[float], filters: Dict[Any, Any], top_k: int = 250) -> List[Any]:
+    def query(
+        self,
+        embedded_query: List[float],
+        filters: Dict[Any, Any],
+        top_k: int = 250,
+        include_values: bool = False
+    ) -> List[Any]:
         """
         Query the Pinecone index with the given embedded query and filters.
 
@@ -20,6 +44,7 @@ class PineconeClient:
             embedded_query (List[float]): The embedded query to search for.
             filters (Dict[Any, Any]): The filters to apply to the query.
             top_k (int): Number of results to return.
+            include_values (bool): Whether to return the stored vectors with the matches.
 
         Returns:
             List[Any]: The query response matches from Pinecone.
@@ -29,5 +54,117 @@ class PineconeClient:
             top_k=top_k,
             namespace=self.namespace,
             include_metadata=True,
+            include_values=include_values,
+            filter=filters
+        ).matches
+
+    async def _get_async_index(self):
+        """
+        Returns the pooled asyncio index for the running event loop, creating it on first use.
+        Creation is serialized so concurrent first queries share one index, and an index left on
+        a previous event loop is closed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_index is not None and self._async_loop is loop:
+            return self._async_index
+
+        if self._async_lock_loop is not loop:
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        async with self._async_lock:
+            if self._async_index is None or self._async_loop is not loop:
+                if self._async_index is not None:
+                    await close_on_loop(self._async_index.close, self._async_loop)
+                    self._async_index = None
+                if self._host is None:
+                    description = await asyncio.to_thread(self.pinecone.describe_index, self.index_name)
+                    self._host = description.host
+                self._async_index = self.pinecone.IndexAsyncio(host=self._host)
+                self._async_loop = loop
+        return self._async_index
+
+    async def aquery(
+        self,
+        embedded_query: List[float],
+        filters: Dict[Any, Any],
+        top_k: int = 250,
+        include_values: bool = False
+    ) -> List[Any]:
+        """
+        Asynchronously query the Pinecone index with the given embedded query and filters.
+
+        Args:
+            embedded_query (List[float]): The embedded query to search for.
+            filters (Dict[Any, Any]): The filters to apply to the query.
+            top_k (int): Number of results to return.
+            include_values (bool): Whether to return the stored vectors with the matches.
+
+        Returns:
+            List[Any]: The query response matches from Pinecone.
+        """
+        index = await self._get_async_index()
+        response = await index.query(
+            vector=embedded_query,
+            top_k=top_k,
+            namespace=self.namespace,
+            include_metadata=True,
+            include_values=include_values,
             filter=filters
-        ).matches
\ No newline at end of file
+        )
+        return response.matches
+
+    def _fetch_pages(self, ids: List[str]) -> List[List[str]]:
+        return [ids[i : i + self.FETCH_PAGE_SIZE] for i in range(0, len(ids), self.FETCH_PAGE_SIZE)]
+
+    def fetch_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """
+        Fetch the stored vectors of the given ids.
+
+        Args:
+            ids (List[str]): Vector identifiers.
+
+        Returns:
+            Dict[str, List[float]]: Mapping from identifier to vector, for the ids found.
+        """
+        vectors = {}
+        for page in self._fetch_pages(ids):
+            response = self.index.fetch(ids=page, namespace=self.namespace)
+            vectors.update({vector_id: vector.values for vector_id, vector in response.vectors.items()})
+        return vectors
+
+    async def afetch_vectors(self, ids: List[str]) -> Dict[str, List[float]]:
+        """Async variant of `fetch_vectors`, with all pages fetched concurrently."""
+        index = await self._get_async_index()
+        responses = await asyncio.gather(
+            *(index.fetch(ids=page, namespace=self.namespace) for page in self._fetch_pages(ids))
+        )
+        return {
+            vector_id: vector.values
+            for response in responses
+            for vector_id, vector in response.vectors.items()
+        }
+
+    async def aclose(self) -> None:
+        """Closes the pooled HTTP session of the asyncio index."""
+        if self._async_index is not None:
+            await self._async_index.close()
+            self._async_index = None
+            self._async_loop = None
+
+    def index_version(self) -> Any:
+        """
+        Returns the version token of the namespace, used to invalidate caches after ingestion.
+        Ingestion writes a new token after every run that upserted or deleted vectors, so in-place
+        re-upserts are detected too. Namespaces ingested before tokens existed fall back to the
+        vector count.
+
+        Returns:
+            Any: The version token, or the number of vectors stored in the namespace.
+        """
+        token = self.index.fetch(ids=[self.namespace], namespace=self.version_namespace).vectors.get(self.namespace)
+        if token is not None and token.metadata and "version" in token.metadata:
+            return token.metadata["version"]
+
+        stats = self.index.describe_index_stats()
+        namespace = stats.namespaces.get(self.namespace)
+        return namespace.vector_count if namespace else 0
@@ -1,16 +1,56 @@
-from typing import List
+from typing import List, Optional
 import voyageai
 
+from ..cache import EmbeddingCache
+
 class VoyageClient:
     """Client for VoyageAI embeddings."""
     
-    def __init__(self, api_key: str, model: str):
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        cache: Optional[EmbeddingCache] = None,
+        output_dimension: Optional[int] = None
+    ):
         self.engine = voyageai.Client(api_key)
+        self.async_engine = voyageai.AsyncClient(api_key)
         self.model = model
+        self.cache = cache
+        self.output_dimension = output_dimension
+        # Cached vectors of another dimension must never be served
+        self.cache_model = model if output_dimension is None else f"{model}@{output_dimension}"
     
     def embed_text(self, text: str) -> List[float]:
         """
         Embeds the given text using the VoyageAI engine.
+        Embeddings are served from the cache when the same normalized text was embedded before.
+
+        Args:
+            text (str): The text to embed.
+
+        Returns:
+            List[float]: The embedded text as a list of floats.
+        """
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_model, text)
+            if cached is not None:
+                return cached
+
+        embedding = self.engine.embed(
+            text,
+            model=self.model,
+            input_type="document",
+            output_dimension=self.output_dimension
+        ).embeddings[0]
+
+        if self.cache is not None:
+            self.cache.put(self.cache_model, text, embedding)
+        return embedding
+
+    async def aembed_text(self, text: str) -> List[float]:
+        """
+        Asynchronously embeds the given text using the VoyageAI engine.
 
         Args:
             text (str): The text to embed.
@@ -18,8 +58,19 @@ class VoyageClient:
         Returns:
             List[float]: The embedded text as a list of floats.
         """
-        return self.engine.embed(
+        if self.cache is not None:
+            cached = self.cache.get(self.cache_model, text)
+            if cached is not None:
+                return cached
+
+        response = await self.async_engine.embed(
             text,
             model=self.model,
-            input_type="document"
-        ).embeddings[0]
\ No newline at end of file
+            input_type="document",
+            output_dimension=self.output_dimension
+        )
+        embedding = response.embeddings[0]
+
+        if self.cache is not None:
+            self.cache.put(self.cache_model, text, embedding)
+        return embedding
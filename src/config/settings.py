@@ -1,21 +1,59 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 load_dotenv()
 
+def _for_dimension(path: str, dimension: int) -> str:
+    """Per-dimension variant of a path; the default 1024 dimensions keep the unsuffixed path."""
+    if dimension == 1024:
+        return path
+    path = Path(path)
+    return str(path.with_name(f"{path.stem}-{dimension}{path.suffix}"))
+
 class Settings:
     # Voyage Configuration
     VOYAGE_API_KEY = os.getenv("VOYAGE_API_KEY")
     VOYAGE_MODEL = "voyage-3.5"
+    EMBEDDING_DIMENSION = int(os.getenv("EMBEDDING_DIMENSION", 1024))  # 256, 512, 1024 or 2048 for voyage-3.5
+    EMBEDDING_CACHE_MAX_BYTES = 16 * 1024 * 1024
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", ".cache/query_embeddings.sqlite")
     
     # Pinecone Configuration
     PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-    PINECONE_INDEX = "eurovoices-news-articles-vdb"
+    PINECONE_INDEX = (  # Each dimension needs its own index
+        "eurovoices-news-articles-vdb" if EMBEDDING_DIMENSION == 1024
+        else f"eurovoices-news-articles-vdb-{EMBEDDING_DIMENSION}"
+    )
     PINECONE_NAMESPACE = "ns-1"
+    PINECONE_VERSION_NAMESPACE = "ingest-version"   # Version token of each namespace, bumped by ingestion
+    INDEX_VERSION_CHECK = 30    # Seconds between version token fetches, shared by the retrieval, chunk and rerank caches
+
+    # Vector Backend Configuration ("pinecone" or "local")
+    VECTOR_BACKEND = os.getenv("VECTOR_BACKEND", "pinecone")
+    LOCAL_INDEX_PATH = os.getenv("LOCAL_INDEX_PATH", ".cache/local_index")
+    LOCAL_INDEX_DTYPE = os.getenv("LOCAL_INDEX_DTYPE", "float16")  # "float32", "float16" or "int8" (rescored in float16)
+    LOCAL_INDEX_RESCORE_FACTOR = 4  # int8 candidates rescored per requested match
+    EMBEDDING_STORE_PATH = _for_dimension(  # Document vectors kept by ingestion, one store per dimension
+        os.getenv("EMBEDDING_STORE_PATH", ".cache/embedding_store"), EMBEDDING_DIMENSION
+    )
+    EMBEDDING_STORE_DTYPE = "float16"   # "float16" or "int8"
+    INGEST_MANIFEST_PATH = _for_dimension(  # Chunks committed to PINECONE_INDEX, so one manifest per dimension
+        os.getenv("INGEST_MANIFEST_PATH", ".cache/ingest_manifest.sqlite"), EMBEDDING_DIMENSION
+    )
+
+    # Hybrid Search Configuration
+    HYBRID_SEARCH = os.getenv("HYBRID_SEARCH", "false").lower() == "true"
+    LEXICAL_INDEX_PATH = os.getenv("LEXICAL_INDEX_PATH", ".cache/bm25_index")
+    HYBRID_TOP_K = 60   # Fused candidates per query, replaces TOP_K when hybrid search is enabled
+    RRF_K = 60
 
     # DynamoDB Configuration
     DYNAMODB_TABLE = "eurovoices-chunked-news"
     DYNAMODB_REGION = "us-east-1"
+    DYNAMODB_MAX_WORKERS = 8
+    DYNAMODB_MAX_POOL_CONNECTIONS = 50
+    CHUNK_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
     # OpenAI Configuration
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -23,7 +61,43 @@ class Settings:
     
     # Vector Database Search Configuration
     TOP_K = 250
+    RERANKER = "lexical"    # "lexical", "embedding" or None to disable the second stage
+    RERANK_TOP_N = 40
+    RERANK_CACHE_MAX_BYTES = 8 * 1024 * 1024
+    RETRIEVAL_MAX_CONCURRENCY = 8   # Concurrent embeddings and sub-queries per retrieve step
     POOL_THREADS = 30
     TEMPERATURE = 0
+    MAX_HISTORY_TOKENS = 500000
+    HISTORY_COMPACTION_THRESHOLD = 8000
+    HISTORY_KEEP_TOKENS = 3000
+    FAST_ROUTER = True      # Deterministic pre-router that skips the routing LLM call for obvious questions
+
+    # Checkpointer Configuration
+    CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", ".cache/checkpoints.sqlite")
+    CHECKPOINT_MAX_PER_THREAD = 5
+    CHECKPOINT_THREAD_TTL = 24 * 3600
+    CHECKPOINT_MAX_DB_BYTES = 512 * 1024 * 1024
+    CHECKPOINT_CACHE_KIB = 16 * 1024
+
+    # Context Assembly Configuration
+    CONTEXT_TOKEN_BUDGET = 16000
+    CONTEXT_MMR_LAMBDA = 0.7
+    CONTEXT_ENCODING = "o200k_base"
+
+    # Retrieval Store Configuration
+    RETRIEVAL_STORE_MAX_BYTES = 32 * 1024 * 1024
+    RETRIEVAL_STORE_PATH = os.getenv("RETRIEVAL_STORE_PATH", ".cache/retrievals.sqlite")
+    RETRIEVAL_STORE_TTL = 24 * 3600
+
+    # Retrieval Cache Configuration
+    RETRIEVAL_CACHE_THRESHOLD = 0.97
+    RETRIEVAL_CACHE_TTL = 3600
+    RETRIEVAL_CACHE_MAX_ENTRIES = 1024
+
+    # Speculative Retrieval Configuration
+    SPECULATIVE_RETRIEVAL = os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() == "true"
+    SPECULATIVE_SIMILARITY = 0.85   # Min cosine between the raw question and the tool query
+    SPECULATIVE_WAIT_TIMEOUT = 1.0  # Max seconds the tool waits for a prefetch before searching itself
+    SPECULATIVE_MAX_WORKERS = 4
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,159 @@
+import asyncio
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import CheckpointTuple
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+class BoundedSqliteSaver(SqliteSaver):
+    """
+    SQLite checkpointer with a bounded footprint.
+
+    - Only the latest `max_checkpoints_per_thread` checkpoints (and their pending writes) are kept
+      per thread and namespace.
+    - Threads idle for longer than `thread_ttl_seconds` are deleted.
+    - When the database grows past `max_db_bytes`, the least recently active threads are deleted
+      until it fits, and freed pages are returned to the file system.
+    - The SQLite page cache is capped at `cache_size_kib`.
+
+    Async methods delegate to the synchronous implementation in a worker thread, so the same saver
+    works for both `stream` and `astream`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_checkpoints_per_thread: int = 5,
+        thread_ttl_seconds: float = 24 * 3600,
+        max_db_bytes: int = 512 * 1024 * 1024,
+        cache_size_kib: int = 16 * 1024,
+        maintenance_interval: float = 300
+    ):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute(f"PRAGMA cache_size = -{int(cache_size_kib)}")
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            # Existing databases only pick up incremental auto-vacuum after a full VACUUM
+            conn.execute("VACUUM")
+        super().__init__(conn)
+
+        self.max_checkpoints_per_thread = max_checkpoints_per_thread
+        self.thread_ttl_seconds = thread_ttl_seconds
+        self.max_db_bytes = max_db_bytes
+        self.maintenance_interval = maintenance_interval
+        self._last_maintenance = 0.0
+
+    def setup(self) -> None:
+        # Called by SqliteSaver.cursor() while holding self.lock
+        if self.is_setup:
+            return
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS thread_activity (thread_id TEXT PRIMARY KEY, last_seen REAL NOT NULL)"
+        )
+        super().setup()
+
+    def put(self, config: RunnableConfig, checkpoint, metadata, new_versions) -> RunnableConfig:
+        next_config = super().put(config, checkpoint, metadata, new_versions)
+        configurable = next_config["configurable"]
+        self._prune_thread(configurable["thread_id"], configurable.get("checkpoint_ns", ""))
+
+        if time.monotonic() - self._last_maintenance >= self.maintenance_interval:
+            self.maintain()
+        return next_config
+
+    def _prune_thread(self, thread_id: str, checkpoint_ns: str) -> None:
+        """Keeps only the latest checkpoints of a thread namespace and records the thread's activity."""
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO thread_activity (thread_id, last_seen) VALUES (?, ?) "
+                "ON CONFLICT(thread_id) DO UPDATE SET last_seen = excluded.last_seen",
+                (thread_id, time.time())
+            )
+            # Checkpoint ids are time-ordered (uuid6), so the newest sort last
+            keep = (
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? "
+                "ORDER BY checkpoint_id DESC LIMIT ?"
+            )
+            params = (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.max_checkpoints_per_thread)
+            self.conn.execute(
+                f"DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ({keep})",
+                params
+            )
+            self.conn.execute(
+                f"DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN ({keep})",
+                params
+            )
+            self.conn.commit()
+
+    def _delete_threads(self, thread_ids) -> None:
+        for table in ("checkpoints", "writes", "thread_activity"):
+            self.conn.executemany(f"DELETE FROM {table} WHERE thread_id = ?", [(t,) for t in thread_ids])
+
+    def _db_bytes(self) -> int:
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        freelist = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        return (page_count - freelist) * page_size
+
+    def maintain(self) -> None:
+        """Expires idle threads, enforces the size cap and compacts the database file."""
+        self._last_maintenance = time.monotonic()
+
+        with self.lock:
+            self.setup()
+            cutoff = time.time() - self.thread_ttl_seconds
+            expired = [row[0] for row in self.conn.execute(
+                "SELECT thread_id FROM thread_activity WHERE last_seen < ?", (cutoff,)
+            )]
+            self._delete_threads(expired)
+            self.conn.commit()
+
+            while self._db_bytes() > self.max_db_bytes:
+                oldest = [row[0] for row in self.conn.execute(
+                    "SELECT thread_id FROM thread_activity ORDER BY last_seen ASC LIMIT 10"
+                )]
+                if not oldest:
+                    break
+                self._delete_threads(oldest)
+                self.conn.commit()
+
+            self.conn.execute("PRAGMA incremental_vacuum")
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.conn.commit()
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self.lock:
+            self.setup()
+            self._delete_threads([thread_id])
+            self.conn.commit()
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: Optional[RunnableConfig],
+        *,
+        filter: Optional[dict[str, Any]] = None,
+        before: Optional[RunnableConfig] = None,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[CheckpointTuple]:
+        checkpoints = await asyncio.to_thread(
+            lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+        )
+        for checkpoint in checkpoints:
+            yield checkpoint
+
+    async def aput(self, config: RunnableConfig, checkpoint, metadata, new_versions) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config: RunnableConfig, writes, task_id: str, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.to_thread(self.delete_thread, thread_id)
@@ -0,0 +1,26 @@
+from typing import Annotated, Dict, Optional
+
+from langgraph.graph import MessagesState
+
+def merge_token_counts(left: Dict[str, int], right: Dict[str, Optional[int]]) -> Dict[str, int]:
+    """
+    Merges per-message token counts. A None value drops the count of a removed message; nodes
+    send one for every cached id missing from the messages (see `MessageTrimmer.count_updates`),
+    so counts never outlive their messages.
+    """
+    merged = dict(left or {})
+    for message_id, count in (right or {}).items():
+        if count is None:
+            merged.pop(message_id, None)
+        else:
+            merged[message_id] = count
+    return merged
+
+
+class AgentState(MessagesState):
+    """
+    Conversation state with the token count of every message, computed once per message,
+    and the running summary of turns folded out of the history.
+    """
+    token_counts: Annotated[Dict[str, int], merge_token_counts]
+    summary: str
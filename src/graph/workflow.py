@@ -1,17 +1,22 @@
 from langgraph.graph import StateGraph, START, END
-from langgraph.graph import MessagesState
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 from langchain.chat_models import init_chat_model
-from langgraph.checkpoint.memory import MemorySaver
-from langchain_core.messages import trim_messages
 
-from ..clients import VoyageClient, PineconeClient, DynamoDBClient
+from ..clients import VoyageClient, PineconeClient, DynamoDBClient, LocalIndexClient, BM25Index
+from ..cache import EmbeddingCache, IndexVersion, RetrievalCache
 from ..tools.news_search import NewsSearchTool
+from ..retrieval import ContextAssembler, RerankStage, RetrievalStore, SpeculativeRetriever
 from ..nodes.generator import create_generate_query_or_respond_node
+from ..nodes.router import create_fast_route_node
+from ..nodes.retriever import create_retrieve_node
 from ..nodes.rewriter import create_rewrite_question_node
 from ..nodes.answerer import create_generate_answer_node
+from ..nodes.summarizer import create_compact_history_node
 from ..prompts.templates import RETRIEVER_DESCRIPTION
 from ..config.settings import settings
+from ..utils.message_trimmer import MessageTrimmer
+from .state import AgentState
+from .checkpointer import BoundedSqliteSaver
 
 def create_workflow():
     """Create and return the complete workflow graph."""
@@ -19,25 +24,99 @@ def create_workflow():
     # Initialize clients
     vc = VoyageClient(
         api_key=settings.VOYAGE_API_KEY,
-        model=settings.VOYAGE_MODEL
+        model=settings.VOYAGE_MODEL,
+        cache=EmbeddingCache(
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            path=settings.EMBEDDING_CACHE_PATH
+        ),
+        output_dimension=settings.EMBEDDING_DIMENSION
     )
-    pc = PineconeClient(
-        api_key=settings.PINECONE_API_KEY,
-        index_name=settings.PINECONE_INDEX,
-        namespace=settings.PINECONE_NAMESPACE,
-        pool_threads=settings.POOL_THREADS
+    if settings.VECTOR_BACKEND == "local":
+        pc = LocalIndexClient(path=settings.LOCAL_INDEX_PATH, rescore_factor=settings.LOCAL_INDEX_RESCORE_FACTOR)
+    else:
+        pc = PineconeClient(
+            api_key=settings.PINECONE_API_KEY,
+            index_name=settings.PINECONE_INDEX,
+            namespace=settings.PINECONE_NAMESPACE,
+            pool_threads=settings.POOL_THREADS,
+            version_namespace=settings.PINECONE_VERSION_NAMESPACE
+        )
+    
+    # Optional BM25 index fused with the dense results, which allows a much smaller top_k
+    lexical = BM25Index(path=settings.LEXICAL_INDEX_PATH) if settings.HYBRID_SEARCH else None
+    top_k = settings.HYBRID_TOP_K if lexical is not None else settings.TOP_K
+
+    # Version token checked by every cache of ingested data, fetched once per interval for all of them
+    index_version = IndexVersion(
+        (lambda: (pc.index_version(), lexical.index_version())) if lexical is not None else pc.index_version,
+        check_interval=settings.INDEX_VERSION_CHECK
     )
     ddbc = DynamoDBClient(
         table_name=settings.DYNAMODB_TABLE,
-        region_name=settings.DYNAMODB_REGION
+        region_name=settings.DYNAMODB_REGION,
+        max_workers=settings.DYNAMODB_MAX_WORKERS,
+        cache_max_bytes=settings.CHUNK_CACHE_MAX_BYTES,
+        max_pool_connections=settings.DYNAMODB_MAX_POOL_CONNECTIONS,
+        cache_version=index_version
     )
     
+    # Retrieved context lives outside graph state, messages only carry references
+    store = RetrievalStore(
+        max_bytes=settings.RETRIEVAL_STORE_MAX_BYTES,
+        path=settings.RETRIEVAL_STORE_PATH,
+        ttl_seconds=settings.RETRIEVAL_STORE_TTL,
+        fallback=ddbc.get_chunks
+    )
+
+    # Optional prefetch of candidates while the routing call runs
+    speculator = (
+        SpeculativeRetriever(
+            vc=vc,
+            pc=pc,
+            ddbc=ddbc,
+            top_k=top_k,
+            similarity_threshold=settings.SPECULATIVE_SIMILARITY,
+            wait_timeout=settings.SPECULATIVE_WAIT_TIMEOUT,
+            max_workers=settings.SPECULATIVE_MAX_WORKERS,
+            lexical=lexical,
+            fusion_k=settings.RRF_K
+        )
+        if settings.SPECULATIVE_RETRIEVAL else None
+    )
+
     # Initialize custom tools
     retriever = NewsSearchTool(
         vc=vc,
         pc=pc,
         ddbc=ddbc,
-        description=RETRIEVER_DESCRIPTION
+        description=RETRIEVER_DESCRIPTION,
+        cache=RetrievalCache(
+            similarity_threshold=settings.RETRIEVAL_CACHE_THRESHOLD,
+            ttl_seconds=settings.RETRIEVAL_CACHE_TTL,
+            max_entries=settings.RETRIEVAL_CACHE_MAX_ENTRIES,
+            index_version=index_version,
+            version_check_interval=0    # Throttled by index_version itself
+        ),
+        assembler=ContextAssembler(
+            token_budget=settings.CONTEXT_TOKEN_BUDGET,
+            mmr_lambda=settings.CONTEXT_MMR_LAMBDA,
+            encoding_name=settings.CONTEXT_ENCODING
+        ),
+        reranker=(
+            RerankStage.from_name(
+                settings.RERANKER,
+                top_n=settings.RERANK_TOP_N,
+                cache_max_bytes=settings.RERANK_CACHE_MAX_BYTES,
+                version=index_version
+            )
+            if settings.RERANKER else None
+        ),
+        top_k=top_k,
+        store=store,
+        speculator=speculator,
+        max_concurrency=settings.RETRIEVAL_MAX_CONCURRENCY,
+        lexical=lexical,
+        fusion_k=settings.RRF_K
     )
     
     # Initialize LLM
@@ -46,19 +125,45 @@ def create_workflow():
         temperature=settings.TEMPERATURE
     )
     
+    # Built once per model, token counts are cached in graph state
+    trimmer = MessageTrimmer(response_model, max_tokens=settings.MAX_HISTORY_TOKENS)
+
     # Create nodes
-    generate_query_or_respond = create_generate_query_or_respond_node(response_model, retriever)
-    rewrite_question = create_rewrite_question_node(response_model)
-    generate_answer = create_generate_answer_node(response_model)
+    fast_route = create_fast_route_node(retriever, trimmer)
+    retrieve = create_retrieve_node(retriever)
+    generate_query_or_respond = create_generate_query_or_respond_node(response_model, retriever, trimmer, speculator)
+    rewrite_question = create_rewrite_question_node(response_model, trimmer)
+    generate_answer = create_generate_answer_node(response_model, trimmer, store)
+    compact_history = create_compact_history_node(
+        response_model,
+        trimmer,
+        threshold_tokens=settings.HISTORY_COMPACTION_THRESHOLD,
+        keep_tokens=settings.HISTORY_KEEP_TOKENS
+    )
     
     # Build workflow
-    workflow = StateGraph(MessagesState)
+    workflow = StateGraph(AgentState)
     
+    if settings.FAST_ROUTER:
+        workflow.add_node("fast_route", fast_route)
     workflow.add_node("generate_query_or_respond", generate_query_or_respond)
-    workflow.add_node("retrieve", ToolNode([retriever]))
+    workflow.add_node("retrieve", retrieve)
     workflow.add_node("generate_answer", generate_answer)
+    workflow.add_node("compact_history", compact_history)
     
-    workflow.add_edge(START, "generate_query_or_respond")
+    if settings.FAST_ROUTER:
+        # Obvious retrieval questions get their tool call without the routing LLM call
+        workflow.add_edge(START, "fast_route")
+        workflow.add_conditional_edges(
+            "fast_route",
+            tools_condition,
+            {
+                "tools": "retrieve",
+                END: "generate_query_or_respond",
+            },
+        )
+    else:
+        workflow.add_edge(START, "generate_query_or_respond")
     workflow.add_conditional_edges(
         "generate_query_or_respond",
         tools_condition,
@@ -69,9 +174,18 @@ def create_workflow():
     )
     workflow.add_edge("retrieve", "generate_answer")
     workflow.add_edge("generate_answer", END)
+    # History compaction is off the answer path, ChatStreamer runs it with
+    # Command(goto="compact_history") once the answer has been streamed
+    workflow.add_edge("compact_history", END)
 
-    # Memory Checkpointer
-    memory = MemorySaver()
+    # Bounded, persistent checkpointer
+    memory = BoundedSqliteSaver(
+        path=settings.CHECKPOINT_DB_PATH,
+        max_checkpoints_per_thread=settings.CHECKPOINT_MAX_PER_THREAD,
+        thread_ttl_seconds=settings.CHECKPOINT_THREAD_TTL,
+        max_db_bytes=settings.CHECKPOINT_MAX_DB_BYTES,
+        cache_size_kib=settings.CHECKPOINT_CACHE_KIB
+    )
     
     return workflow.compile(
         checkpointer = memory
@@ -1,37 +1,64 @@
-from langgraph.graph import MessagesState
 from langchain.chat_models import ChatOpenAI
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
 
+from ..graph.state import AgentState
 from ..prompts.templates import GENERATE_PROMPT
-from ..utils.message_trimmer import create_message_trimmer
+from ..utils.message_trimmer import MessageTrimmer
+from ..retrieval.store import RetrievalStore
 
-def create_generate_answer_node(model: ChatOpenAI):
+def create_generate_answer_node(model: ChatOpenAI, trimmer: MessageTrimmer, store: RetrievalStore = None):
     """Factory function to create the generate_answer node."""
-    
-    def generate_answer(state: MessagesState):
-        """Generate an answer using retrieved context."""
-        trimmer = create_message_trimmer(model)
-        trimmed_messages = trimmer.invoke(state["messages"])
+
+    def _build_prompt(state: AgentState):
+        """Build the answer prompt from the latest question and retrieved context."""
+        new_counts = trimmer.count_updates(state["messages"], state.get("token_counts", {}))
+        trimmed_messages = trimmer.trim(state["messages"], {**state.get("token_counts", {}), **new_counts})
 
         # Filter messages by type
         human_messages = [
             msg for msg in trimmed_messages 
             if hasattr(msg, "type") and msg.type == "human"
         ]
-        tool_messages = [
-            msg for msg in trimmed_messages 
-            if hasattr(msg, "type") and msg.type == "tool"
-        ]
+        # Tool messages answering the latest tool-calling turn (one per search)
+        tool_messages = []
+        for msg in reversed(trimmed_messages):
+            if not (hasattr(msg, "type") and msg.type == "tool"):
+                break
+            tool_messages.insert(0, msg)
         
-        # Get the most recent of each type
+        # Get the most recent question
         question = human_messages[-1].content if human_messages else None
-        context = tool_messages[-1].content if tool_messages else None
+
+        # Tool messages only carry a reference, rehydrate the context right before prompting
+        contexts = [
+            store.resolve(msg.content) if store is not None else msg.content
+            for msg in tool_messages
+        ]
+        context = "\n\n".join(c for c in contexts if c)
         
         if not question or not context:
-            return {"messages": [AIMessage(content="Missing question or context for answer generation.")]}
+            return None, new_counts
         
-        prompt = GENERATE_PROMPT.format(question=question, context=context)
+        return GENERATE_PROMPT.format(question=question, context=context), new_counts
+
+    def _update(response: AIMessage, new_counts: dict):
+        return {"messages": [response], "token_counts": {**new_counts, **trimmer.count_response(response)}}
+    
+    def generate_answer(state: AgentState):
+        """Generate an answer using retrieved context."""
+        prompt, new_counts = _build_prompt(state)
+        if prompt is None:
+            return _update(AIMessage(content="Missing question or context for answer generation."), new_counts)
         response = model.invoke([HumanMessage(content=prompt)])
-        return {"messages": [response]}
+        return _update(response, new_counts)
+
+    async def agenerate_answer(state: AgentState):
+        """Asynchronously generate an answer using retrieved context."""
+        prompt, new_counts = _build_prompt(state)
+        if prompt is None:
+            return _update(AIMessage(content="Missing question or context for answer generation."), new_counts)
+        response = await model.ainvoke([HumanMessage(content=prompt)])
+        return _update(response, new_counts)
     
-    return generate_answer
\ No newline at end of file
+    return RunnableLambda(generate_answer, afunc=agenerate_answer, name="generate_answer")
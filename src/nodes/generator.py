@@ -1,20 +1,65 @@
-from langgraph.graph import MessagesState
 from langchain.chat_models import ChatOpenAI
-from ..prompts.templates import SYSTEM_PROMPT
-from ..utils.message_trimmer import create_message_trimmer
+from langchain_core.messages import HumanMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from ..graph.state import AgentState
+from ..prompts.templates import SYSTEM_PROMPT, SUMMARY_SYSTEM_PROMPT
+from ..utils.message_trimmer import MessageTrimmer
+from .router import predict_filters
 
-def create_generate_query_or_respond_node(model: ChatOpenAI, retriever):
+def create_generate_query_or_respond_node(model: ChatOpenAI, retriever, trimmer: MessageTrimmer, speculator=None):
     """Factory function to create the generate_query_or_respond node."""
 
-    def generate_query_or_respond(state: MessagesState):
-        """Call the model to generate a response based on the current state."""
-        trimmer = create_message_trimmer(model)
-        trimmed_messages = trimmer.invoke(state["messages"])
+    def _speculate(state: AgentState, config: RunnableConfig):
+        # Prefetch candidates for a fresh user question while the routing call runs
+        thread_id = (config or {}).get("configurable", {}).get("thread_id")
+        last = state["messages"][-1] if state["messages"] else None
+        if speculator is None or thread_id is None or not isinstance(last, HumanMessage):
+            return None
+        if not isinstance(last.content, str):
+            return None
+        # Speculate with the filters the tool call will most likely carry, prefetched results are
+        # only reused when the actual filters are the same
+        filters = predict_filters(last.content)
+        if filters is None:
+            return None
+        speculator.start(thread_id, last.content, filters)
+        return thread_id
+
+    def _settle(thread_id, response):
+        # The prefetch is only consumed by the tool, drop it if the model answered directly
+        if thread_id is not None and not response.tool_calls:
+            speculator.discard(thread_id)
+
+    def _prepare_messages(state: AgentState):
+        new_counts = trimmer.count_updates(state["messages"], state.get("token_counts", {}))
+        trimmed_messages = trimmer.trim(state["messages"], {**state.get("token_counts", {}), **new_counts})
+        system_prompt = SYSTEM_PROMPT
+        if state.get("summary"):
+            system_prompt += SUMMARY_SYSTEM_PROMPT.format(summary=state["summary"])
         messages = [
-            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "system", "content": system_prompt},
             *trimmed_messages
         ]
+        return messages, new_counts
+
+    def generate_query_or_respond(state: AgentState, config: RunnableConfig):
+        """Call the model to generate a response based on the current state."""
+        thread_id = _speculate(state, config)
+        messages, new_counts = _prepare_messages(state)
         response = model.bind_tools([retriever]).invoke(messages)
-        return {"messages": [response]}
+        _settle(thread_id, response)
+        return {"messages": [response], "token_counts": {**new_counts, **trimmer.count_response(response)}}
+
+    async def agenerate_query_or_respond(state: AgentState, config: RunnableConfig):
+        """Asynchronously call the model to generate a response based on the current state."""
+        thread_id = _speculate(state, config)
+        messages, new_counts = _prepare_messages(state)
+        response = await model.bind_tools([retriever]).ainvoke(messages)
+        _settle(thread_id, response)
+        return {"messages": [response], "token_counts": {**new_counts, **trimmer.count_response(response)}}
     
-    return generate_query_or_respond
\ No newline at end of file
+    return RunnableLambda(
+        generate_query_or_respond,
+        afunc=agenerate_query_or_respond,
+        name="generate_query_or_respond"
+    )
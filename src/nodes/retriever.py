@@ -0,0 +1,44 @@
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from pydantic import ValidationError
+
+from ..graph.state import AgentState
+from ..tools.news_search import NewsSearchInput, NewsSearchTool
+
+def create_retrieve_node(retriever: NewsSearchTool):
+    """Factory function to create the retrieve node."""
+
+    def _tool_message(tool_call, content: str, status: str = "success") -> ToolMessage:
+        return ToolMessage(content=content, name=tool_call["name"], tool_call_id=tool_call["id"], status=status)
+
+    def _plan(state: AgentState):
+        """Validate the tool calls of the latest AI message, answering invalid ones with an error right away."""
+        message = state["messages"][-1]
+        calls, errors = [], []
+        for tool_call in message.tool_calls if isinstance(message, AIMessage) else []:
+            if tool_call["name"] != retriever.name:
+                content = f"Error: {tool_call['name']} is not a valid tool, try {retriever.name}."
+                errors.append(_tool_message(tool_call, content, "error"))
+                continue
+            try:
+                args = NewsSearchInput.model_validate(tool_call["args"]).model_dump(exclude_none=True)
+            except ValidationError as e:
+                content = f"Error: invalid arguments for {retriever.name}: {e}"
+                errors.append(_tool_message(tool_call, content, "error"))
+                continue
+            calls.append((tool_call, args))
+        return calls, errors
+
+    def retrieve(state: AgentState, config: RunnableConfig):
+        """Run every search requested by the latest AI message concurrently."""
+        calls, errors = _plan(state)
+        contents = retriever.search_many([args for _, args in calls], config) if calls else []
+        return {"messages": errors + [_tool_message(call, content) for (call, _), content in zip(calls, contents)]}
+
+    async def aretrieve(state: AgentState, config: RunnableConfig):
+        """Asynchronously run every search requested by the latest AI message concurrently."""
+        calls, errors = _plan(state)
+        contents = await retriever.asearch_many([args for _, args in calls], config) if calls else []
+        return {"messages": errors + [_tool_message(call, content) for (call, _), content in zip(calls, contents)]}
+
+    return RunnableLambda(retrieve, afunc=aretrieve, name="retrieve")
@@ -1,16 +1,14 @@
-from langgraph.graph import MessagesState
 from langchain.chat_models import ChatOpenAI
+from ..graph.state import AgentState
 from ..prompts.templates import REWRITE_PROMPT
-from ..utils.message_trimmer import create_message_trimmer
+from ..utils.message_trimmer import MessageTrimmer
 
-def create_rewrite_question_node(model: ChatOpenAI):
+def create_rewrite_question_node(model: ChatOpenAI, trimmer: MessageTrimmer):
     """Factory function to create the rewrite_question node."""
-
-    trimmer = create_message_trimmer(model)
     
-    def rewrite_question(state: MessagesState):
+    def rewrite_question(state: AgentState):
         """Rewrite the original user question."""
-        trimmed_messages = trimmer.invoke(state["messages"])
+        trimmed_messages = trimmer.trim(state["messages"], state.get("token_counts", {}))
         question = trimmed_messages[0].content
         prompt = REWRITE_PROMPT.format(question=question)
         response = model.invoke([{"role": "user", "content": prompt}])
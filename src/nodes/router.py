@@ -0,0 +1,207 @@
+import re
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from ..graph.state import AgentState
+from ..tools.news_search import NewsSearchInput
+from ..utils.message_trimmer import MessageTrimmer
+
+# Country filter values (see RETRIEVER_DESCRIPTION) and the other ways users refer to them
+COUNTRIES = {
+    "Austria": ["austria", "austrian"],
+    "Belgium": ["belgium", "belgian"],
+    "Bulgaria": ["bulgaria", "bulgarian"],
+    "Croatia": ["croatia", "croatian"],
+    "Cyprus": ["cyprus", "cypriot"],
+    "Czechia": ["czechia", "czech republic", "czech"],
+    "Denmark": ["denmark", "danish"],
+    "Estonia": ["estonia", "estonian"],
+    "Finland": ["finland", "finnish"],
+    "France": ["france", "french"],
+    "Germany": ["germany", "german"],
+    "Greece": ["greece", "greek"],
+    "Hungary": ["hungary", "hungarian"],
+    "Ireland": ["ireland", "irish"],
+    "Italy": ["italy", "italian"],
+    "Latvia": ["latvia", "latvian"],
+    "Lithuania": ["lithuania", "lithuanian"],
+    "Luxembourg": ["luxembourg", "luxembourgish"],
+    "Malta": ["malta", "maltese"],
+    "Netherlands": ["netherlands", "the netherlands", "holland", "dutch"],
+    "Poland": ["poland", "polish"],
+    "Portugal": ["portugal", "portuguese"],
+    "Romania": ["romania", "romanian"],
+    "Slovakia": ["slovakia", "slovak"],
+    "Slovenia": ["slovenia", "slovenian", "slovene"],
+    "Spain": ["spain", "spanish"],
+    "Sweden": ["sweden", "swedish"],
+}
+
+# Pillar names from RETRIEVER_DESCRIPTION and SYSTEM_PROMPT, plus their core topics
+PILLARS = {
+    "pillar_1": ["constraints on government powers", "government constraints", "separation of powers", "checks and balances"],
+    "pillar_2": ["absence of corruption", "corruption control", "corruption", "corrupt", "bribery", "bribes"],
+    "pillar_3": ["open government", "access to information", "government transparency"],
+    "pillar_4": ["fundamental freedoms", "fundamental rights", "freedom of speech", "freedom of expression",
+                 "media freedom", "freedom of press", "press freedom", "human rights", "civil liberties", "discrimination"],
+    "pillar_5": ["order and security", "public safety", "crime prevention", "violence", "terrorism"],
+    "pillar_6": ["regulatory enforcement", "environmental regulation", "labor regulation", "labour regulation",
+                 "business regulation"],
+    "pillar_7": ["civil justice", "civil courts", "civil court", "civil proceedings"],
+    "pillar_8": ["criminal justice", "criminal courts", "criminal court", "criminal proceedings", "prosecutions",
+                 "prosecution", "law enforcement"],
+}
+
+# Impact wording mapped to the impact_score conditions documented in RETRIEVER_DESCRIPTION
+IMPACTS = {
+    "negative": ({"$lt": 3}, ["negative", "negatively", "harmful", "detrimental"]),
+    "neutral": ({"$eq": 3}, ["neutral"]),
+    "positive": ({"$gt": 3}, ["positive", "positively", "beneficial"]),
+}
+
+EVENT_WORDS = frozenset(
+    "news new event events happened happening developments development latest recent recently incidents "
+    "incident reports reported headlines updates stories".split()
+)
+# References to earlier turns need the conversation to be resolved
+FOLLOW_UP_WORDS = frozenset(
+    "it its this these those they them their he she his her above previous earlier again else same "
+    "former latter also".split()
+)
+CONCEPTUAL_PATTERN = re.compile(
+    r"^\s*(what\s+(is|are|does|do)\b|define\b|explain\b|why\b|how\s+(does|do|is|are)\b)|"
+    r"\b(compare|comparison|difference|differences|definition|meaning|mean)\b"
+)
+META_PATTERN = re.compile(r"\b(who are you|what can you|you said|our conversation|thank(s| you)|hello|hi)\b")
+ELLIPSIS_PATTERN = re.compile(r"^\s*(and|what about|how about|same)\b")
+FILLER_WORDS = frozenset(
+    "a an and are as at be by did do does for from has have how in is it of on or that the to was were "
+    "what when where which who with about any tell me show give can could would you please i want know "
+    "summary summarize summarise eu european union member state states country countries rule law "
+    "related regarding concerning impact impacts effect".split()
+)
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _phrase_pattern(phrases: List[str]) -> re.Pattern:
+    alternatives = sorted(phrases, key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(p) for p in alternatives) + r")\b")
+
+
+COUNTRY_PATTERNS = {country: _phrase_pattern(aliases) for country, aliases in COUNTRIES.items()}
+PILLAR_PATTERNS = {pillar: _phrase_pattern(phrases) for pillar, phrases in PILLARS.items()}
+IMPACT_PATTERNS = {impact: (condition, _phrase_pattern(words)) for impact, (condition, words) in IMPACTS.items()}
+
+
+def _mentions(text: str):
+    """Countries, pillars and impact conditions named in a normalized question."""
+    countries = [country for country, pattern in COUNTRY_PATTERNS.items() if pattern.search(text)]
+    pillars = [pillar for pillar, pattern in PILLAR_PATTERNS.items() if pattern.search(text)]
+    impacts = [condition for condition, pattern in IMPACT_PATTERNS.values() if pattern.search(text)]
+    return countries, pillars, impacts
+
+
+def predict_filters(question: str) -> Optional[Dict[str, Any]]:
+    """
+    Predicts the metadata filter of the search the routing LLM will request for a question, from
+    the same country, pillar and impact wording the fast path uses.
+
+    Args:
+        question (str): The user question.
+
+    Returns:
+        Optional[Dict[str, Any]]: The predicted filter, empty when the question names none, or None
+            when it names several countries or impact directions (those searches are split or
+            ambiguous, so there is nothing single to predict).
+    """
+    countries, pillars, impacts = _mentions(" ".join(question.casefold().split()))
+    if len(countries) > 1 or len(impacts) > 1:
+        return None
+    filters: Dict[str, Any] = {"country": countries[0]} if countries else {}
+    filters.update({pillar: 1 for pillar in pillars})
+    if impacts:
+        filters["impact_score"] = impacts[0]
+    return filters
+
+
+def route_question(question: str) -> Optional[Dict[str, Any]]:
+    """
+    Deterministically maps an unambiguous retrieval question to news_events_search arguments.
+
+    A question is routed when it names at least one member state, or a pillar together with event
+    wording, and it neither refers back to earlier turns, asks for a definition or explanation, nor
+    mixes impact directions. Several countries become a {"$in": [...]} country filter.
+
+    Args:
+        question (str): The user question.
+
+    Returns:
+        Optional[Dict[str, Any]]: Validated tool arguments, or None when the question should go
+            through the LLM.
+    """
+    text = " ".join(question.casefold().split())
+    words = WORD_PATTERN.findall(text)
+    if not words or META_PATTERN.search(text) or ELLIPSIS_PATTERN.search(text):
+        return None
+    if FOLLOW_UP_WORDS.intersection(words):
+        return None
+
+    countries, pillars, impacts = _mentions(text)
+    has_event_wording = bool(EVENT_WORDS.intersection(words))
+
+    if len(impacts) > 1:
+        return None
+    if not countries and not (pillars and has_event_wording):
+        return None
+    if not has_event_wording and CONCEPTUAL_PATTERN.search(text):
+        return None
+
+    # The search query is whatever topic words remain once filter and filler wording is removed
+    stripped = text
+    for pattern in COUNTRY_PATTERNS.values():
+        stripped = pattern.sub(" ", stripped)
+    for _, pattern in IMPACT_PATTERNS.values():
+        stripped = pattern.sub(" ", stripped)
+    query = " ".join(
+        word for word in WORD_PATTERN.findall(stripped)
+        if len(word) > 1 and word not in FILLER_WORDS and word not in EVENT_WORDS
+    )
+    if not query:
+        query = " or ".join(PILLARS[pillar][0] for pillar in pillars) or "rule of law"
+
+    arguments = NewsSearchInput(
+        query=query,
+        country=({"$in": countries} if len(countries) > 1 else countries[0]) if countries else None,
+        impact_score=impacts[0] if impacts else None,
+        **{pillar: 1 for pillar in pillars}
+    )
+    return arguments.model_dump(exclude_none=True)
+
+
+def create_fast_route_node(retriever, trimmer: MessageTrimmer):
+    """Factory function to create the fast_route node."""
+
+    def fast_route(state: AgentState):
+        """Emit the retrieval tool call directly for obvious questions, skipping the routing LLM call."""
+        last = state["messages"][-1] if state["messages"] else None
+        if not isinstance(last, HumanMessage) or not isinstance(last.content, str):
+            return {}
+
+        arguments = route_question(last.content)
+        if arguments is None:
+            return {}
+
+        print(f"Fast path: routed to {retriever.name} with {arguments}")
+        response = AIMessage(
+            content="",
+            tool_calls=[
+                {"name": retriever.name, "args": arguments, "id": f"call_{uuid4().hex}", "type": "tool_call"}
+            ]
+        )
+        new_counts = trimmer.count_updates(state["messages"], state.get("token_counts", {}))
+        return {"messages": [response], "token_counts": {**new_counts, **trimmer.count_response(response)}}
+
+    return RunnableLambda(fast_route, name="fast_route")
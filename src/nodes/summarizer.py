@@ -0,0 +1,69 @@
+from langchain.chat_models import ChatOpenAI
+from langchain_core.messages import HumanMessage, RemoveMessage
+from langchain_core.runnables import RunnableLambda
+from langgraph.constants import TAG_NOSTREAM
+
+from ..graph.state import AgentState
+from ..prompts.templates import SUMMARY_PROMPT
+from ..utils.message_trimmer import MessageTrimmer
+
+def create_compact_history_node(model: ChatOpenAI, trimmer: MessageTrimmer, threshold_tokens: int, keep_tokens: int):
+    """Factory function to create the compact_history node."""
+
+    # Summaries are internal, their tokens must not reach the chat stream
+    summary_model = model.with_config(tags=[TAG_NOSTREAM])
+
+    def _plan(state: AgentState):
+        """Split the history into messages to fold into the summary and recent messages to keep."""
+        messages = state["messages"]
+        new_counts = trimmer.count_updates(messages, state.get("token_counts", {}))
+        token_counts = {**state.get("token_counts", {}), **new_counts}
+        if sum(token_counts.get(m.id, 0) for m in messages) <= threshold_tokens:
+            return None, None, new_counts
+
+        # Keep the most recent messages within keep_tokens, starting on a human turn
+        start, total = len(messages), 0
+        while start > 0 and total + token_counts.get(messages[start - 1].id, 0) <= keep_tokens:
+            start -= 1
+            total += token_counts.get(messages[start].id, 0)
+        while start < len(messages) and messages[start].type != "human":
+            start += 1
+        if start == len(messages):
+            # Never fold the latest turn away, even if it alone exceeds keep_tokens
+            start = max((i for i, m in enumerate(messages) if m.type == "human"), default=0)
+
+        folded = messages[:start]
+        if not folded:
+            return None, None, new_counts
+
+        transcript = "\n".join(
+            f"{m.type}: {m.content}" for m in folded
+            if m.type in ("human", "ai") and isinstance(m.content, str) and m.content
+        )
+        prompt = SUMMARY_PROMPT.format(summary=state.get("summary") or "(none)", messages=transcript)
+        return folded, prompt, new_counts
+
+    def _update(folded, summary: str, new_counts: dict):
+        return {
+            "summary": summary,
+            "messages": [RemoveMessage(id=m.id) for m in folded],
+            "token_counts": {**new_counts, **{m.id: None for m in folded}},
+        }
+
+    def compact_history(state: AgentState):
+        """Fold older turns into the running summary once the thread passes the token threshold."""
+        folded, prompt, new_counts = _plan(state)
+        if folded is None:
+            return {"token_counts": new_counts}
+        response = summary_model.invoke([HumanMessage(content=prompt)])
+        return _update(folded, response.content, new_counts)
+
+    async def acompact_history(state: AgentState):
+        """Asynchronously fold older turns into the running summary."""
+        folded, prompt, new_counts = _plan(state)
+        if folded is None:
+            return {"token_counts": new_counts}
+        response = await summary_model.ainvoke([HumanMessage(content=prompt)])
+        return _update(folded, response.content, new_counts)
+
+    return RunnableLambda(compact_history, afunc=acompact_history, name="compact_history")
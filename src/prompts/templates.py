@@ -16,6 +16,17 @@ GENERATE_PROMPT = (
     "Context: {context}"
 )
 
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation about rule of law events in the European Union. "
+    "Extend the existing summary with the new messages. Keep the countries, pillars, events, dates and "
+    "conclusions that later questions may refer to, and drop greetings and repetition. "
+    "Reply with the updated summary only.\n"
+    "Existing summary: {summary}\n"
+    "New messages:\n{messages}"
+)
+
+SUMMARY_SYSTEM_PROMPT = "\n\n## EARLIER CONVERSATION (SUMMARY)\n{summary}"
+
 RETRIEVER_DESCRIPTION = """
 Use this tool when users ask about:
 - Summaries of events related to a rule of law topic or pillar within the European Union
@@ -26,7 +37,7 @@ Use this tool when users ask about:
 - Events related to specific dimensions of the rule of law
 
 Available metadata filters:
-- country: Filter by specific country name. Available options: "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czechia", "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary", "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta", "Netherlands", "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden"
+- country: Filter by specific country name. Available options: "Austria", "Belgium", "Bulgaria", "Croatia", "Cyprus", "Czechia", "Denmark", "Estonia", "Finland", "France", "Germany", "Greece", "Hungary", "Ireland", "Italy", "Latvia", "Lithuania", "Luxembourg", "Malta", "Netherlands", "Poland", "Portugal", "Romania", "Slovakia", "Slovenia", "Spain", "Sweden". To search several countries at once, use {"$in": ["Italy", "Spain"]}
 - impact_score: Filter by numerical impact score. Values can range from 1 to 5, where 1 and 2 means that the news article has a strong or low negative impact on the rule of law and 5 and 4 means that the news article has a strong or mild positive impact on the thematic pillar. Following the same reasoning, a value of 3 means that the events have a neutral impact on the thematic pillar. Use comparison operators that are compatible with pinecone vector databases: $eq, $ne, $gt, $gte, $lt, $lte, $in
 - pillar_1: Binary filter (1 or 0) for "Constraints on Government Powers" related events
 - pillar_2: Binary filter (1 or 0) for "Absence of Corruption" related events
@@ -54,6 +65,7 @@ Input should be a JSON string with 'query' (required) and any combination of opt
 {"query": "labor regulation", "country": "Finland", "pillar_6": 1}
 {"query": "busines or commercial laws", "pillar_6": 1}
 {"query": "media freedom or freedom of press", "pillar_4": 1}
+{"query": "judicial independence", "country": {"$in": ["Italy", "Spain", "Romania"]}, "pillar_7": 1}
 """
 
 SYSTEM_PROMPT = """
@@ -0,0 +1,19 @@
+from .context import ContextAssembler, AssembledContext
+from .rerank import Reranker, LexicalOverlapReranker, EmbeddingReranker, RerankStage
+from .store import RetrievalStore
+from .fusion import FusedMatch, reciprocal_rank_fusion
+from .speculative import SpeculativeRetriever, SpeculationStats
+
+__all__ = [
+    "ContextAssembler",
+    "AssembledContext",
+    "Reranker",
+    "LexicalOverlapReranker",
+    "EmbeddingReranker",
+    "RerankStage",
+    "RetrievalStore",
+    "FusedMatch",
+    "reciprocal_rank_fusion",
+    "SpeculativeRetriever",
+    "SpeculationStats",
+]
@@ -0,0 +1,227 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import tiktoken
+
+from ..cache import LRUCache
+
+LEGACY_TEMPLATE_OVERHEAD = """
+        [START OF CONTEXT EVENT]
+        Title:
+        Country:
+
+        Retrieved information:
+
+        [END OF CONTEXT EVENT]
+        """
+
+@dataclass
+class ArticleContext:
+    """All retrieved chunks of a single article, collapsed into one context entry."""
+    article_id: str
+    metadata: Dict[str, Any]
+    score: float
+    vector: Optional[np.ndarray]
+    chunks: List[Any] = field(default_factory=list)  # (chunk position, chunk id, text)
+    tokens: int = 0
+
+    @property
+    def chunk_ids(self) -> List[str]:
+        return [chunk_id for _, chunk_id, _ in self.chunks]
+
+
+@dataclass
+class AssembledContext:
+    """Result of a context assembly call."""
+    text: str
+    chunk_ids: List[str]
+    tokens: int
+    baseline_tokens: int
+
+    @property
+    def tokens_saved(self) -> int:
+        return max(self.baseline_tokens - self.tokens, 0)
+
+
+class ContextAssembler:
+    """
+    Builds the retrieved context under a token budget.
+
+    Chunks of the same article are collapsed into a single entry, articles are picked with
+    maximal marginal relevance over the match scores and the vector of each article's best chunk
+    (see `mmr_candidates`), and the selection is serialized in a compact format. Token counts
+    are computed with tiktoken and cached per chunk id.
+    """
+
+    def __init__(
+        self,
+        token_budget: int = 16000,
+        mmr_lambda: float = 0.7,
+        encoding_name: str = "o200k_base",
+        token_cache_max_bytes: int = 4 * 1024 * 1024
+    ):
+        self.token_budget = token_budget
+        self.mmr_lambda = mmr_lambda
+        self.encoding = tiktoken.get_encoding(encoding_name)
+        self.token_cache = LRUCache(token_cache_max_bytes, sizeof=lambda _: 64)
+        self._legacy_overhead = self.count_tokens(LEGACY_TEMPLATE_OVERHEAD)
+
+    def count_tokens(self, text: str) -> int:
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def _chunk_tokens(self, chunk_id: str, text: str) -> int:
+        tokens = self.token_cache.get(chunk_id)
+        if tokens is None:
+            tokens = self.count_tokens(text)
+            self.token_cache.put(chunk_id, tokens)
+        return tokens
+
+    @staticmethod
+    def _strip_overlap(previous: str, current: str, probe_chars: int = 48) -> str:
+        """Removes the prefix of `current` that repeats the tail of `previous` (splitter overlap)."""
+        probe = current[:probe_chars]
+        if len(probe) < probe_chars:
+            return current
+        position = previous.find(probe, max(len(previous) - 4 * 1024, 0))
+        while position != -1:
+            tail = previous[position:]
+            if current.startswith(tail):
+                return current[len(tail):].lstrip()
+            position = previous.find(probe, position + 1)
+        return current
+
+    def mmr_candidates(self, docs: List[Any], chunks: List[Optional[str]]) -> List[str]:
+        """
+        Ids of the matches whose vectors MMR compares: the best-scoring hydrated chunk of each
+        article. Empty when MMR ignores similarity (mmr_lambda of 1).
+        """
+        if self.mmr_lambda >= 1:
+            return []
+        best: Dict[str, Any] = {}
+        for doc, text in zip(docs, chunks):
+            if text:
+                article_id = str((doc.metadata or {}).get("article_id", doc.id))
+                if article_id not in best or doc.score > best[article_id].score:
+                    best[article_id] = doc
+        return [doc.id for doc in best.values()]
+
+    def _collapse(
+        self,
+        docs: List[Any],
+        chunks: List[Optional[str]],
+        vectors: Dict[str, List[float]]
+    ) -> List[ArticleContext]:
+        """Groups hydrated matches by article, keeping the best score and vector per article."""
+        articles: Dict[str, ArticleContext] = {}
+        for doc, text in zip(docs, chunks):
+            if not text:
+                continue
+            metadata = doc.metadata or {}
+            article_id = str(metadata.get("article_id", doc.id))
+            values = vectors.get(doc.id) or getattr(doc, "values", None)
+            vector = np.asarray(values, dtype=np.float32) if values else None
+
+            article = articles.get(article_id)
+            if article is None:
+                article = ArticleContext(article_id, metadata, doc.score, vector)
+                articles[article_id] = article
+            elif doc.score > article.score:
+                article.score = doc.score
+                if vector is not None:
+                    article.vector = vector
+
+            article.chunks.append((metadata.get("chunk_id", len(article.chunks)), doc.id, text))
+            article.tokens += self._chunk_tokens(doc.id, text)
+
+        for article in articles.values():
+            article.chunks.sort(key=lambda chunk: chunk[0])
+        return list(articles.values())
+
+    def _select(self, articles: List[ArticleContext]) -> List[ArticleContext]:
+        """Greedy maximal-marginal-relevance selection within the token budget."""
+        if not articles:
+            return []
+
+        relevance = np.asarray([a.score for a in articles], dtype=np.float32)
+        similarity = None
+        # Articles without a vector (e.g. lexical-only hits whose vector could not be fetched)
+        # count as dissimilar to every other article, instead of disabling MMR for the whole set
+        with_vector = [i for i, a in enumerate(articles) if a.vector is not None]
+        if with_vector:
+            vectors = np.stack([articles[i].vector for i in with_vector])
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            vectors = vectors / norms
+            similarity = np.zeros((len(articles), len(articles)), dtype=np.float32)
+            similarity[np.ix_(with_vector, with_vector)] = vectors @ vectors.T
+
+        remaining = list(range(len(articles)))
+        max_similarity = np.zeros(len(articles), dtype=np.float32)
+        selected, budget = [], self.token_budget
+
+        while remaining and budget > 0:
+            candidates = np.asarray(remaining)
+            mmr = self.mmr_lambda * relevance[candidates] - (1 - self.mmr_lambda) * max_similarity[candidates]
+            best = int(candidates[int(np.argmax(mmr))])
+            remaining.remove(best)
+
+            if articles[best].tokens > budget:
+                continue
+            selected.append(articles[best])
+            budget -= articles[best].tokens
+            if similarity is not None:
+                max_similarity = np.maximum(max_similarity, similarity[best])
+
+        return selected
+
+    def _serialize(self, article: ArticleContext, position: int) -> str:
+        metadata = article.metadata
+        header = " | ".join(
+            str(value) for value in (
+                metadata.get("title"), metadata.get("country"), metadata.get("published_date")
+            ) if value
+        )
+        parts, previous = [], None
+        for _, _, text in article.chunks:
+            parts.append(self._strip_overlap(previous, text) if previous else text)
+            previous = text
+        return f"[{position}] {header}\n" + "\n".join(parts)
+
+    def assemble(
+        self,
+        docs: List[Any],
+        chunks: List[Optional[str]],
+        vectors: Optional[Dict[str, List[float]]] = None
+    ) -> AssembledContext:
+        """
+        Assembles the context string for the answer prompt.
+
+        Args:
+            docs (List[Any]): Ranked matches with `id`, `score`, `metadata` and optionally `values`.
+            chunks (List[Optional[str]]): Hydrated chunk texts aligned with docs.
+            vectors (Optional[Dict[str, List[float]]]): Stored vectors of the `mmr_candidates`, keyed
+                by id, for matches returned without values.
+
+        Returns:
+            AssembledContext: The serialized context, the chunk ids it contains and its token accounting.
+        """
+        articles = self._collapse(docs, chunks, vectors or {})
+        selected = self._select(articles)
+
+        text = "\n\n".join(
+            self._serialize(article, position) for position, article in enumerate(selected, start=1)
+        )
+        baseline_tokens = sum(
+            (self._chunk_tokens(doc.id, chunk) if chunk else 0)
+            + self._legacy_overhead
+            + self.count_tokens(f'{(doc.metadata or {}).get("title", "")}{(doc.metadata or {}).get("country", "")}')
+            for doc, chunk in zip(docs, chunks)
+        )
+
+        return AssembledContext(
+            text=text,
+            chunk_ids=[chunk_id for article in selected for chunk_id in article.chunk_ids],
+            tokens=self.count_tokens(text),
+            baseline_tokens=baseline_tokens
+        )
@@ -0,0 +1,46 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+@dataclass
+class FusedMatch:
+    """Match produced by rank fusion, with the same attributes as a Pinecone ScoredVector."""
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    values: Optional[List[float]] = None
+
+
+def reciprocal_rank_fusion(rankings: List[List[Any]], k: int = 60, top_k: Optional[int] = None) -> List[FusedMatch]:
+    """
+    Fuses ranked match lists with reciprocal-rank fusion, sum(1 / (k + rank)).
+
+    Fused scores are divided by the best attainable score (rank 1 in every list), so they stay in
+    [0, 1] like cosine scores and keep working as relevance in reranking and MMR. Metadata and
+    vectors are taken from the first list that contains a match, so dense matches keep their values.
+
+    Args:
+        rankings (List[List[Any]]): Match lists ordered by descending relevance, e.g. dense then BM25.
+        k (int): Rank smoothing constant.
+        top_k (Optional[int]): Number of fused matches to keep, all when None.
+
+    Returns:
+        List[FusedMatch]: Fused matches ordered by descending fused score.
+    """
+    scores: Dict[str, float] = {}
+    matches: Dict[str, Any] = {}
+    for ranking in rankings:
+        for rank, match in enumerate(ranking, start=1):
+            scores[match.id] = scores.get(match.id, 0.0) + 1.0 / (k + rank)
+            matches.setdefault(match.id, match)
+
+    best_possible = len(rankings) / (k + 1) if rankings else 1.0
+    order = sorted(scores, key=scores.get, reverse=True)[:top_k]
+    return [
+        FusedMatch(
+            id=match_id,
+            score=scores[match_id] / best_possible,
+            metadata=matches[match_id].metadata or {},
+            values=getattr(matches[match_id], "values", None)
+        )
+        for match_id in order
+    ]
@@ -0,0 +1,226 @@
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..cache import LRUCache, EmbeddingCache
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from has have how in is it its of on or "
+    "that the their there this to was were what when where which who why with about "
+    "any news events event happened happen tell me show".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens used by the lexical scorers."""
+    return TOKEN_PATTERN.findall(text.casefold())
+
+
+class Reranker(ABC):
+    """
+    Base class for CPU rerankers.
+
+    `score` returns one value per candidate that depends only on the query and the chunk, so it
+    can be cached per (query, chunk), or None for a candidate it cannot score on its own.
+    `combine` turns the values of the whole candidate set into the final scores, higher is
+    better, and is where anything that depends on the ranking (such as the first-stage score)
+    comes in. Rerankers that set `uses_vectors` get the stored vectors
+    of the candidates, keyed by id.
+    """
+
+    name = "base"
+    uses_vectors = False
+
+    @abstractmethod
+    def score(
+        self,
+        query: str,
+        embedded_query: List[float],
+        docs: List[Any],
+        chunks: List[Optional[str]],
+        vectors: Dict[str, List[float]]
+    ) -> List[Any]:
+        ...
+
+    def combine(self, query: str, docs: List[Any], chunks: List[Optional[str]], scores: List[Any]) -> List[float]:
+        return scores
+
+
+class LexicalOverlapReranker(Reranker):
+    """
+    Boosts the first-stage score by the length-saturated overlap between query and chunk terms.
+    Only the overlap is cached; the first-stage score depends on the filters and the other hits
+    (under fusion it is a rank), so it is added at rank time.
+    """
+
+    name = "lexical"
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, average_length: float = 600.0, dense_weight: float = 1.0):
+        self.k1 = k1
+        self.b = b
+        self.average_length = average_length
+        self.dense_weight = dense_weight
+
+    def overlap(self, query: str, chunks: List[Optional[str]]) -> List[float]:
+        """Mean saturated term frequency of the query terms in each chunk."""
+        query_terms = {term for term in tokenize(query) if term not in STOPWORDS}
+        scores = []
+        for chunk in chunks:
+            terms = Counter(tokenize(chunk or ""))
+            length = sum(terms.values())
+            total = 0.0
+            for term in query_terms:
+                frequency = terms.get(term, 0)
+                if frequency:
+                    total += frequency * (self.k1 + 1) / (
+                        frequency + self.k1 * (1 - self.b + self.b * length / self.average_length)
+                    )
+            scores.append(total / len(query_terms) if query_terms else 0.0)
+        return scores
+
+    def score(self, query, embedded_query, docs, chunks, vectors):
+        return self.overlap(query, chunks)
+
+    def combine(self, query, docs, chunks, scores):
+        return [self.dense_weight * float(doc.score) + overlap for doc, overlap in zip(docs, scores)]
+
+
+class EmbeddingReranker(Reranker):
+    """
+    Re-scores candidates with exact float32 cosine similarity against their stored vectors,
+    blended with the lexical overlap so exact term matches can break near ties. Candidates whose
+    vector is unavailable get no cacheable score; at rank time their first-stage score is min-max
+    mapped onto the score range of the other candidates, since fused first-stage scores are not
+    cosines.
+    """
+
+    name = "embedding"
+    uses_vectors = True
+
+    def __init__(self, lexical_weight: float = 0.2):
+        self.lexical_weight = lexical_weight
+        self.lexical = LexicalOverlapReranker()
+
+    def _blend(self, dense: List[float], query: str, chunks: List[Optional[str]]) -> List[float]:
+        if not self.lexical_weight:
+            return dense
+        # Squash the unbounded overlap into [0, 1) without depending on the other candidates
+        lexical = [o / (o + 1.0) for o in self.lexical.overlap(query, chunks)]
+        return [(1 - self.lexical_weight) * d + self.lexical_weight * l for d, l in zip(dense, lexical)]
+
+    def score(self, query, embedded_query, docs, chunks, vectors):
+        query_vector = np.asarray(embedded_query, dtype=np.float32)
+        query_vector /= np.linalg.norm(query_vector) or 1.0
+
+        scored, dense = [], []
+        for i, doc in enumerate(docs):
+            values = vectors.get(doc.id) or getattr(doc, "values", None)
+            if values:
+                vector = np.asarray(values, dtype=np.float32)
+                scored.append(i)
+                dense.append(float(vector @ query_vector / (np.linalg.norm(vector) or 1.0)))
+
+        scores: List[Optional[float]] = [None] * len(docs)
+        for i, score in zip(scored, self._blend(dense, query, [chunks[i] for i in scored])):
+            scores[i] = score
+        return scores
+
+    def combine(self, query, docs, chunks, scores):
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if not missing:
+            return scores
+
+        known = [score for score in scores if score is not None]
+        first_stage = [float(doc.score) for doc in docs]
+        low, span = min(first_stage), (max(first_stage) - min(first_stage)) or 1.0
+        target_low, target_high = (min(known), max(known)) if known else (0.0, 1.0)
+        dense = [target_low + (first_stage[i] - low) / span * (target_high - target_low) for i in missing]
+
+        scores = list(scores)
+        for i, score in zip(missing, self._blend(dense, query, [chunks[i] for i in missing])):
+            scores[i] = score
+        return scores
+
+
+RERANKERS = {
+    LexicalOverlapReranker.name: LexicalOverlapReranker,
+    EmbeddingReranker.name: EmbeddingReranker,
+}
+
+
+class RerankStage:
+    """Second retrieval stage: reranks a wide candidate set and keeps the top-n, caching scores per (query, chunk)."""
+
+    def __init__(
+        self,
+        reranker: Reranker,
+        top_n: int = 40,
+        cache_max_bytes: int = 8 * 1024 * 1024,
+        version: Optional[Callable[[], Any]] = None
+    ):
+        self.reranker = reranker
+        self.top_n = top_n
+        # Chunk texts change under the same ids on re-ingestion, so scores follow the index version
+        self.cache = LRUCache(cache_max_bytes, sizeof=lambda _: 96, version=version)
+
+    @classmethod
+    def from_name(
+        cls,
+        name: str,
+        top_n: int = 40,
+        cache_max_bytes: int = 8 * 1024 * 1024,
+        version: Optional[Callable[[], Any]] = None
+    ) -> "RerankStage":
+        if name not in RERANKERS:
+            raise ValueError(f"Unknown reranker '{name}'. Available options: {', '.join(RERANKERS)}")
+        return cls(RERANKERS[name](), top_n=top_n, cache_max_bytes=cache_max_bytes, version=version)
+
+    @property
+    def uses_vectors(self) -> bool:
+        """Whether the reranker scores candidates against their stored vectors."""
+        return self.reranker.uses_vectors
+
+    def rerank(
+        self,
+        query: str,
+        embedded_query: List[float],
+        docs: List[Any],
+        chunks: List[Optional[str]],
+        vectors: Optional[Dict[str, List[float]]] = None
+    ) -> Tuple[List[Any], List[Optional[str]]]:
+        """
+        Reranks the candidates and keeps the best top_n.
+
+        Args:
+            query (str): The search query.
+            embedded_query (List[float]): The embedded search query.
+            docs (List[Any]): Candidate matches from the vector index.
+            chunks (List[Optional[str]]): Hydrated chunk texts aligned with docs.
+            vectors (Optional[Dict[str, List[float]]]): Stored vectors of the candidates, keyed by id.
+
+        Returns:
+            Tuple[List[Any], List[Optional[str]]]: The reranked top_n matches and their texts.
+        """
+        if not docs:
+            return docs, chunks
+
+        normalized_query = EmbeddingCache.normalize(query)
+        keys = [(self.reranker.name, normalized_query, doc.id) for doc in docs]
+        cached = self.cache.get_many(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            fresh = self.reranker.score(
+                query, embedded_query, [docs[i] for i in missing], [chunks[i] for i in missing], vectors or {}
+            )
+            fresh_scores = {keys[i]: score for i, score in zip(missing, fresh)}
+            # None marks a candidate the reranker could not score on its own, left to `combine`
+            self.cache.put_many({key: score for key, score in fresh_scores.items() if score is not None})
+            cached.update(fresh_scores)
+
+        scores = self.reranker.combine(query, docs, chunks, [cached[key] for key in keys])
+        order = sorted(range(len(docs)), key=lambda i: scores[i], reverse=True)[: self.top_n]
+        return [docs[i] for i in order], [chunks[i] for i in order]
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .fusion import reciprocal_rank_fusion
+
+@dataclass
+class SpeculationStats:
+    """Counters describing how useful speculative prefetches were."""
+    started: int = 0
+    hits: int = 0
+    mismatches: int = 0
+    late: int = 0
+    discarded: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.started if self.started else 0.0
+
+    @property
+    def waste_rate(self) -> float:
+        wasted = self.mismatches + self.late + self.discarded
+        return wasted / self.started if self.started else 0.0
+
+
+class SpeculativeRetriever:
+    """
+    Prefetches retrieval candidates for the raw user question while the routing LLM call runs.
+
+    `start` embeds the question and queries the vector index with the predicted filters of the
+    tool call in a background thread, warming the chunk cache with the results. When the tool
+    runs, `take` hands the prefetched matches over if the tool's filters are exactly the predicted
+    ones and the tool query embedding is close enough to the question embedding, so a reused
+    prefetch is the same filtered top_k search the tool would have run. With a BM25 index the
+    prefetch is fused with the lexical results like the tool's own search, and it is only reused
+    when the question and the tool query have the same lexical terms, since the BM25 half of the
+    fusion would differ otherwise. A prefetch that does not match, or is not ready within
+    `wait_timeout` seconds, is thrown away and counted as waste.
+    """
+
+    def __init__(
+        self,
+        vc,
+        pc,
+        ddbc=None,
+        top_k: int = 250,
+        similarity_threshold: float = 0.85,
+        wait_timeout: float = 1.0,
+        max_workers: int = 4,
+        lexical=None,
+        fusion_k: int = 60
+    ):
+        self.vc = vc
+        self.pc = pc
+        self.ddbc = ddbc
+        self.top_k = top_k
+        self.similarity_threshold = similarity_threshold
+        self.wait_timeout = wait_timeout
+        self.lexical = lexical
+        self.fusion_k = fusion_k
+        self.stats = SpeculationStats()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="speculative")
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _filter_key(filters: Dict[Any, Any]) -> str:
+        return json.dumps(filters or {}, sort_keys=True, default=str)
+
+    def _text_key(self, text: str) -> str:
+        """Lexical terms the BM25 half of the fusion is scored on, empty without a BM25 index."""
+        return " ".join(self.lexical.query_terms(text)) if self.lexical is not None else ""
+
+    def _prefetch(self, question: str, filters: Dict[Any, Any]):
+        embedding = self.vc.embed_text(question)
+        docs = self.pc.query(embedded_query=embedding, filters=filters, top_k=self.top_k)
+        if self.lexical is not None:
+            sparse = self.lexical.query(question, filters, self.top_k)
+            docs = reciprocal_rank_fusion([docs, sparse], k=self.fusion_k, top_k=self.top_k)
+        if self.ddbc is not None:
+            self.ddbc.get_chunks([doc.id for doc in docs])
+        return embedding, self._filter_key(filters), self._text_key(question), docs
+
+    def start(self, key: str, question: str, filters: Optional[Dict[Any, Any]] = None) -> None:
+        """
+        Starts prefetching candidates for a question.
+
+        Args:
+            key (str): Conversation key, usually the checkpoint thread id.
+            question (str): The raw user question.
+            filters (Optional[Dict[Any, Any]]): Predicted metadata filters of the tool call.
+        """
+        future = self._executor.submit(self._prefetch, question, filters or {})
+        with self._lock:
+            previous = self._pending.pop(key, None)
+            self._pending[key] = future
+            self.stats.started += 1
+            if previous is not None:
+                self.stats.discarded += 1
+
+    def discard(self, key: str) -> None:
+        """Drops the prefetch of a conversation, e.g. when the model answered without the tool."""
+        with self._lock:
+            if self._pending.pop(key, None) is not None:
+                self.stats.discarded += 1
+
+    def _match(
+        self,
+        prefetched,
+        query: str,
+        embedded_query: List[float],
+        filters: Dict[Any, Any]
+    ) -> Optional[List[Any]]:
+        embedding, filter_key, text_key, docs = prefetched
+        a = np.asarray(embedding, dtype=np.float32)
+        b = np.asarray(embedded_query, dtype=np.float32)
+        similarity = float(a @ b / ((np.linalg.norm(a) * np.linalg.norm(b)) or 1.0))
+
+        if (
+            similarity < self.similarity_threshold
+            or filter_key != self._filter_key(filters)
+            or text_key != self._text_key(query)
+        ):
+            with self._lock:
+                self.stats.mismatches += 1
+            return None
+
+        with self._lock:
+            self.stats.hits += 1
+        return docs
+
+    def _late(self) -> None:
+        print(f"Speculative retrieval not ready within {self.wait_timeout}s, searching directly")
+        with self._lock:
+            self.stats.late += 1
+
+    def _pop(self, key: Optional[str]) -> Optional[Future]:
+        if key is None:
+            return None
+        with self._lock:
+            return self._pending.pop(key, None)
+
+    def take(
+        self,
+        key: Optional[str],
+        query: str,
+        embedded_query: List[float],
+        filters: Dict[Any, Any]
+    ) -> Optional[List[Any]]:
+        """
+        Returns the prefetched matches if they fit the tool query, or None.
+
+        Args:
+            key (Optional[str]): Conversation key used in `start`.
+            query (str): The tool query text.
+            embedded_query (List[float]): The embedded tool query.
+            filters (Dict[Any, Any]): The tool's metadata filters.
+
+        Returns:
+            Optional[List[Any]]: Prefetched matches of the same filtered search, in rank order.
+        """
+        future = self._pop(key)
+        if future is None:
+            return None
+        try:
+            return self._match(future.result(timeout=self.wait_timeout), query, embedded_query, filters)
+        except TimeoutError:
+            self._late()
+            return None
+        except Exception as e:
+            print(f"Speculative retrieval failed ❌. Here's why: {e}")
+            return None
+
+    async def atake(
+        self,
+        key: Optional[str],
+        query: str,
+        embedded_query: List[float],
+        filters: Dict[Any, Any]
+    ) -> Optional[List[Any]]:
+        """Async variant of `take` that awaits the prefetch without blocking the event loop."""
+        future = self._pop(key)
+        if future is None:
+            return None
+        try:
+            prefetched = await asyncio.wait_for(asyncio.wrap_future(future), self.wait_timeout)
+            return self._match(prefetched, query, embedded_query, filters)
+        except asyncio.TimeoutError:
+            self._late()
+            return None
+        except Exception as e:
+            print(f"Speculative retrieval failed ❌. Here's why: {e}")
+            return None
+
+    def report(self) -> str:
+        return (
+            f"Speculative retrieval: {self.stats.hits}/{self.stats.started} hits "
+            f"(hit rate {self.stats.hit_rate:.0%}, waste rate {self.stats.waste_rate:.0%})"
+        )
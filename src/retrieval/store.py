@@ -0,0 +1,120 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+from uuid import uuid4
+
+from ..cache import LRUCache
+
+REFERENCE_KEY = "retrieval_id"
+
+class RetrievalStore:
+    """
+    Side store for retrieved context, so graph state only carries a small reference.
+
+    The assembled context is kept in a byte-budgeted LRU and, when a path is given, in SQLite so
+    references stored in checkpoints still resolve after a restart. Entries older than
+    `ttl_seconds` are purged from disk. If a reference cannot be resolved, the context is rebuilt
+    from its chunk ids with `fallback`.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 32 * 1024 * 1024,
+        path: Optional[str] = None,
+        ttl_seconds: float = 24 * 3600,
+        fallback: Optional[Callable[[List[str]], List[Optional[str]]]] = None
+    ):
+        self.memory = LRUCache(max_bytes, sizeof=lambda text: len(text.encode("utf-8")))
+        self.ttl_seconds = ttl_seconds
+        self.fallback = fallback
+        self._conn = None
+        self._lock = threading.Lock()
+
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS retrievals "
+                "(retrieval_id TEXT PRIMARY KEY, context TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def put(self, context: str, chunk_ids: List[str]) -> str:
+        """
+        Stores a retrieved context and returns the reference that goes into the tool message.
+
+        Args:
+            context (str): The assembled context text.
+            chunk_ids (List[str]): Ids of the chunks included in the context.
+
+        Returns:
+            str: JSON reference with the retrieval id and chunk ids.
+        """
+        retrieval_id = uuid4().hex
+        self.memory.put(retrieval_id, context)
+
+        if self._conn is not None:
+            now = time.time()
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO retrievals (retrieval_id, context, created_at) VALUES (?, ?, ?)",
+                    (retrieval_id, context, now)
+                )
+                self._conn.execute("DELETE FROM retrievals WHERE created_at < ?", (now - self.ttl_seconds,))
+                self._conn.commit()
+
+        return json.dumps({REFERENCE_KEY: retrieval_id, "chunk_ids": chunk_ids})
+
+    def get(self, retrieval_id: str) -> Optional[str]:
+        """
+        Looks up a stored context by retrieval id.
+
+        Args:
+            retrieval_id (str): Retrieval identifier.
+
+        Returns:
+            Optional[str]: The stored context, or None if it is unknown or expired.
+        """
+        context = self.memory.get(retrieval_id)
+        if context is not None or self._conn is None:
+            return context
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT context FROM retrievals WHERE retrieval_id = ?", (retrieval_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        self.memory.put(retrieval_id, row[0])
+        return row[0]
+
+    def resolve(self, content: str) -> str:
+        """
+        Turns tool message content back into context text.
+        Content that is not a retrieval reference (e.g. an error message) is returned unchanged.
+
+        Args:
+            content (str): Tool message content.
+
+        Returns:
+            str: The context text for the answer prompt.
+        """
+        try:
+            reference = json.loads(content)
+        except (TypeError, ValueError):
+            return content
+        if not isinstance(reference, dict) or REFERENCE_KEY not in reference:
+            return content
+
+        context = self.get(reference[REFERENCE_KEY])
+        if context is not None:
+            return context
+
+        chunk_ids = reference.get("chunk_ids", [])
+        if self.fallback is None or not chunk_ids:
+            return ""
+        print(f"Retrieval {reference[REFERENCE_KEY]} expired, rehydrating {len(chunk_ids)} chunks")
+        return "\n\n".join(text for text in self.fallback(chunk_ids) if text)
@@ -1,7 +1,14 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from langchain.tools import BaseTool
-from typing import Optional, Type
+from langchain_core.runnables import RunnableConfig
+from typing import Any, List, Optional, Tuple, Type, Union
 from pydantic import BaseModel, PrivateAttr, Field
 
+from ..retrieval.context import ContextAssembler
+from ..retrieval.fusion import reciprocal_rank_fusion
+from ..utils.timing import StageTimer
+
 # class NewsSearchInput(BaseModel):
 #     """Input schema for NewsSearchTool"""
 #     query_data_json: str = Field(description="JSON string containing query and optional filters")
@@ -9,7 +16,9 @@ from pydantic import BaseModel, PrivateAttr, Field
 class NewsSearchInput(BaseModel):
     """Input schema for NewsSearchTool"""
     query: str = Field(description="Search query")
-    country: Optional[str] = Field(default=None, description="Filter by country")
+    country: Optional[Union[str, dict]] = Field(
+        default=None, description='Filter by country, or by several countries with {"$in": [...]}'
+    )
     pillar_1: Optional[int] = Field(default=None, description="Filter for Government Constraints")
     pillar_2: Optional[int] = Field(default=None, description="Filter for Corruption Control")
     pillar_3: Optional[int] = Field(default=None, description="Filter for Open Government")
@@ -31,42 +40,330 @@ class NewsSearchTool(BaseTool):
     _vc: any = PrivateAttr()
     _pc: any = PrivateAttr()
     _ddbc: any = PrivateAttr()
+    _cache: any = PrivateAttr()
+    _assembler: any = PrivateAttr()
+    _reranker: any = PrivateAttr()
+    _top_k: int = PrivateAttr()
+    _store: any = PrivateAttr()
+    _speculator: any = PrivateAttr()
+    _executor: any = PrivateAttr()
+    _lexical: any = PrivateAttr()
+    _lexical_executor: any = PrivateAttr()
+    _fusion_k: int = PrivateAttr()
     
 
-    def __init__(self, vc, pc, ddbc, description: str):
+    def __init__(self, vc, pc, ddbc, description: str, cache=None, assembler=None, reranker=None, top_k: int = 250, store=None, speculator=None, max_concurrency: int = 8, lexical=None, fusion_k: int = 60):
         super().__init__(description=description)
         self._vc = vc         # Voyage Client
         self._pc = pc         # Pinecone Client
         self._ddbc = ddbc     # DynamoDB Client
+        self._cache = cache   # Retrieval Cache
+        self._assembler = assembler or ContextAssembler()   # Context Assembler
+        self._reranker = reranker   # Rerank Stage (optional second stage)
+        self._top_k = top_k         # Width of the first-stage candidate set
+        self._store = store         # Retrieval Store (keeps payloads out of graph state)
+        self._speculator = speculator   # Speculative Retriever (prefetches during routing)
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrency)   # Fan-out of embeddings and sub-queries
+        self._lexical = lexical     # BM25 Index (optional sparse retrieval fused with dense results)
+        self._lexical_executor = (  # BM25 scoring alongside the dense query, separate from the fan-out pool
+            ThreadPoolExecutor(max_workers=max_concurrency) if lexical is not None else None
+        )
+        self._fusion_k = fusion_k   # Reciprocal-rank fusion constant
     
 
-    def _prepare_doc(self, doc):
+    def _build_filter(self, country: Optional[Union[str, dict]], pillars: dict, impact_score: Optional[dict]) -> dict:
         """
-        Formats a document's metadata and content chunk into a structured context string.
+        Builds the comprehensive metadata filter for a search.
         Args:
-            doc: An object containing document metadata and an identifier. 
-                 Expected to have a 'metadata' dictionary with 'title' and 'country' keys, 
-                 and an 'id' attribute for retrieving the document chunk.
+            country: Country to filter by, or a {"$in": [...]} condition over several countries.
+            pillars: Mapping from pillar field name to its requested value (None when unset).
+            impact_score: Impact score condition, if any.
         Returns:
-            str: A formatted string including the document's title, country, and content chunk, 
-                 delimited by context markers.
+            dict: Pinecone-style metadata filter.
+        """
+        filter_dict = {}
+
+        if country:
+            filter_dict["country"] = country
+
+        for name, pillar_value in pillars.items():
+            if pillar_value is not None:
+                filter_dict[name] = pillar_value
+
+        if impact_score:
+            filter_dict["impact_score"] = impact_score
+
+        print("=========================================")
+        print("PERFORMING SIMILARITY SEARCH IN DATABASE")
+        print(f"Filters: {filter_dict}")
+        print("=========================================")
+
+        return filter_dict
+
+    @staticmethod
+    def _thread_id(config: Optional[RunnableConfig]) -> Optional[str]:
+        return (config or {}).get("configurable", {}).get("thread_id")
+
+    @staticmethod
+    def _split_countries(filter_dict: dict) -> List[dict]:
+        """Splits a {"$in": [...]} country condition into one filter per country."""
+        country = filter_dict.get("country")
+        if isinstance(country, dict) and set(country) == {"$in"} and len(country["$in"]) > 1:
+            return [{**filter_dict, "country": name} for name in country["$in"]]
+        return [filter_dict]
+
+    @staticmethod
+    def _merge(results: List[List[Any]]) -> List[Any]:
+        """Merges sub-query matches by score, keeping the best score of each chunk id."""
+        best = {}
+        for docs in results:
+            for doc in docs:
+                if doc.id not in best or doc.score > best[doc.id].score:
+                    best[doc.id] = doc
+        return sorted(best.values(), key=lambda doc: doc.score, reverse=True)
+
+    def _plan(self, calls: List[dict]) -> List[Tuple[str, dict, List[dict], int]]:
+        """Builds the filter, per-country sub-filters and sub-query width of each call."""
+        plans = []
+        for call in calls:
+            filter_dict = self._build_filter(
+                call.get("country"),
+                {f"pillar_{i}": call.get(f"pillar_{i}") for i in range(1, 9)},
+                call.get("impact_score")
+            )
+            sub_filters = self._split_countries(filter_dict)
+            # Per-country sub-queries share the candidate budget of the call
+            plans.append((call["query"], filter_dict, sub_filters, max(self._top_k // len(sub_filters), 1)))
+        return plans
+
+    def _text_key(self, query: str) -> str:
+        """Cache key of the query wording, only fused BM25 results depend on it."""
+        return " ".join(self._lexical.query_terms(query)) if self._lexical is not None else ""
+
+    def _query(self, query: str, embedded_query: List[float], filter_dict: dict, top_k: int) -> List[Any]:
+        text_key = self._text_key(query)
+        docs = self._cache.get(embedded_query, filter_dict, text_key) if self._cache is not None else None
+        if docs is None:
+            sparse = (
+                self._lexical_executor.submit(self._lexical.query, query, filter_dict, top_k)
+                if self._lexical is not None else None
+            )
+            docs = self._pc.query(
+                embedded_query = embedded_query,
+                filters = filter_dict,
+                top_k = top_k
+            )
+            if sparse is not None:
+                docs = reciprocal_rank_fusion([docs, sparse.result()], k=self._fusion_k, top_k=top_k)
+            if self._cache is not None:
+                self._cache.put(embedded_query, filter_dict, docs, text_key)
+        return docs
+
+    async def _aquery(self, query: str, embedded_query: List[float], filter_dict: dict, top_k: int) -> List[Any]:
+        text_key = self._text_key(query)
+        docs = self._cache.get(embedded_query, filter_dict, text_key) if self._cache is not None else None
+        if docs is None:
+            dense = self._pc.aquery(
+                embedded_query = embedded_query,
+                filters = filter_dict,
+                top_k = top_k
+            )
+            if self._lexical is not None:
+                docs, sparse = await asyncio.gather(dense, self._lexical.aquery(query, filter_dict, top_k))
+                docs = reciprocal_rank_fusion([docs, sparse], k=self._fusion_k, top_k=top_k)
+            else:
+                docs = await dense
+            if self._cache is not None:
+                self._cache.put(embedded_query, filter_dict, docs, text_key)
+        return docs
+
+    @staticmethod
+    def _missing_vectors(docs: List[Any], vectors: dict) -> List[str]:
+        """Ids of the matches that came without values and whose vectors have not been fetched."""
+        return [doc.id for doc in docs if doc.id not in vectors and not getattr(doc, "values", None)]
+
+    def _rerank_vector_ids(self, results: List[List[Any]]) -> List[str]:
+        """Ids whose vectors the reranker scores against, none unless it uses stored vectors."""
+        if self._reranker is None or not self._reranker.uses_vectors:
+            return []
+        return list(dict.fromkeys(doc_id for docs in results for doc_id in self._missing_vectors(docs, {})))
+
+    def _mmr_vector_ids(self, ranked: List[Tuple[List[Any], List[Optional[str]]]], vectors: dict) -> List[str]:
+        """Ids whose vectors MMR compares, usually a fraction of the candidates, that are not known yet."""
+        ids = []
+        for docs, chunks in ranked:
+            candidates = set(self._assembler.mmr_candidates(docs, chunks))
+            ids += self._missing_vectors([doc for doc in docs if doc.id in candidates], vectors)
+        return list(dict.fromkeys(ids))
+
+    def _fetch_vectors(self, ids: List[str]) -> dict:
+        """Fetches stored vectors, which only refine ranking, so failures leave them out."""
+        if not ids:
+            return {}
+        try:
+            return self._pc.fetch_vectors(ids)
+        except Exception as e:
+            print(f"Vectors could not be fetched ❌. Here's why: {e}")
+            return {}
+
+    async def _afetch_vectors(self, ids: List[str]) -> dict:
+        """Async variant of `_fetch_vectors`."""
+        if not ids:
+            return {}
+        try:
+            return await self._pc.afetch_vectors(ids)
+        except Exception as e:
+            print(f"Vectors could not be fetched ❌. Here's why: {e}")
+            return {}
+
+    def _rerank(self, plans, embeddings, results, texts: dict, vectors: dict, timer: StageTimer):
+        """Aligns the hydrated texts with each call's matches and reranks them."""
+        ranked = []
+        for (query, _, _, _), embedded_query, docs in zip(plans, embeddings, results):
+            chunks = [texts[doc.id] for doc in docs]
+            if self._reranker is not None:
+                with timer.stage("rerank"):
+                    docs, chunks = self._reranker.rerank(query, embedded_query, docs, chunks, vectors)
+            ranked.append((docs, chunks))
+        return ranked
+
+    def _format_results(self, docs, chunks, n_candidates: int, vectors: dict, timer: StageTimer) -> str:
+        """Assembles the reranked candidates into a compact, token-budgeted context string."""
+        with timer.stage("assemble"):
+            context = self._assembler.assemble(docs, chunks, vectors)
+
+        print(
+            f"Context: {context.tokens} tokens from {len(context.chunk_ids)} of {n_candidates} chunks "
+            f"({context.tokens_saved} tokens saved)"
+        )
+        print(f"Retrieval timings: {timer.summary()}")
+        if self._speculator is not None:
+            print(self._speculator.report())
+
+        if self._store is not None:
+            return self._store.put(context.text, context.chunk_ids)
+        return context.text
+
+    def _finish(self, results, ranked, texts: dict, vectors: dict, timer: StageTimer) -> List[str]:
+        """Formats one result per call from its reranked matches."""
+        print(
+            f"Hydrated {len(texts)} unique chunks for {sum(len(docs) for docs in results)} matches, "
+            f"fetched {len(vectors)} vectors"
+        )
+        return [
+            self._format_results(docs, chunks, len(candidates), vectors, timer)
+            for candidates, (docs, chunks) in zip(results, ranked)
+        ]
+
+    def search_many(self, calls: List[dict], config: Optional[RunnableConfig] = None) -> List[str]:
         """
-        
-        context_input = f"""
-        [START OF CONTEXT EVENT]
-        Title: {doc.metadata["title"]}
-        Country: {doc.metadata["country"]}
-
-        Retrieved information:
-        {self._ddbc.get_chunk(doc.id)}
-        [END OF CONTEXT EVENT]
+        Runs several searches concurrently and hydrates their chunks in a single batched call.
+        Country {"$in": [...]} filters fan out into per-country sub-queries merged by score.
+
+        Args:
+            calls: Tool arguments of each search, as validated by NewsSearchInput.
+            config: Runnable config of the graph run, used to pick up speculative prefetches.
+
+        Returns:
+            List[str]: One formatted result (or error message) per call.
         """
+        try:
+
+            plans = self._plan(calls)
+            timer = StageTimer()
 
-        return context_input
+            with timer.stage("embed"):
+                embeddings = list(self._executor.map(self._vc.embed_text, [plan[0] for plan in plans]))
+
+            with timer.stage("search"):
+                results = [None] * len(plans)
+                if self._speculator is not None and plans:
+                    results[0] = self._speculator.take(self._thread_id(config), plans[0][0], embeddings[0], plans[0][1])
+
+                tasks = [
+                    (i, sub_filter, top_k)
+                    for i, (_, _, sub_filters, top_k) in enumerate(plans) if results[i] is None
+                    for sub_filter in sub_filters
+                ]
+                sub_results = self._executor.map(
+                    lambda task: self._query(plans[task[0]][0], embeddings[task[0]], task[1], task[2]), tasks
+                )
+                grouped = {}
+                for (i, _, _), docs in zip(tasks, sub_results):
+                    grouped.setdefault(i, []).append(docs)
+                for i, docs in grouped.items():
+                    results[i] = docs[0] if len(docs) == 1 else self._merge(docs)
+
+            # Hydrate every distinct chunk once, across calls and sub-queries
+            with timer.stage("hydrate"):
+                ids = list(dict.fromkeys(doc.id for docs in results for doc in docs))
+                texts = dict(zip(ids, self._ddbc.get_chunks(ids)))
+
+            # Vectors are fetched only for the candidates the reranker and MMR compare
+            with timer.stage("vectors"):
+                vectors = self._fetch_vectors(self._rerank_vector_ids(results))
+            ranked = self._rerank(plans, embeddings, results, texts, vectors, timer)
+            with timer.stage("vectors"):
+                vectors.update(self._fetch_vectors(self._mmr_vector_ids(ranked, vectors)))
+
+            return self._finish(results, ranked, texts, vectors, timer)
+
+        except Exception as e:
+            error_msg = f"Error searching news events: {str(e)}"
+            print(error_msg)
+            return [error_msg] * len(calls)
+
+    async def asearch_many(self, calls: List[dict], config: Optional[RunnableConfig] = None) -> List[str]:
+        """Async variant of `search_many`, with all embeddings and sub-queries awaited concurrently."""
+        try:
+
+            plans = self._plan(calls)
+            timer = StageTimer()
+
+            with timer.stage("embed"):
+                embeddings = await asyncio.gather(*(self._vc.aembed_text(plan[0]) for plan in plans))
+
+            with timer.stage("search"):
+                results = [None] * len(plans)
+                if self._speculator is not None and plans:
+                    results[0] = await self._speculator.atake(self._thread_id(config), plans[0][0], embeddings[0], plans[0][1])
+
+                tasks = [
+                    (i, sub_filter, top_k)
+                    for i, (_, _, sub_filters, top_k) in enumerate(plans) if results[i] is None
+                    for sub_filter in sub_filters
+                ]
+                sub_results = await asyncio.gather(
+                    *(self._aquery(plans[i][0], embeddings[i], sub_filter, top_k) for i, sub_filter, top_k in tasks)
+                )
+                grouped = {}
+                for (i, _, _), docs in zip(tasks, sub_results):
+                    grouped.setdefault(i, []).append(docs)
+                for i, docs in grouped.items():
+                    results[i] = docs[0] if len(docs) == 1 else self._merge(docs)
+
+            # Hydrate every distinct chunk once, across calls and sub-queries
+            with timer.stage("hydrate"):
+                ids = list(dict.fromkeys(doc.id for docs in results for doc in docs))
+                texts = dict(zip(ids, await self._ddbc.aget_chunks(ids)))
+
+            # Vectors are fetched only for the candidates the reranker and MMR compare
+            with timer.stage("vectors"):
+                vectors = await self._afetch_vectors(self._rerank_vector_ids(results))
+            ranked = self._rerank(plans, embeddings, results, texts, vectors, timer)
+            with timer.stage("vectors"):
+                vectors.update(await self._afetch_vectors(self._mmr_vector_ids(ranked, vectors)))
+
+            return self._finish(results, ranked, texts, vectors, timer)
+
+        except Exception as e:
+            error_msg = f"Error searching news events: {str(e)}"
+            print(error_msg)
+            return [error_msg] * len(calls)
 
     def _run(
         self, query: str, 
-        country: Optional[str] = None, 
+        country: Optional[Union[str, dict]] = None, 
         pillar_1: Optional[int] = None, 
         pillar_2: Optional[int] = None, 
         pillar_3: Optional[int] = None, 
@@ -76,44 +373,28 @@ class NewsSearchTool(BaseTool):
         pillar_7: Optional[int] = None,
         pillar_8: Optional[int] = None, 
         impact_score: Optional[dict] = None,
-        run_manager: Optional[any] = None
+        run_manager: Optional[any] = None,
+        config: RunnableConfig = None
     ) -> str:
 
-        try:
-            
-            # Build comprehensive metadata filter
-            filter_dict = {}
-
-            if country:
-                filter_dict["country"] = country
-            
-            for i in range(1, 9):
-                pillar_value = locals().get(f"pillar_{i}")
-                if pillar_value is not None:
-                    filter_dict[f"pillar_{i}"] = pillar_value
-            
-            if impact_score:
-                filter_dict["impact_score"] = impact_score
-
-            print("=========================================")
-            print("PERFORMING SIMILARITY SEARCH IN DATABASE")
-            print(f"Filters: {filter_dict}")
-            print("=========================================")
-            
-            # Perform similarity search
-            embedded_query = self._vc.embed_text(query)
-            docs = self._pc.query(
-                embedded_query = embedded_query,
-                filters = filter_dict
-            )
-            
-            # Format results
-            results = [self._prepare_doc(doc) for doc in docs]
-            formatted_results = "\n\n".join(results)
-            
-            return formatted_results
-                               
-        except Exception as e:
-            error_msg = f"Error searching news events: {str(e)}"
-            print(error_msg)
-            return error_msg
\ No newline at end of file
+        arguments = locals()
+        return self.search_many([{name: arguments[name] for name in NewsSearchInput.model_fields}], config)[0]
+
+    async def _arun(
+        self, query: str, 
+        country: Optional[Union[str, dict]] = None, 
+        pillar_1: Optional[int] = None, 
+        pillar_2: Optional[int] = None, 
+        pillar_3: Optional[int] = None, 
+        pillar_4: Optional[int] = None, 
+        pillar_5: Optional[int] = None,
+        pillar_6: Optional[int] = None, 
+        pillar_7: Optional[int] = None,
+        pillar_8: Optional[int] = None, 
+        impact_score: Optional[dict] = None,
+        run_manager: Optional[any] = None,
+        config: RunnableConfig = None
+    ) -> str:
+
+        arguments = locals()
+        return (await self.asearch_many([{name: arguments[name] for name in NewsSearchInput.model_fields}], config))[0]
@@ -1,28 +1,92 @@
+import asyncio
+import threading
+
 from langchain_core.messages import AIMessage
+from langgraph.types import Command
 
 class ChatStreamer:
-    def __init__(self, app, config):
+    """
+    Streams graph responses and compacts the thread history once each response has been streamed.
+
+    History compaction is a graph node that is not on the answer path. It runs in the background
+    after the stream ends, so the summary LLM call never delays a response, and the next turn
+    waits for it (usually long finished) so turns never race on the checkpoint.
+    """
+
+    def __init__(self, app, config, compact_node: str = "compact_history"):
         self.app = app
         self.config = config
+        self.compact_node = compact_node
         self.last_response = ""
-    
+        self._compaction = None        # Background thread of the last sync turn
+        self._acompaction = None       # Background task of the last async turn
+
+    def _compact(self):
+        try:
+            self.app.invoke(Command(goto=self.compact_node), self.config)
+        except Exception as e:
+            print(f"History compaction failed ❌. Here's why: {e}")
+
+    async def _acompact(self):
+        try:
+            await self.app.ainvoke(Command(goto=self.compact_node), self.config)
+        except Exception as e:
+            print(f"History compaction failed ❌. Here's why: {e}")
+
+    def wait_for_compaction(self):
+        """Blocks until the compaction started after the previous response has finished."""
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
+
+    async def await_compaction(self):
+        """Waits for the compaction started after the previous response, without blocking the loop."""
+        if self._acompaction is not None:
+            await self._acompaction
+            self._acompaction = None
+        if self._compaction is not None:
+            await asyncio.to_thread(self.wait_for_compaction)
+
     def stream_response(self, messages):
         """Stream response and store full message"""
         def response_generator():
+            self.wait_for_compaction()
             full_response = ""
             for chunk, _ in self.app.stream(
-                {"messages": messages}, 
-                self.config, 
+                {"messages": messages},
+                self.config,
                 stream_mode="messages"
             ):
                 if isinstance(chunk, AIMessage):
                     content = chunk.content
                     full_response += content
                     yield content
-            
+
             self.last_response = full_response
-        
+            self._compaction = threading.Thread(target=self._compact, name="compact-history", daemon=True)
+            self._compaction.start()
+
         return response_generator()
-    
+
+    def astream_response(self, messages):
+        """Asynchronously stream response and store full message"""
+        async def response_generator():
+            await self.await_compaction()
+            full_response = ""
+            async for chunk, _ in self.app.astream(
+                {"messages": messages},
+                self.config,
+                stream_mode="messages"
+            ):
+                if isinstance(chunk, AIMessage):
+                    content = chunk.content
+                    full_response += content
+                    yield content
+
+            self.last_response = full_response
+            self._acompaction = asyncio.create_task(self._acompact())
+
+        return response_generator()
+
     def get_last_response(self):
-        return self.last_response
\ No newline at end of file
+        return self.last_response
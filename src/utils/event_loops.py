@@ -0,0 +1,55 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Awaitable, Callable, Coroutine, Iterator
+
+async def close_on_loop(close: Callable[[], Awaitable[None]], loop: asyncio.AbstractEventLoop) -> None:
+    """
+    Closes an async client created on another event loop.
+
+    The client is closed on its own loop when that loop is still running in another thread.
+    Otherwise its connections can no longer be closed gracefully, so closing is attempted on the
+    running loop and failures are ignored.
+
+    Args:
+        close (Callable[[], Awaitable[None]]): The client's close coroutine function.
+        loop (asyncio.AbstractEventLoop): The loop the client was created on.
+    """
+    try:
+        if loop.is_running() and loop is not asyncio.get_running_loop():
+            await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(close(), loop))
+        else:
+            await close()
+    except Exception as e:
+        print(f"Async client from a previous event loop could not be closed cleanly ⚠️. Here's why: {e}")
+
+
+class BackgroundLoop:
+    """
+    A long-lived event loop running in a daemon thread, for driving async code from sync callers.
+
+    Share one instance per process (e.g. through `st.cache_resource`): every caller's coroutines
+    then run concurrently on the same loop, and async clients bound to it keep their pooled
+    connections across calls instead of being recreated for each new loop.
+    """
+
+    def __init__(self, name: str = "event-loop"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Runs a coroutine on the loop and blocks the calling thread until it finishes."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def iterate(self, iterator: AsyncIterator[Any]) -> Iterator[Any]:
+        """Consumes an async iterator on the loop, yielding its items to the calling thread."""
+        try:
+            while True:
+                try:
+                    yield self.run(iterator.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            # Also runs when the consumer stops early, so the async generator is closed on its loop
+            if hasattr(iterator, "aclose"):
+                self.run(iterator.aclose())
@@ -1,13 +1,85 @@
-from langchain_core.messages import trim_messages
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from langchain_core.messages import BaseMessage
 from langchain.chat_models import ChatOpenAI
 
-def create_message_trimmer(model: ChatOpenAI):
-    """Create a message trimmer configured for the given model."""
-    return trim_messages(
-        max_tokens = 500000,
-        strategy = "last",
-        token_counter = model,
-        include_system = True,
-        allow_partial = False,
-        start_on = "human",
-    )
\ No newline at end of file
+class MessageTrimmer:
+    """
+    Incremental equivalent of langchain's `trim_messages`.
+
+    Each message is tokenized once and its count is kept in graph state under the message id.
+    Trimming is then a suffix sum over the cached counts, with the "last" strategy, the system
+    message kept and the history starting on a human message, as trim_messages(strategy="last",
+    include_system=True, start_on="human") does.
+    """
+
+    def __init__(self, model: ChatOpenAI, max_tokens: int = 500000):
+        self.model = model
+        self.max_tokens = max_tokens
+
+    def count(self, message: BaseMessage) -> int:
+        """Tokenizes a single message with the model's own token counter."""
+        return self.model.get_num_tokens_from_messages([message])
+
+    def count_updates(self, messages: List[BaseMessage], token_counts: Dict[str, int]) -> Dict[str, Optional[int]]:
+        """
+        Counts the messages that do not have a cached count yet, and marks the cached counts of
+        messages no longer in the conversation for removal.
+
+        Args:
+            messages (List[BaseMessage]): Conversation messages, with ids assigned by the graph.
+            token_counts (Dict[str, int]): Cached counts keyed by message id.
+
+        Returns:
+            Dict[str, Optional[int]]: Counts of the newly seen messages and None for stale ids, to
+            be merged into graph state by `merge_token_counts`.
+        """
+        live = {message.id for message in messages if message.id}
+        updates: Dict[str, Optional[int]] = {
+            message_id: None for message_id in token_counts if message_id not in live
+        }
+        updates.update(
+            (message.id, self.count(message))
+            for message in messages
+            if message.id and message.id not in token_counts
+        )
+        return updates
+
+    def count_response(self, response: BaseMessage) -> Dict[str, int]:
+        """Assigns an id to a node's response if needed and returns its count for graph state."""
+        if not response.id:
+            response.id = str(uuid4())
+        return {response.id: self.count(response)}
+
+    def trim(self, messages: List[BaseMessage], token_counts: Dict[str, int]) -> List[BaseMessage]:
+        """
+        Keeps the most recent messages that fit within max_tokens.
+
+        Args:
+            messages (List[BaseMessage]): Conversation messages.
+            token_counts (Dict[str, int]): Token counts keyed by message id.
+
+        Returns:
+            List[BaseMessage]: The trimmed conversation.
+        """
+        def tokens(message: BaseMessage) -> int:
+            cached = token_counts.get(message.id) if message.id else None
+            return cached if cached is not None else self.count(message)
+
+        system = [messages[0]] if messages and messages[0].type == "system" else []
+        history = messages[len(system):]
+        budget = self.max_tokens - sum(tokens(m) for m in system)
+
+        start, total = len(history), 0
+        while start > 0:
+            total += tokens(history[start - 1])
+            if total > budget:
+                break
+            start -= 1
+
+        # Start on a human message, as trim_messages(start_on="human") does
+        while start < len(history) and history[start].type != "human":
+            start += 1
+
+        return system + history[start:]
@@ -0,0 +1,55 @@
+from typing import Any, Dict
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """Evaluates a single Pinecone comparison operator against a metadata value."""
+    if operator == "$exists":
+        return (value is not None) == bool(operand)
+    if value is None:
+        return operator in ("$ne", "$nin")
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    try:
+        if operator == "$gt":
+            return value > operand
+        if operator == "$gte":
+            return value >= operand
+        if operator == "$lt":
+            return value < operand
+        if operator == "$lte":
+            return value <= operand
+    except TypeError:
+        return False
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+def matches_filter(metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """
+    Checks whether a metadata record satisfies a Pinecone-style metadata filter.
+
+    Args:
+        metadata (Dict[str, Any]): The metadata of a single vector.
+        filters (Dict[str, Any]): The filter, e.g. {"country": "Italy", "impact_score": {"$gte": 4}}.
+
+    Returns:
+        bool: True if the record matches every condition of the filter.
+    """
+    for field, condition in (filters or {}).items():
+        if field == "$and":
+            if not all(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif field == "$or":
+            if not any(matches_filter(metadata, sub) for sub in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(field)
+            if not all(_compare(value, op, operand) for op, operand in condition.items()):
+                return False
+        elif metadata.get(field) != condition:
+            return False
+    return True
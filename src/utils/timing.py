@@ -0,0 +1,20 @@
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+class StageTimer:
+    """Collects wall-clock durations of named pipeline stages, in milliseconds."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    def summary(self) -> str:
+        return ", ".join(f"{name}={ms:.0f}ms" for name, ms in self.timings.items())
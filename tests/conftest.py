@@ -0,0 +1,7 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# The setup scripts import each other as top-level modules, like when they are run from setup/
+sys.path[:0] = [str(ROOT), str(ROOT / "setup")]
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import random
+import tempfile
+
+import pytest
+import tiktoken
+
+import chunking
+from chunking import ChunkingEngine
+
+WORDS = (
+    "the court ruled on ayuntamiento Ελλάδα ő über a case. police\n protesters.\n "
+    "in the capital 法院 elections minister announced reform of pensions"
+).split(" ")
+
+ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/{}.tiktoken"
+
+
+def synthetic_encoding():
+    """
+    Offline byte-level BPE with a GPT-style pre-tokenizer. Every prefix of the corpus words is a
+    token, so words encode to a few multi-byte tokens and UTF-8 characters span token edges.
+    """
+    ranks = {bytes([i]): i for i in range(256)}
+    for word in sorted(set(WORDS)):
+        for piece in (word.encode("utf-8"), f" {word}".encode("utf-8")):
+            for end in range(2, len(piece) + 1):
+                ranks.setdefault(piece[:end], len(ranks))
+    for piece in (b".\n", b"\n\n", b". "):
+        ranks.setdefault(piece, len(ranks))
+    return tiktoken.Encoding(
+        "synthetic",
+        pat_str=r"""'s|'t| ?\p{L}+| ?\p{N}+| ?[^\s\p{L}\p{N}]+|\s+(?!\S)|\s+""",
+        mergeable_ranks=ranks,
+        special_tokens={}
+    )
+
+
+def cached_encoding(name):
+    """A tiktoken encoding if it is already in tiktoken's cache, None instead of downloading it."""
+    cache_dir = (
+        os.environ.get("TIKTOKEN_CACHE_DIR")
+        or os.environ.get("DATA_GYM_CACHE_DIR")
+        or os.path.join(tempfile.gettempdir(), "data-gym-cache")
+    )
+    key = hashlib.sha1(ENCODING_URL.format(name).encode()).hexdigest()
+    return tiktoken.get_encoding(name) if os.path.exists(os.path.join(cache_dir, key)) else None
+
+
+@pytest.fixture(params=["synthetic", "o200k_base"])
+def encoding(request, monkeypatch):
+    encoding = synthetic_encoding() if request.param == "synthetic" else cached_encoding(request.param)
+    if encoding is None:
+        pytest.skip(f"{request.param} is not in the tiktoken cache")
+    monkeypatch.setattr(chunking.tiktoken, "encoding_for_model", lambda model_name: encoding)
+    return encoding
+
+
+def generated_documents(n, seed=1):
+    rng = random.Random(seed)
+    for _ in range(n):
+        paragraphs = []
+        for _ in range(rng.randint(1, 40)):
+            sentences = [" ".join(rng.choices(WORDS, k=rng.randint(3, 40))) for _ in range(rng.randint(1, 12))]
+            paragraphs.append(". ".join(sentences) + ".")
+        yield rng.choice(["\n\n", "\n"]).join(paragraphs)
+
+
+def baseline_chunks(text, encoding):
+    """The chunking ingestion used before the engine: langchain's recursive splitter and the 75-token filter."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=1000,
+        chunk_overlap=100,
+        separators=["\n\n", "\n", ". "],
+        length_function=lambda t: len(encoding.encode(t))
+    )
+    chunks = [text] if len(encoding.encode(text)) <= 1150 else splitter.split_text(text)
+    return [(chunk.strip(". "), len(encoding.encode(chunk.strip(". ")))) for chunk in chunks]
+
+
+def test_matches_recursive_splitter(encoding):
+    pytest.importorskip("langchain_text_splitters")
+    engine = ChunkingEngine()
+    split_documents = 0
+    for text in generated_documents(300):
+        expected = baseline_chunks(text, encoding)
+        assert engine.split(text) == expected
+        assert [count > 75 for _, count in engine.split(text)] == [count > 75 for _, count in expected]
+        split_documents += len(expected) > 1
+    # The generator must exercise the recursive split, not only whole documents
+    assert split_documents > 50
+
+
+def test_short_documents_stay_whole(encoding):
+    engine = ChunkingEngine()
+    text = ". the court ruled on a case. "
+    assert engine.split(text) == [("the court ruled on a case", len(encoding.encode("the court ruled on a case")))]
+
+
+def test_counts_are_exact_token_counts(encoding):
+    engine = ChunkingEngine()
+    for text in generated_documents(50, seed=7):
+        for chunk, count in engine.split(text):
+            assert count == len(encoding.encode(chunk))
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+
+pytest.importorskip("voyageai")
+from voyageai.error import InvalidRequestError, RateLimitError
+
+from embedding_batcher import AdaptiveConcurrency, EmbeddingBatcher, pack_batches
+
+
+def test_pack_batches_respects_token_and_item_budgets():
+    items = [("a", 40), ("b", 40), ("c", 30), ("d", 10), ("e", 10), ("f", 10)]
+    batches = list(pack_batches(iter(items), max_tokens=100, max_items=3, tokens=lambda item: item[1]))
+    assert [[name for name, _ in batch] for batch in batches] == [["a", "b"], ["c", "d", "e"], ["f"]]
+
+
+def test_pack_batches_gives_oversized_items_their_own_batch():
+    batches = list(pack_batches([5, 500, 5, 5], max_tokens=100, max_items=10, tokens=lambda n: n))
+    assert batches == [[5], [500], [5, 5]]
+
+
+def test_adaptive_concurrency_grows_additively():
+    limiter = AdaptiveConcurrency(initial=4, maximum=8)
+    for _ in range(4):
+        limiter.succeeded()
+    # About one more slot per round of `limit` successes
+    assert 4.9 < limiter.limit < 5
+    for _ in range(100):
+        limiter.succeeded()
+    assert limiter.limit == 8
+
+
+def test_adaptive_concurrency_halves_once_per_burst():
+    limiter = AdaptiveConcurrency(initial=16, maximum=16)
+    started_at = time.monotonic()
+    for _ in range(8):
+        limiter.throttled(started_at)
+    assert limiter.limit == 8
+    assert limiter.rate_limited == 8
+
+    # A request sent after the decrease is a new congestion signal
+    limiter.throttled(time.monotonic())
+    assert limiter.limit == 4
+
+
+def test_adaptive_concurrency_never_drops_below_minimum():
+    limiter = AdaptiveConcurrency(initial=2, minimum=1)
+    for _ in range(5):
+        limiter.throttled()
+    assert limiter.limit == 1
+
+
+def test_embed_splits_batches_over_the_token_limit():
+    requests = []
+
+    def embed_fn(texts):
+        requests.append(len(texts))
+        if len(texts) > 2 or "huge" in texts:
+            raise InvalidRequestError("The max allowed tokens per submitted batch is 320000.")
+        return [[float(len(text))] for text in texts]
+
+    batcher = EmbeddingBatcher(embed_fn, "voyage-3.5")
+    assert batcher.embed(["a", "bb", "huge", "ccc", "dd"]) == [[1.0], [2.0], None, [3.0], [2.0]]
+    assert requests[0] == 5
+
+
+def test_embed_raises_other_invalid_requests():
+    def embed_fn(texts):
+        raise InvalidRequestError("Model voyage-9 is not supported.")
+
+    with pytest.raises(InvalidRequestError):
+        EmbeddingBatcher(embed_fn, "voyage-3.5").embed(["a", "b"])
+
+
+def test_embed_retries_rate_limited_requests():
+    attempts = []
+
+    def embed_fn(texts):
+        attempts.append(texts)
+        if len(attempts) < 3:
+            raise RateLimitError("Too many requests")
+        return [[1.0] for _ in texts]
+
+    limiter = AdaptiveConcurrency(initial=4)
+    batcher = EmbeddingBatcher(embed_fn, "voyage-3.5", limiter=limiter, base_delay=0)
+    assert batcher.embed(["a"]) == [[1.0]]
+    assert len(attempts) == 3
+    assert limiter.rate_limited == 2
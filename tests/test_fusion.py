@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.retrieval.fusion import reciprocal_rank_fusion
+
+
+def match(match_id, values=None, **metadata):
+    return SimpleNamespace(id=match_id, score=0.0, metadata=metadata, values=values)
+
+
+def test_fuses_by_reciprocal_rank():
+    dense = [match("a"), match("b"), match("c")]
+    sparse = [match("c"), match("a"), match("d")]
+    fused = reciprocal_rank_fusion([dense, sparse], k=60)
+
+    assert [m.id for m in fused] == ["a", "c", "b", "d"]
+    assert fused[0].score == pytest.approx((1 / 61 + 1 / 62) / (2 / 61))
+
+
+def test_scores_are_normalized_to_the_best_attainable():
+    fused = reciprocal_rank_fusion([[match("a"), match("b")], [match("a")]], k=10)
+    assert fused[0].score == pytest.approx(1.0)
+    assert all(0 < m.score <= 1 for m in fused)
+
+
+def test_keeps_metadata_and_values_of_the_first_list():
+    dense = [match("a", values=[0.1, 0.2], country="Italy")]
+    sparse = [match("a", country="ignored")]
+    fused = reciprocal_rank_fusion([dense, sparse])
+    assert fused[0].values == [0.1, 0.2]
+    assert fused[0].metadata == {"country": "Italy"}
+
+
+def test_top_k_and_empty_rankings():
+    rankings = [[match(str(i)) for i in range(10)]]
+    assert [m.id for m in reciprocal_rank_fusion(rankings, top_k=3)] == ["0", "1", "2"]
+    assert reciprocal_rank_fusion([]) == []
+    assert reciprocal_rank_fusion([[], []]) == []
@@ -0,0 +1,49 @@
+from manifest import IngestManifest, chunk_key, content_hash
+
+
+def chunk(text, **metadata):
+    return {"text": text, "metadata": {"country": "Italy", **metadata}}
+
+
+def test_content_hash_covers_text_and_metadata():
+    base = content_hash(chunk("the court ruled", published="2025-01-01"))
+    assert content_hash(chunk("the court ruled", published="2025-01-01")) == base
+    assert content_hash(chunk("the court ruled.", published="2025-01-01")) != base
+    assert content_hash(chunk("the court ruled", published="2025-01-02")) != base
+
+
+def test_chunk_key_is_stable():
+    assert chunk_key("ITA123", 0) == "ITA123_C0"
+    assert chunk_key("ITA123", 12) == chunk_key("ITA123", 12)
+
+
+def test_commit_and_hashes_per_country(tmp_path):
+    manifest = IngestManifest(tmp_path / "manifest.sqlite")
+    manifest.commit("Italy", [("ITA1_C0", "a"), ("ITA1_C1", "b")])
+    manifest.commit("Spain", [("ESP1_C0", "c")])
+    manifest.commit("Italy", [("ITA1_C1", "changed")])
+
+    assert manifest.hashes("Italy") == {"ITA1_C0": "a", "ITA1_C1": "changed"}
+    assert manifest.hashes("Spain") == {"ESP1_C0": "c"}
+    manifest.close()
+
+    # Committed batches survive a restart
+    reopened = IngestManifest(tmp_path / "manifest.sqlite")
+    assert reopened.hashes("Spain") == {"ESP1_C0": "c"}
+    reopened.close()
+
+
+def test_stale_chunks_are_the_unseen_ones_of_the_country(tmp_path):
+    manifest = IngestManifest(tmp_path / "manifest.sqlite")
+    manifest.commit("Italy", [("ITA1_C0", "a"), ("ITA1_C1", "b"), ("ITA2_C0", "c")])
+    manifest.commit("Spain", [("ESP1_C0", "d")])
+
+    # An article that now produces one chunk less, and one that was removed from the source
+    stale = manifest.stale("Italy", {"ITA1_C0"})
+    assert sorted(stale) == ["ITA1_C1", "ITA2_C0"]
+
+    manifest.remove(stale)
+    assert manifest.hashes("Italy") == {"ITA1_C0": "a"}
+    assert manifest.stale("Italy", {"ITA1_C0"}) == []
+    assert manifest.hashes("Spain") == {"ESP1_C0": "d"}
+    manifest.close()
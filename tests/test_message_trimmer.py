@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+pytest.importorskip("langchain")
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage, trim_messages
+
+from src.utils.message_trimmer import MessageTrimmer
+
+
+class WordCounter:
+    """Stands in for the chat model's token counter, counting the words of every message."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_num_tokens_from_messages(self, messages):
+        self.calls += 1
+        return sum(len(str(message.content).split()) + 3 for message in messages)
+
+
+def conversation(rng, turns):
+    messages = [SystemMessage("you answer questions about the news", id="system")]
+    for turn in range(turns):
+        words = lambda: " ".join(["word"] * rng.randint(1, 30))
+        messages.append(HumanMessage(words(), id=f"human-{turn}"))
+        if rng.random() < 0.5:
+            messages.append(AIMessage("", id=f"call-{turn}", tool_calls=[{"name": "news_search", "args": {}, "id": f"t{turn}"}]))
+            messages.append(ToolMessage(words(), id=f"tool-{turn}", tool_call_id=f"t{turn}"))
+        messages.append(AIMessage(words(), id=f"ai-{turn}"))
+    return messages
+
+
+def test_matches_trim_messages():
+    rng = random.Random(3)
+    for _ in range(200):
+        counter = WordCounter()
+        messages = conversation(rng, rng.randint(1, 12))
+        max_tokens = rng.randint(10, 300)
+        trimmer = MessageTrimmer(counter, max_tokens=max_tokens)
+        expected = trim_messages(
+            messages,
+            strategy="last",
+            token_counter=counter.get_num_tokens_from_messages,
+            max_tokens=max_tokens,
+            include_system=True,
+            start_on="human"
+        )
+        assert [m.id for m in trimmer.trim(messages, trimmer.count_updates(messages, {}))] == [m.id for m in expected]
+
+
+def test_trim_uses_cached_counts():
+    counter = WordCounter()
+    trimmer = MessageTrimmer(counter, max_tokens=100)
+    messages = conversation(random.Random(5), 6)
+    token_counts = trimmer.count_updates(messages, {})
+    counter.calls = 0
+
+    trimmer.trim(messages, token_counts)
+    assert counter.calls == 0
+
+
+def test_count_updates_only_counts_new_messages():
+    counter = WordCounter()
+    trimmer = MessageTrimmer(counter)
+    messages = conversation(random.Random(7), 3)
+    token_counts = trimmer.count_updates(messages, {})
+    counter.calls = 0
+
+    updates = trimmer.count_updates(messages[2:] + [HumanMessage("a new question", id="new")], token_counts)
+    assert counter.calls == 1
+    assert updates["new"] == 6
+    assert {message_id for message_id, count in updates.items() if count is None} == {m.id for m in messages[:2]}